@@ -6,36 +6,173 @@ grounding, connecting the model to accurate, up-to-date Google Maps data.
 This package provides both a command-line interface and a programmable API
 for querying Gemini with location-aware information from Google Maps.
 
+Public names are imported lazily on first access, so the CLI can start
+without loading the Gemini SDK.
+
 Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
-from gemini_google_maps_tool.core import MapsQueryResult, get_client, query_maps
-from gemini_google_maps_tool.core.client import ClientError
-from gemini_google_maps_tool.core.maps import (
-    GroundingChunk,
-    GroundingMetadata,
-    GroundingSegment,
-    GroundingSupport,
-    QueryError,
-    parse_lat_lon,
-)
+from typing import TYPE_CHECKING, Any
+
+from gemini_google_maps_tool.core import _load_lazy_export
+
+if TYPE_CHECKING:
+    from gemini_google_maps_tool.core.batchjob import run_batch_job
+    from gemini_google_maps_tool.core.cache import MemoryCache, ResponseCache
+    from gemini_google_maps_tool.core.client import (
+        ClientError,
+        TransportOptions,
+        get_async_client,
+        get_client,
+    )
+    from gemini_google_maps_tool.core.corridor import CorridorResult, corridor_async, parse_route
+    from gemini_google_maps_tool.core.costs import Budget, ModelPricing, RunUsage
+    from gemini_google_maps_tool.core.geo import GeoGrid
+    from gemini_google_maps_tool.core.journal import RunJournal
+    from gemini_google_maps_tool.core.keypool import KeyPool
+    from gemini_google_maps_tool.core.maps import (
+        GroundingChunk,
+        GroundingChunkPool,
+        GroundingMetadata,
+        GroundingSegment,
+        GroundingSupport,
+        MapsQueryRequest,
+        MapsQueryResult,
+        MapsQueryStream,
+        QueryError,
+        TokenUsage,
+        parse_lat_lon,
+        query_many_as_completed,
+        query_many_async,
+        query_maps,
+        query_maps_async,
+        query_maps_stream,
+    )
+    from gemini_google_maps_tool.core.metrics import MetricsRegistry, QueryMetrics
+    from gemini_google_maps_tool.core.places import PlaceIndex, PlaceRecord
+    from gemini_google_maps_tool.core.ratelimit import RateLimiter
+    from gemini_google_maps_tool.core.retry import RetryPolicy
+    from gemini_google_maps_tool.core.routing import ModelRouter
+    from gemini_google_maps_tool.core.session import MapsSession
+    from gemini_google_maps_tool.core.sweep import BoundingBox, SweepResult, sweep_async
+    from gemini_google_maps_tool.core.tracing import QueryTimings, Tracer
 
 __version__ = "0.1.0"
 
+_LAZY_EXPORTS = {
+    "get_client": "gemini_google_maps_tool.core.client",
+    "get_async_client": "gemini_google_maps_tool.core.client",
+    "query_maps": "gemini_google_maps_tool.core.maps",
+    "query_maps_async": "gemini_google_maps_tool.core.maps",
+    "query_maps_stream": "gemini_google_maps_tool.core.maps",
+    "query_many_async": "gemini_google_maps_tool.core.maps",
+    "query_many_as_completed": "gemini_google_maps_tool.core.maps",
+    "MapsQueryRequest": "gemini_google_maps_tool.core.maps",
+    "MapsQueryResult": "gemini_google_maps_tool.core.maps",
+    "MapsQueryStream": "gemini_google_maps_tool.core.maps",
+    "GroundingMetadata": "gemini_google_maps_tool.core.maps",
+    "GroundingChunk": "gemini_google_maps_tool.core.maps",
+    "GroundingChunkPool": "gemini_google_maps_tool.core.maps",
+    "GroundingSegment": "gemini_google_maps_tool.core.maps",
+    "GroundingSupport": "gemini_google_maps_tool.core.maps",
+    "TokenUsage": "gemini_google_maps_tool.core.maps",
+    "QueryTimings": "gemini_google_maps_tool.core.tracing",
+    "Tracer": "gemini_google_maps_tool.core.tracing",
+    "QueryMetrics": "gemini_google_maps_tool.core.metrics",
+    "MetricsRegistry": "gemini_google_maps_tool.core.metrics",
+    "Budget": "gemini_google_maps_tool.core.costs",
+    "RunUsage": "gemini_google_maps_tool.core.costs",
+    "ModelPricing": "gemini_google_maps_tool.core.costs",
+    "BoundingBox": "gemini_google_maps_tool.core.sweep",
+    "SweepResult": "gemini_google_maps_tool.core.sweep",
+    "sweep_async": "gemini_google_maps_tool.core.sweep",
+    "CorridorResult": "gemini_google_maps_tool.core.corridor",
+    "corridor_async": "gemini_google_maps_tool.core.corridor",
+    "parse_route": "gemini_google_maps_tool.core.corridor",
+    "ModelRouter": "gemini_google_maps_tool.core.routing",
+    "KeyPool": "gemini_google_maps_tool.core.keypool",
+    "RunJournal": "gemini_google_maps_tool.core.journal",
+    "run_batch_job": "gemini_google_maps_tool.core.batchjob",
+    "ResponseCache": "gemini_google_maps_tool.core.cache",
+    "MemoryCache": "gemini_google_maps_tool.core.cache",
+    "GeoGrid": "gemini_google_maps_tool.core.geo",
+    "PlaceIndex": "gemini_google_maps_tool.core.places",
+    "PlaceRecord": "gemini_google_maps_tool.core.places",
+    "RateLimiter": "gemini_google_maps_tool.core.ratelimit",
+    "RetryPolicy": "gemini_google_maps_tool.core.retry",
+    "MapsSession": "gemini_google_maps_tool.core.session",
+    "TransportOptions": "gemini_google_maps_tool.core.client",
+    "ClientError": "gemini_google_maps_tool.core.client",
+    "QueryError": "gemini_google_maps_tool.core.maps",
+    "parse_lat_lon": "gemini_google_maps_tool.core.maps",
+}
+
 __all__ = [
     # Core functions
     "get_client",
+    "get_async_client",
     "query_maps",
+    "query_maps_async",
+    "query_maps_stream",
+    "query_many_async",
+    "query_many_as_completed",
+    # Sessions
+    "MapsSession",
+    "TransportOptions",
+    "KeyPool",
+    "RunJournal",
+    "run_batch_job",
     # Data classes
+    "MapsQueryRequest",
     "MapsQueryResult",
+    "MapsQueryStream",
     "GroundingMetadata",
     "GroundingChunk",
     "GroundingSegment",
     "GroundingSupport",
+    "GroundingChunkPool",
+    # Instrumentation
+    "TokenUsage",
+    "QueryTimings",
+    "Tracer",
+    "QueryMetrics",
+    "MetricsRegistry",
+    "Budget",
+    "RunUsage",
+    "ModelPricing",
+    "BoundingBox",
+    "SweepResult",
+    "sweep_async",
+    "CorridorResult",
+    "corridor_async",
+    "parse_route",
+    "ModelRouter",
+    # Caching
+    "ResponseCache",
+    "MemoryCache",
+    "GeoGrid",
+    # Place index
+    "PlaceIndex",
+    "PlaceRecord",
+    # Rate limiting and retries
+    "RateLimiter",
+    "RetryPolicy",
     # Exceptions
     "ClientError",
     "QueryError",
     # Utilities
     "parse_lat_lon",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names on first access and cache them on the module."""
+    value = _load_lazy_export(_LAZY_EXPORTS, __name__, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List lazily exported names alongside the loaded module attributes."""
+    return sorted(list(globals()) + __all__)
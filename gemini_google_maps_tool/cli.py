@@ -9,7 +9,7 @@ and has been reviewed and tested by a human.
 import click
 from click.shell_completion import BashComplete, FishComplete, ZshComplete
 
-from gemini_google_maps_tool.commands import query
+from gemini_google_maps_tool.commands import batch, corridor, places, query, serve, sweep
 
 
 @click.group(invoke_without_command=True)
@@ -46,6 +46,26 @@ def main(ctx: click.Context) -> None:
         gemini-google-maps-tool query "Hotels" -vv     # DEBUG
         gemini-google-maps-tool query "Parks" -vvv     # TRACE
 
+    \b
+        # Run many queries concurrently from a JSONL file
+        gemini-google-maps-tool batch queries.jsonl --workers 64
+
+    \b
+        # Cover an area and list every place found, de-duplicated
+        gemini-google-maps-tool sweep "Bakeries" --bbox 52.35,4.85,52.39,4.93
+
+    \b
+        # Find places along a route, ordered by distance
+        gemini-google-maps-tool corridor "EV chargers" --route route.geojson
+
+    \b
+        # Keep a warm client running; queries forward to it automatically
+        gemini-google-maps-tool serve &
+
+    \b
+        # Search places from earlier queries without an API call
+        gemini-google-maps-tool places "bakery" --text
+
     \b
         # Generate shell completion
         eval "$(gemini-google-maps-tool completion bash)"
@@ -59,6 +79,11 @@ def main(ctx: click.Context) -> None:
 
 # Register commands
 main.add_command(query)
+main.add_command(batch)
+main.add_command(serve)
+main.add_command(places)
+main.add_command(sweep)
+main.add_command(corridor)
 
 
 @main.command()
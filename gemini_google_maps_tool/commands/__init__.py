@@ -6,6 +6,11 @@ Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+from gemini_google_maps_tool.commands.batch_commands import batch
+from gemini_google_maps_tool.commands.corridor_commands import corridor
+from gemini_google_maps_tool.commands.places_commands import places
 from gemini_google_maps_tool.commands.query_commands import query
+from gemini_google_maps_tool.commands.serve_commands import serve
+from gemini_google_maps_tool.commands.sweep_commands import sweep
 
-__all__ = ["query"]
+__all__ = ["batch", "corridor", "places", "query", "serve", "sweep"]
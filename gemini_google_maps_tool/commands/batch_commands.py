@@ -0,0 +1,768 @@
+"""Batch command implementation for concurrent Google Maps grounded queries.
+
+Provides the 'batch' CLI command that reads JSONL query records and streams
+JSONL results while executing queries concurrently over one shared client.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import IO
+
+import click
+
+from gemini_google_maps_tool.core import get_async_client, get_client, query_many_as_completed
+from gemini_google_maps_tool.core.batchjob import (
+    DEFAULT_POLL_INTERVAL,
+    BatchOutcome,
+    run_batch_job,
+)
+from gemini_google_maps_tool.core.client import (
+    CASSETTE_MODES,
+    CASSETTE_REPLAY,
+    ClientError,
+    TransportOptions,
+)
+from gemini_google_maps_tool.core.costs import Budget
+from gemini_google_maps_tool.core.journal import RunJournal, request_fingerprint
+from gemini_google_maps_tool.core.maps import (
+    DEFAULT_CONCURRENCY,
+    MODEL_AUTO,
+    MapsQueryRequest,
+    MapsQueryResult,
+    QueryError,
+    parse_lat_lon,
+    resolve_model_name,
+)
+from gemini_google_maps_tool.core.metrics import QueryMetrics
+from gemini_google_maps_tool.core.places import PlaceIndex
+from gemini_google_maps_tool.core.ratelimit import RateLimiter, default_state_path
+from gemini_google_maps_tool.core.retry import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_RETRY_BUDGET,
+    RetryPolicy,
+)
+from gemini_google_maps_tool.logging_config import get_logger, setup_logging
+from gemini_google_maps_tool.utils import log_error, log_run_usage, output_jsonl, write_metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BatchRecord:
+    """A parsed input line: its id plus either a request or a parse error."""
+
+    record_id: str
+    request: MapsQueryRequest | None
+    error: str | None = None
+
+
+def parse_record(
+    line: str, line_number: int, default_model: str, include_grounding: bool
+) -> BatchRecord:
+    """Parse one JSONL input line into a BatchRecord.
+
+    Args:
+        line: Raw JSON line with `query` and optional `id`, `lat_lon`, `model`.
+        line_number: 1-based line number, used as id when `id` is missing.
+        default_model: Model name for records without a `model` field.
+        include_grounding: Whether to request grounding metadata.
+
+    Returns:
+        BatchRecord with a request, or with an error message if invalid.
+    """
+    record_id = str(line_number)
+    try:
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError("Record must be a JSON object")
+        if data.get("id") is not None:
+            record_id = str(data["id"])
+
+        query = data.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError("Record is missing a non-empty 'query' string")
+
+        lat_lon: tuple[float, float] | None = None
+        raw_lat_lon = data.get("lat_lon")
+        if isinstance(raw_lat_lon, str):
+            lat_lon = parse_lat_lon(raw_lat_lon)
+        elif isinstance(raw_lat_lon, list | tuple) and len(raw_lat_lon) == 2:
+            lat_lon = parse_lat_lon(f"{raw_lat_lon[0]},{raw_lat_lon[1]}")
+        elif raw_lat_lon is not None:
+            raise ValueError("'lat_lon' must be a 'lat,lon' string or a [lat, lon] list")
+
+        model = resolve_model_name(str(data.get("model") or default_model))
+        request = MapsQueryRequest(
+            query=query, lat_lon=lat_lon, model=model, include_grounding=include_grounding
+        )
+        return BatchRecord(record_id, request)
+    except ValueError as e:
+        # json.JSONDecodeError is a ValueError subclass
+        return BatchRecord(record_id, None, f"Invalid record on line {line_number}: {e}")
+
+
+def read_records(
+    input_file: IO[str], default_model: str, include_grounding: bool
+) -> list[BatchRecord]:
+    """Read and parse all non-blank JSONL lines from a file.
+
+    Args:
+        input_file: Open text stream with one JSON record per line.
+        default_model: Model name for records without a `model` field.
+        include_grounding: Whether to request grounding metadata.
+
+    Returns:
+        Parsed records in input order. A record reusing the id of an earlier
+        one is invalid: ids key the output lines and the journal.
+    """
+    records: list[BatchRecord] = []
+    first_lines: dict[str, int] = {}
+    for line_number, line in enumerate(input_file, 1):
+        if not line.strip():
+            continue
+        record = parse_record(line, line_number, default_model, include_grounding)
+        first_line = first_lines.setdefault(record.record_id, line_number)
+        if first_line != line_number:
+            record = BatchRecord(
+                record.record_id,
+                None,
+                f"Invalid record on line {line_number}: duplicate id {record.record_id!r}"
+                f" (first used on line {first_line})",
+            )
+        records.append(record)
+    return records
+
+
+def outcome_to_line(
+    record_id: str, outcome: MapsQueryResult | QueryError | str
+) -> dict[str, object]:
+    """Convert a query outcome into one JSONL output record.
+
+    Args:
+        record_id: Id of the input record.
+        outcome: Result, QueryError, or parse error message.
+
+    Returns:
+        Dictionary with `id` and either `response_text` (plus token `usage`
+        when reported) or `error` (plus the failure `reason`), and `attempts`
+        when a retry was needed.
+    """
+    if isinstance(outcome, MapsQueryResult):
+        line: dict[str, object] = {"id": record_id, **outcome.to_dict()}
+        if outcome.usage is not None:
+            line["usage"] = outcome.usage.to_dict()
+        if outcome.attempts > 1:
+            line["attempts"] = outcome.attempts
+        return line
+    line = {"id": record_id, "error": str(outcome)}
+    if isinstance(outcome, QueryError):
+        line["reason"] = outcome.reason
+        if outcome.attempts > 1:
+            line["attempts"] = outcome.attempts
+    return line
+
+
+def split_records(
+    records: list[BatchRecord], journal: RunJournal | None = None
+) -> tuple[dict[int, dict[str, object]], list[int], list[MapsQueryRequest]]:
+    """Separate records that need a query from those that do not.
+
+    Args:
+        records: Parsed input records.
+        journal: Optional journal answering records completed by earlier runs.
+
+    Returns:
+        Output lines of invalid and journaled records by position, and the
+        positions and requests of the records left to query.
+    """
+    settled: dict[int, dict[str, object]] = {}
+    positions: list[int] = []
+    requests: list[MapsQueryRequest] = []
+    resumed = 0
+    for position, record in enumerate(records):
+        if record.request is None:
+            settled[position] = outcome_to_line(record.record_id, record.error or "Invalid record")
+            continue
+        if journal is not None:
+            done = journal.get(record.record_id, request_fingerprint(record.request))
+            if done is not None:
+                resumed += 1
+                settled[position] = done
+                continue
+        positions.append(position)
+        requests.append(record.request)
+    if resumed:
+        logger.info(f"Resuming: {resumed} records answered from the journal")
+    return settled, positions, requests
+
+
+def complete_record(
+    record_id: str,
+    request: MapsQueryRequest,
+    outcome: MapsQueryResult | QueryError,
+    journal: RunJournal | None = None,
+    place_index: PlaceIndex | None = None,
+) -> dict[str, object]:
+    """Build the output line of a queried record, journaling and indexing a success.
+
+    Args:
+        record_id: Id of the input record.
+        request: The record's request.
+        outcome: Result or QueryError of the query.
+        journal: Optional journal the line of a success is appended to.
+        place_index: Optional index that collects the places of a success.
+
+    Returns:
+        The output line (see outcome_to_line()), with the answering `model`
+        for requests with model "auto".
+    """
+    line = outcome_to_line(record_id, outcome)
+    if isinstance(outcome, QueryError):
+        logger.debug(f"Record {record_id} failed")
+        return line
+    model = outcome.model or request.model
+    if request.model == MODEL_AUTO:
+        line["model"] = model
+    if journal is not None:
+        journal.append(record_id, request_fingerprint(request), dict(line))
+    if place_index is not None:
+        try:
+            place_index.add_result(outcome, request.query, request.lat_lon, model)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update the place index: {e}")
+    return line
+
+
+async def run_batch(
+    records: list[BatchRecord],
+    workers: int,
+    ordered: bool,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    transport: TransportOptions | None = None,
+    place_index: PlaceIndex | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+    journal: RunJournal | None = None,
+) -> int:
+    """Execute records concurrently and write JSONL results to stdout.
+
+    Args:
+        records: Parsed input records.
+        workers: Maximum number of queries in flight at once.
+        ordered: Emit results in input order instead of completion order.
+        rate_limiter: Optional limiter shared by all queries.
+        retry: Optional retry policy applied to each query.
+        transport: HTTP transport settings for the shared client.
+        place_index: Optional index that collects the places of every result.
+        metrics: Optional metrics recording every query.
+        budget: Optional budget charged with every query; once exhausted, the
+            remaining records fail with reason "budget_exceeded" unsent.
+        journal: Optional journal; records it already holds a result for are
+            written from it without a query, and every new result is
+            appended to it before it is written.
+
+    Returns:
+        Number of records that failed (invalid input or query error).
+
+    Raises:
+        ClientError: If the Gemini client cannot be initialized.
+    """
+    settled, valid_positions, requests = split_records(records, journal)
+    failures = 0
+    buffered: dict[int, dict[str, object]] = {}
+    next_position = 0
+
+    def emit(position: int, line: dict[str, object]) -> None:
+        nonlocal next_position
+        if not ordered:
+            output_jsonl(line)
+            return
+        buffered[position] = line
+        while next_position in buffered:
+            output_jsonl(buffered.pop(next_position))
+            next_position += 1
+
+    for position, line in settled.items():
+        failures += "error" in line
+        emit(position, line)
+
+    if not valid_positions:
+        return failures
+
+    client = get_async_client(transport)
+    async for index, outcome in query_many_as_completed(
+        client,
+        requests,
+        concurrency=workers,
+        rate_limiter=rate_limiter,
+        retry=retry,
+        metrics=metrics,
+        budget=budget,
+    ):
+        position = valid_positions[index]
+        failures += isinstance(outcome, QueryError)
+        complete = partial(
+            complete_record,
+            records[position].record_id,
+            requests[index],
+            outcome,
+            journal,
+            place_index,
+        )
+        # Journal and place index writes are blocking I/O; keep them off the event loop
+        if journal is None and place_index is None:
+            emit(position, complete())
+        else:
+            emit(position, await asyncio.to_thread(complete))
+
+    return failures
+
+
+def resumable_jobs(journal: RunJournal | None, keys: list[tuple[str, str]]) -> dict[str, list[int]]:
+    """Match the pending Batch API jobs of a journal to the records left to query.
+
+    Args:
+        journal: Optional journal of an earlier run.
+        keys: (record id, fingerprint) of each request left to query.
+
+    Returns:
+        Request indices, in job order, of every pending job whose requests
+        are all still left to query, by job name. Jobs for records that were
+        edited or removed since are not reattached to.
+    """
+    if journal is None:
+        return {}
+    index_of = {key: index for index, key in enumerate(keys)}
+    jobs: dict[str, list[int]] = {}
+    claimed: set[int] = set()
+    for job in journal.pending_jobs():
+        indices = [index_of.get(key) for key in job.records]
+        if None in indices or claimed.intersection(indices):
+            logger.warning(f"Input changed since batch job {job.name} was submitted; not using it")
+            continue
+        jobs[job.name] = [index for index in indices if index is not None]
+        claimed.update(jobs[job.name])
+    return jobs
+
+
+def run_batch_api(
+    records: list[BatchRecord],
+    transport: TransportOptions | None = None,
+    place_index: PlaceIndex | None = None,
+    budget: Budget | None = None,
+    journal: RunJournal | None = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> int:
+    """Execute records as Gemini Batch API jobs and write JSONL results to stdout.
+
+    Results are written in input order once every job has finished. With a
+    journal, every submitted job is journaled at once and a rerun waits for
+    the jobs it finds there instead of submitting their requests again.
+
+    Args:
+        records: Parsed input records.
+        transport: HTTP transport settings for the client.
+        place_index: Optional index that collects the places of every result.
+        budget: Optional budget charged with every result (not enforced, see
+            run_batch_job()).
+        journal: Optional journal, used as in run_batch().
+        poll_interval: Seconds before the first poll of a job.
+
+    Returns:
+        Number of records that failed (invalid input or query error).
+
+    Raises:
+        ClientError: If the Gemini client cannot be initialized.
+    """
+    lines, positions, requests = split_records(records, journal)
+    if requests:
+        fingerprints = [request_fingerprint(request) for request in requests]
+
+        def record_key(index: int) -> tuple[str, str]:
+            return records[positions[index]].record_id, fingerprints[index]
+
+        jobs = resumable_jobs(journal, [record_key(i) for i in range(len(requests))])
+
+        def on_submit(name: str, model: str, indices: list[int]) -> None:
+            if journal is not None:
+                journal.add_job(name, model, [record_key(i) for i in indices])
+
+        def on_done(name: str, indices: list[int], outcomes: list[BatchOutcome]) -> None:
+            for index, outcome in zip(indices, outcomes, strict=True):
+                record_id = records[positions[index]].record_id
+                lines[positions[index]] = complete_record(
+                    record_id, requests[index], outcome, journal, place_index
+                )
+            if journal is not None:
+                journal.finish_job(name)
+
+        client = get_client(transport)
+        outcomes = run_batch_job(
+            client,
+            requests,
+            poll_interval=poll_interval,
+            budget=budget,
+            jobs=jobs,
+            on_submit=on_submit,
+            on_done=on_done,
+        )
+        for position, request, outcome in zip(positions, requests, outcomes, strict=True):
+            if position not in lines:
+                record_id = records[position].record_id
+                lines[position] = complete_record(record_id, request, outcome, journal, place_index)
+    for position in sorted(lines):
+        output_jsonl(lines[position])
+    return sum("error" in line for line in lines.values())
+
+
+@click.command()
+@click.argument("input_file", type=click.File("r"), default="-")
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Maximum number of queries in flight at once",
+)
+@click.option(
+    "--ordered",
+    is_flag=True,
+    help="Write results in input order (default: as each query completes)",
+)
+@click.option(
+    "--model",
+    type=click.Choice(["flash", "flash-lite", MODEL_AUTO], case_sensitive=False),
+    default="flash-lite",
+    help="Default model for records without a 'model' field; 'auto' routes each query "
+    "and adds the answering model to its result line",
+)
+@click.option(
+    "--grounding",
+    "-g",
+    is_flag=True,
+    help="Include grounding metadata (sources and citations) in each result",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+@click.option(
+    "--rpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_RPM",
+    help="Client-side limit on requests per minute, shared by all processes on this host",
+)
+@click.option(
+    "--tpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_TPM",
+    help="Client-side limit on tokens per minute, shared by all processes on this host",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ATTEMPTS,
+    show_default=True,
+    help="Attempts per query; 429, 5xx, timeouts and empty candidates are retried",
+)
+@click.option(
+    "--retry-budget",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_RETRY_BUDGET,
+    show_default=True,
+    metavar="SECONDS",
+    help="Give up retrying once this much time has been spent on a query",
+)
+@click.option(
+    "--index-places",
+    "index_places",
+    is_flag=True,
+    envvar="GEMINI_MAPS_INDEX_PLACES",
+    help="Add the places in each answer to the local index searched by 'places' "
+    "(implies --grounding)",
+)
+@click.option(
+    "--cassette",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    envvar="GEMINI_MAPS_CASSETTE",
+    help="Record API responses to, or replay them from, this directory (see --cassette-mode)",
+)
+@click.option(
+    "--cassette-mode",
+    type=click.Choice(CASSETTE_MODES, case_sensitive=False),
+    default=CASSETTE_REPLAY,
+    show_default=True,
+    envvar="GEMINI_MAPS_CASSETTE_MODE",
+    help="record: query the API and store responses; replay: answer offline from the cassette",
+)
+@click.option(
+    "--replay-latency",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    metavar="SECONDS",
+    help="Simulated latency per replayed response (default: none)",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default=None,
+    envvar="GEMINI_MAPS_METRICS_FILE",
+    help="Write Prometheus metrics (requests, errors, latency, tokens) to this file "
+    "when the run ends ('-' for stdout, after the results)",
+)
+@click.option(
+    "--max-tokens",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="GEMINI_MAPS_MAX_TOKENS",
+    help="Stop sending queries once the run has used this many tokens",
+)
+@click.option(
+    "--max-cost",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="USD",
+    envvar="GEMINI_MAPS_MAX_COST",
+    help="Stop sending queries once the run's estimated cost reaches this many US dollars",
+)
+@click.option(
+    "--journal",
+    "journal_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Record each result in this journal; rerunning with the same journal resumes "
+    "the run, answering completed records from it",
+)
+@click.option(
+    "--batch-api",
+    is_flag=True,
+    help="Submit the records as Gemini Batch API jobs: half the price, results within "
+    "24 hours, written in input order once the jobs finish",
+)
+@click.option(
+    "--poll-interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_POLL_INTERVAL,
+    show_default=True,
+    metavar="SECONDS",
+    help="With --batch-api, wait this long before polling a job; later waits grow up to 5 min",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="SECONDS",
+    help="Per-request timeout for Gemini API calls (default: no client-side limit)",
+)
+def batch(
+    input_file: IO[str],
+    workers: int,
+    ordered: bool,
+    model: str,
+    grounding: bool,
+    verbose: int,
+    rpm: float | None,
+    tpm: float | None,
+    max_attempts: int,
+    retry_budget: float,
+    index_places: bool,
+    cassette: Path | None,
+    cassette_mode: str,
+    replay_latency: float,
+    metrics_file: str | None,
+    max_tokens: int | None,
+    max_cost: float | None,
+    journal_path: Path | None,
+    batch_api: bool,
+    poll_interval: float,
+    timeout: float | None,
+) -> None:
+    """Run many grounded queries concurrently from a JSONL file.
+
+    INPUT_FILE: JSONL file with one query record per line (default: stdin)
+
+    Each input line is a JSON object with a required `query` and optional
+    `id`, `lat_lon` ("lat,lon" or [lat, lon]) and `model` fields. All queries
+    share one client and run concurrently; one JSONL result is written to
+    stdout per input record as soon as it completes.
+
+    With --max-tokens or --max-cost, no new queries are sent once the budget
+    is used up: the remaining records get a "budget_exceeded" error line and
+    results already received are still written. Queries in flight finish,
+    so a run can overshoot by up to --workers queries. Costs are estimated
+    from list prices and include the Google Maps grounding fee.
+
+    With --journal, every successful result is appended to the journal
+    before it is written to stdout. If the run dies, run the same command
+    again: records with a journaled result are written at once without a
+    query, and only the rest are sent, so stdout again gets one line per
+    record. Failed records are retried on every run. At the end the journal
+    is compacted to one entry per record of the input.
+
+    With --batch-api, the records are not queried one by one but submitted
+    as Gemini Batch API jobs, one per model, which cost half as much and
+    are answered within 24 hours. The command polls the jobs with backoff
+    and writes all results in input order once they finish. --workers,
+    --ordered, --rpm, --tpm and the retry options do not apply, and budgets
+    are not enforced since a submitted job cannot be stopped. Model 'auto'
+    is not supported.
+
+    Examples:
+
+    \b
+    # Run a file of queries with 64 concurrent workers
+    gemini-google-maps-tool batch queries.jsonl --workers 64 > results.jsonl
+
+    \b
+    # Read from stdin and keep input order
+    cat queries.jsonl | gemini-google-maps-tool batch --ordered
+
+    \b
+    # Replay a recorded run offline with 50 ms simulated latency per call
+    gemini-google-maps-tool batch queries.jsonl --cassette ./cassettes \\
+        --replay-latency 0.05
+
+    \b
+    # Export latency, error and token metrics for Prometheus
+    gemini-google-maps-tool batch queries.jsonl \\
+        --metrics-file /var/lib/node_exporter/gemini_maps.prom
+
+    \b
+    # Spend at most about $5 (tokens and grounding fees) on a run
+    gemini-google-maps-tool batch queries.jsonl --max-cost 5
+
+    \b
+    # Resumable multi-hour run: rerun the same command after a crash
+    gemini-google-maps-tool batch queries.jsonl --journal enrich.journal \\
+        --ordered > results.jsonl
+
+    \b
+    # Enrich a large file at half price through the Batch API
+    gemini-google-maps-tool batch places.jsonl --batch-api -v > results.jsonl
+
+    \b
+    Input Format:
+        {"id": "1", "query": "Coffee near Dam Square", "lat_lon": "52.373,4.893"}
+        {"id": "2", "query": "Museums in Paris", "model": "flash"}
+        {"id": "3", "query": "Plan a museum day in Paris", "model": "auto"}
+
+    \b
+    Output Format:
+        {"id": "1", "response_text": "...", "usage": {"total_tokens": 360, ...}}
+        {"id": "2", "error": "...", "reason": "rate_limited", "attempts": 3}
+
+    Environment Variables:
+        GEMINI_API_KEY: Required API key for Gemini authentication
+        GEMINI_API_KEYS: Several API keys (comma-separated) to spread queries over
+        GEMINI_API_KEYS_FILE: File with one API key per line, instead of GEMINI_API_KEYS
+        GEMINI_MAPS_RPM: Default for --rpm
+        GEMINI_MAPS_TPM: Default for --tpm
+        GEMINI_MAPS_INDEX_PLACES: Set to 1 to always use --index-places
+        GEMINI_MAPS_PLACES_DB: Place index path
+        GEMINI_MAPS_CASSETTE: Default for --cassette
+        GEMINI_MAPS_CASSETTE_MODE: Default for --cassette-mode
+        GEMINI_MAPS_METRICS_FILE: Default for --metrics-file
+        GEMINI_MAPS_MAX_TOKENS: Default for --max-tokens
+        GEMINI_MAPS_MAX_COST: Default for --max-cost
+    """
+    setup_logging(verbose)
+    logger.info("Starting batch command")
+
+    metrics = None
+    if metrics_file:
+        metrics = QueryMetrics()
+        click.get_current_context().call_on_close(
+            partial(write_metrics, metrics.registry, metrics_file)
+        )
+
+    records = read_records(input_file, resolve_model_name(model), grounding or index_places)
+    logger.info(f"Read {len(records)} records, running with {workers} workers")
+
+    try:
+        rate_limiter = None
+        if rpm or tpm:
+            rate_limiter = RateLimiter(rpm=rpm, tpm=tpm, state_path=default_state_path())
+            logger.info(f"Rate limiting to rpm={rpm}, tpm={tpm}")
+        retry = RetryPolicy(max_attempts=max_attempts, budget=retry_budget)
+        # Size the connection pool so every worker can hold a connection
+        transport = TransportOptions(
+            timeout=timeout,
+            max_connections=workers,
+            max_keepalive_connections=workers,
+            cassette=cassette,
+            cassette_mode=cassette_mode.lower(),
+            replay_latency=replay_latency,
+        )
+        budget = Budget(max_tokens=max_tokens, max_cost=max_cost)
+        journal = None
+        if journal_path is not None:
+            try:
+                journal = RunJournal(journal_path)
+            except OSError as e:
+                log_error(f"Cannot use journal {journal_path}: {e}")
+                sys.exit(1)
+        try:
+            place_index = PlaceIndex() if index_places else None
+        except (sqlite3.Error, OSError) as e:
+            if journal is not None:
+                journal.close()
+            log_error(f"Cannot open the place index: {e}")
+            sys.exit(1)
+        try:
+            if batch_api:
+                failures = run_batch_api(
+                    records, transport, place_index, budget, journal, poll_interval
+                )
+            else:
+                failures = asyncio.run(
+                    run_batch(
+                        records,
+                        workers,
+                        ordered,
+                        rate_limiter,
+                        retry,
+                        transport,
+                        place_index,
+                        metrics,
+                        budget,
+                        journal,
+                    )
+                )
+            if journal is not None:
+                kept = journal.compact(
+                    (record.record_id, request_fingerprint(record.request))
+                    for record in records
+                    if record.request is not None
+                )
+                logger.info(f"Journal {journal.path} holds {kept} of {len(records)} records")
+        finally:
+            if journal is not None:
+                journal.close()
+            if place_index is not None:
+                place_index.close()
+    except ClientError as e:
+        log_error(str(e))
+        sys.exit(1)
+
+    if failures:
+        logger.warning(f"{failures} of {len(records)} records failed")
+    if budget.exhausted:
+        logger.warning("Budget exhausted; records without a result were not sent")
+    if max_tokens is not None or max_cost is not None:
+        log_run_usage(budget.usage)
+    logger.info("Batch completed")
@@ -0,0 +1,302 @@
+"""Corridor command implementation for grounded queries along a route.
+
+Provides the 'corridor' CLI command that samples points along an encoded
+polyline or GeoJSON LineString, queries them concurrently, and prints the
+places found, de-duplicated and ordered by distance along the route.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import sys
+from typing import IO
+
+import click
+
+from gemini_google_maps_tool.core import get_async_client
+from gemini_google_maps_tool.core.client import ClientError, TransportOptions
+from gemini_google_maps_tool.core.corridor import (
+    DEFAULT_SPACING_M,
+    CorridorPlace,
+    corridor_async,
+    parse_route,
+)
+from gemini_google_maps_tool.core.costs import Budget
+from gemini_google_maps_tool.core.maps import DEFAULT_CONCURRENCY, MODEL_AUTO, resolve_model_name
+from gemini_google_maps_tool.core.ratelimit import RateLimiter, default_state_path
+from gemini_google_maps_tool.core.retry import DEFAULT_MAX_ATTEMPTS, RetryPolicy
+from gemini_google_maps_tool.core.sweep import BoundingBox
+from gemini_google_maps_tool.logging_config import get_logger, setup_logging
+from gemini_google_maps_tool.utils import OUTPUT_FORMATS, log_error, log_run_usage, output_records
+
+logger = get_logger(__name__)
+
+
+def output_corridor_markdown(places: list[CorridorPlace]) -> None:
+    """Output places along a route as a numbered markdown list.
+
+    Args:
+        places: Places to print, in route order.
+    """
+    for i, place in enumerate(places, 1):
+        title = place.chunk.title or "Unknown"
+        uri = place.chunk.uri
+        link = f"[{title}]({uri})" if uri else title
+        click.echo(f"{i}. {link} (km {place.distance_m / 1000:.1f})")
+        if place.chunk.place_id:
+            click.echo(f"   place_id: {place.chunk.place_id}")
+
+
+@click.command()
+@click.argument("query_text")
+@click.option(
+    "--polyline",
+    default=None,
+    help="Route as an encoded polyline (e.g., from the Directions or Routes API)",
+)
+@click.option(
+    "--route",
+    "route_file",
+    type=click.File("r"),
+    default=None,
+    help="File with the route as GeoJSON (LineString, Feature or FeatureCollection) "
+    "or an encoded polyline ('-' for stdin)",
+)
+@click.option(
+    "--polyline-precision",
+    type=click.IntRange(min=5, max=6),
+    default=5,
+    show_default=True,
+    help="Decimal digits of the encoded polyline (6 for OSRM/Valhalla polyline6)",
+)
+@click.option(
+    "--spacing",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_SPACING_M,
+    show_default=True,
+    metavar="METERS",
+    help="Distance between sample points along the route",
+)
+@click.option(
+    "--dense-bbox",
+    "dense_bboxes",
+    multiple=True,
+    metavar="MIN_LAT,MIN_LON,MAX_LAT,MAX_LON",
+    help="Area (e.g. a town on the route) sampled at --dense-spacing instead; repeatable",
+)
+@click.option(
+    "--dense-spacing",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="METERS",
+    help="Distance between sample points inside --dense-bbox areas (default: --spacing / 4)",
+)
+@click.option(
+    "--model",
+    type=click.Choice(["flash", "flash-lite", MODEL_AUTO], case_sensitive=False),
+    default="flash-lite",
+    help="Model to use: 'flash' (gemini-2.5-flash), 'flash-lite' (gemini-2.5-flash-lite) "
+    "or 'auto' (flash only where flash-lite finds no places)",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Maximum number of queries in flight at once",
+)
+@click.option(
+    "--text",
+    "-t",
+    is_flag=True,
+    help="Output markdown text instead of JSON (same as --format text)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    default=None,
+    help="Output format: json (indented array, default), compact (one-line array), "
+    "ndjson (one place per line) or text (markdown)",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+@click.option(
+    "--rpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_RPM",
+    help="Client-side limit on requests per minute, shared by all processes on this host",
+)
+@click.option(
+    "--tpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_TPM",
+    help="Client-side limit on tokens per minute, shared by all processes on this host",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ATTEMPTS,
+    show_default=True,
+    help="Attempts per query; 429, 5xx, timeouts and empty candidates are retried",
+)
+@click.option(
+    "--max-tokens",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="GEMINI_MAPS_MAX_TOKENS",
+    help="Stop sending queries once the run has used this many tokens",
+)
+@click.option(
+    "--max-cost",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="USD",
+    envvar="GEMINI_MAPS_MAX_COST",
+    help="Stop sending queries once the run's estimated cost reaches this many US dollars",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="SECONDS",
+    help="Per-request timeout for Gemini API calls (default: no client-side limit)",
+)
+def corridor(
+    query_text: str,
+    polyline: str | None,
+    route_file: IO[str] | None,
+    polyline_precision: int,
+    spacing: float,
+    dense_bboxes: tuple[str, ...],
+    dense_spacing: float | None,
+    model: str,
+    workers: int,
+    text: bool,
+    output_format: str | None,
+    verbose: int,
+    rpm: float | None,
+    tpm: float | None,
+    max_attempts: int,
+    max_tokens: int | None,
+    max_cost: float | None,
+    timeout: float | None,
+) -> None:
+    """Find places along a route, ordered by distance from its start.
+
+    QUERY_TEXT: The query to run at every sample point (e.g., "EV chargers")
+
+    Points are sampled every --spacing meters along the route (both ends
+    included), or every --dense-spacing meters inside --dense-bbox areas, and
+    the query runs concurrently at all of them. Places are merged,
+    de-duplicated by place id and ordered by the distance along the route of
+    the first sample that found them; a summary goes to stderr.
+
+    Examples:
+
+    \b
+    # EV chargers every 10 km along a route from the Routes API
+    gemini-google-maps-tool corridor "EV fast chargers" \\
+        --polyline "$(jq -r '.routes[0].polyline.encodedPolyline' route.json)" \\
+        --spacing 10000
+
+    \b
+    # Rest stops along a GeoJSON route, sampling towns every 1 km
+    gemini-google-maps-tool corridor "Rest stops with food" --route a2.geojson \\
+        --spacing 8000 --dense-bbox 52.05,5.05,52.12,5.17 --dense-spacing 1000 --text
+
+    \b
+    Output Format:
+        [
+          {
+            "title": "...",
+            "uri": "https://maps.google.com/?cid=...",
+            "place_id": "places/ChIJ...",
+            "distance_m": 20000.0,
+            "lat_lon": [52.21, 4.98],
+            "hits": 2
+          }
+        ]
+
+    Environment Variables:
+        GEMINI_API_KEY: Required API key for Gemini authentication
+        GEMINI_MAPS_RPM: Default for --rpm
+        GEMINI_MAPS_TPM: Default for --tpm
+        GEMINI_MAPS_MAX_TOKENS: Default for --max-tokens
+        GEMINI_MAPS_MAX_COST: Default for --max-cost
+    """
+    setup_logging(verbose)
+
+    if text and output_format not in (None, "text"):
+        raise click.UsageError(f"Cannot combine --format {output_format} with --text.")
+    output_format = "text" if text else (output_format or "json").lower()
+    if polyline is not None and route_file is not None:
+        raise click.UsageError("Cannot combine --polyline with --route.")
+    if polyline is not None:
+        route_text = polyline
+    elif route_file is not None:
+        route_text = route_file.read()
+    else:
+        raise click.UsageError("Specify the route with --polyline or --route.")
+    try:
+        route = parse_route(route_text, polyline_precision)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--polyline' / '--route'") from e
+    try:
+        dense_areas = [BoundingBox.parse(bbox) for bbox in dense_bboxes]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--dense-bbox'") from e
+
+    budget = Budget(max_tokens=max_tokens, max_cost=max_cost)
+    try:
+        rate_limiter = None
+        if rpm or tpm:
+            rate_limiter = RateLimiter(rpm=rpm, tpm=tpm, state_path=default_state_path())
+        transport = TransportOptions(
+            timeout=timeout, max_connections=workers, max_keepalive_connections=workers
+        )
+        result = asyncio.run(
+            corridor_async(
+                get_async_client(transport),
+                query_text,
+                route,
+                spacing,
+                dense_areas,
+                dense_spacing,
+                resolve_model_name(model),
+                workers,
+                rate_limiter=rate_limiter,
+                retry=RetryPolicy(max_attempts=max_attempts),
+                budget=budget,
+            )
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e)) from e
+    except ClientError as e:
+        log_error(str(e))
+        sys.exit(1)
+
+    click.echo(
+        f"Queried {len(result.samples)} points over {result.length_m / 1000:.1f} km "
+        f"({result.failed} failed), found {len(result.places)} places",
+        err=True,
+    )
+    if max_tokens is not None or max_cost is not None:
+        log_run_usage(budget.usage)
+    if result.failed == len(result.samples):
+        reasons = sorted({sample.error for sample in result.samples if sample.error})
+        log_error(f"Every query along the route failed ({', '.join(reasons)})")
+        sys.exit(1)
+
+    if output_format == "text":
+        output_corridor_markdown(result.places)
+    else:
+        output_records((place.to_dict() for place in result.places), output_format)
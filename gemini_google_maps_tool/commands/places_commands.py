@@ -0,0 +1,172 @@
+"""Places command implementation for the local place index.
+
+Provides the 'places' CLI command that searches places collected from
+earlier grounded queries (see 'query --index-places') without any API call.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import sys
+
+import click
+
+from gemini_google_maps_tool.core.places import (
+    DEFAULT_SEARCH_LIMIT,
+    PlaceIndex,
+    PlaceRecord,
+    default_index_path,
+)
+from gemini_google_maps_tool.logging_config import get_logger, setup_logging
+from gemini_google_maps_tool.utils import OUTPUT_FORMATS, log_error, output_records
+
+logger = get_logger(__name__)
+
+
+def output_places_markdown(records: list[PlaceRecord]) -> None:
+    """Output indexed places as a numbered markdown list.
+
+    Args:
+        records: Places to print, in order.
+    """
+    for i, record in enumerate(records, 1):
+        title = record.title or "Unknown"
+        line = f"{i}. [{title}]({record.uri})" if record.uri else f"{i}. {title}"
+        click.echo(line)
+        if record.place_id:
+            click.echo(f"   place_id: {record.place_id}")
+        if record.queries:
+            click.echo(f"   seen {record.seen_count}x, last for: {record.queries[0]}")
+
+
+@click.command()
+@click.argument("search_text", required=False)
+@click.option(
+    "--place-id",
+    default=None,
+    help="Look up a single place by its Google Maps place id",
+)
+@click.option(
+    "--limit",
+    "-n",
+    type=click.IntRange(min=1),
+    default=DEFAULT_SEARCH_LIMIT,
+    show_default=True,
+    help="Maximum number of places to show",
+)
+@click.option(
+    "--fuzzy/--no-fuzzy",
+    default=True,
+    help="Fall back to fuzzy name matching when nothing matches exactly (default: on)",
+)
+@click.option(
+    "--text",
+    "-t",
+    is_flag=True,
+    help="Output markdown text instead of JSON (same as --format text)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    default=None,
+    help="Output format: json (indented array, default), compact (one-line array), "
+    "ndjson (one place per line) or text (markdown)",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+def places(
+    search_text: str | None,
+    place_id: str | None,
+    limit: int,
+    fuzzy: bool,
+    text: bool,
+    output_format: str | None,
+    verbose: int,
+) -> None:
+    """Search places seen in earlier queries, without calling the API.
+
+    SEARCH_TEXT: Words to find in place names or in the queries that found
+    them (omit to list the most recently seen places)
+
+    Places are collected by 'query --index-places' and
+    'batch --index-places'. Every word must match the start of a word in the
+    place name or an originating query; misspelled names fall back to fuzzy
+    matching.
+
+    Examples:
+
+    \b
+    # Collect places while querying
+    gemini-google-maps-tool query "Best bakeries in Utrecht" --index-places
+
+    \b
+    # Find one again later
+    gemini-google-maps-tool places bakkerij --text
+
+    \b
+    # Look up a place id
+    gemini-google-maps-tool places --place-id ChIJN1t_tDeuEmsRUsoyG83frY4
+
+    \b
+    # One JSON record per line, for jq and other line-based tools
+    gemini-google-maps-tool places --limit 100 --format ndjson
+
+    \b
+    Output Format:
+        [
+          {
+            "place_id": "...",
+            "title": "...",
+            "uri": "https://maps.google.com/?cid=...",
+            "seen_count": 2,
+            "first_seen": 1760000000.0,
+            "last_seen": 1760000000.0,
+            "queries": ["Best bakeries in Utrecht"],
+            "last_lat_lon": null
+          }
+        ]
+
+    Environment Variables:
+        GEMINI_MAPS_PLACES_DB: Place index path
+                               (default: ~/.local/share/gemini-google-maps-tool/places.sqlite3)
+    """
+    setup_logging(verbose)
+
+    if search_text and place_id:
+        raise click.UsageError("Cannot specify both SEARCH_TEXT and --place-id.")
+    if text and output_format not in (None, "text"):
+        raise click.UsageError(f"Cannot combine --format {output_format} with --text.")
+    output_format = "text" if text else (output_format or "json").lower()
+
+    path = default_index_path()
+    if not path.exists():
+        log_error(f"No place index at {path}. Run queries with --index-places first.")
+        sys.exit(1)
+
+    index = PlaceIndex(path)
+    try:
+        if place_id:
+            record = index.get(place_id)
+            if record is None:
+                log_error(f"Place not found in index: {place_id}")
+                sys.exit(1)
+            records = [record]
+        elif search_text:
+            records = index.search(search_text, limit=limit, fuzzy=fuzzy)
+        else:
+            records = index.recent(limit)
+    finally:
+        index.close()
+    logger.info(f"Found {len(records)} places in {path}")
+
+    if output_format == "text":
+        if not records:
+            click.echo("No matching places.", err=True)
+        output_places_markdown(records)
+    else:
+        output_records((record.to_dict() for record in records), output_format)
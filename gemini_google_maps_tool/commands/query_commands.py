@@ -6,24 +6,151 @@ Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+from __future__ import annotations
+
+import sqlite3
 import sys
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
-from gemini_google_maps_tool.core import get_client, query_maps
-from gemini_google_maps_tool.core.client import ClientError
-from gemini_google_maps_tool.core.maps import QueryError
+from gemini_google_maps_tool.core import get_client, query_maps, query_maps_stream
+from gemini_google_maps_tool.core.cache import DEFAULT_TTL, ResponseCache
+from gemini_google_maps_tool.core.client import (
+    CASSETTE_MODES,
+    CASSETTE_REPLAY,
+    ClientError,
+    TransportOptions,
+)
+from gemini_google_maps_tool.core.geo import DEFAULT_GEO_PRECISION, DEFAULT_GEO_RADIUS_M, GeoGrid
+from gemini_google_maps_tool.core.maps import (
+    MODEL_AUTO,
+    MapsQueryResult,
+    QueryError,
+    ResultCache,
+    resolve_model_name,
+)
+from gemini_google_maps_tool.core.metrics import QueryMetrics, QueryObservation
+from gemini_google_maps_tool.core.places import PlaceIndex
+from gemini_google_maps_tool.core.ratelimit import RateLimiter, default_state_path
+from gemini_google_maps_tool.core.retry import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_RETRY_BUDGET,
+    RetryPolicy,
+)
+from gemini_google_maps_tool.core.server import query_via_daemon
 from gemini_google_maps_tool.logging_config import get_logger, setup_logging
 from gemini_google_maps_tool.utils import (
+    OUTPUT_FORMATS,
     log_error,
+    log_timings,
     output_json,
     output_markdown,
+    output_sources,
     read_stdin,
+    write_metrics,
 )
 
+if TYPE_CHECKING:
+    from google import genai
+
 logger = get_logger(__name__)
 
 
+def stream_query(
+    client: genai.Client,
+    query_text: str,
+    lat_lon: tuple[float, float] | None,
+    model: str,
+    *,
+    cache: ResultCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    metrics: QueryMetrics | None = None,
+) -> MapsQueryResult:
+    """Stream a grounded query as markdown: text chunks first, then sources.
+
+    A cached answer is printed at once; otherwise the streamed result is
+    stored in the cache after the stream completes.
+
+    Args:
+        client: Initialized Gemini API client.
+        query_text: The query to send.
+        lat_lon: Optional (latitude, longitude) location context.
+        model: Full model name.
+        cache: Optional response cache.
+        rate_limiter: Optional request rate limiter.
+        retry: Optional retry policy for failures before the first chunk.
+        metrics: Optional metrics recording the streamed query.
+
+    Returns:
+        The complete (cached or streamed) result.
+
+    Raises:
+        QueryError: If the query fails.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key_for(query_text, lat_lon, model, True)
+        cached = cache.get(key)
+        if cached is not None:
+            output_markdown(cached.response_text, cached.grounding_metadata)
+            return cached
+
+    stream = query_maps_stream(
+        client,
+        query_text,
+        lat_lon,
+        model,
+        True,
+        rate_limiter=rate_limiter,
+        retry=retry,
+        metrics=metrics,
+    )
+    try:
+        for text in stream:
+            click.echo(text, nl=False)
+    except QueryError as e:
+        if cache is not None and key is not None:
+            cache.put_error(key, e)
+        raise
+    click.echo()
+
+    result = stream.result
+    if cache is not None and key is not None:
+        cache.put(key, result)
+    output_sources(result.grounding_metadata)
+    return result
+
+
+def index_places(
+    result: MapsQueryResult, query_text: str, lat_lon: tuple[float, float] | None, model: str
+) -> None:
+    """Add a result's grounding chunks to the local place index.
+
+    Indexing is best effort: database errors are logged, never raised, so
+    they cannot fail a query that already succeeded.
+
+    Args:
+        result: Query result with grounding metadata.
+        query_text: The query that produced it.
+        lat_lon: Optional location context of the query.
+        model: Full model name.
+    """
+    try:
+        index = PlaceIndex()
+        try:
+            count = index.add_result(result, query_text, lat_lon, model)
+        finally:
+            index.close()
+        logger.info(f"Indexed {count} places in {index.path}")
+    except sqlite3.Error as e:
+        logger.warning(f"Could not update the place index: {e}")
+
+
 @click.command()
 @click.argument("query_text", required=False)
 @click.option(
@@ -40,9 +167,10 @@ logger = get_logger(__name__)
 )
 @click.option(
     "--model",
-    type=click.Choice(["flash", "flash-lite"], case_sensitive=False),
+    type=click.Choice(["flash", "flash-lite", MODEL_AUTO], case_sensitive=False),
     default="flash-lite",
-    help="Model to use: 'flash' (gemini-2.5-flash) or 'flash-lite' (gemini-2.5-flash-lite)",
+    help="Model to use: 'flash' (gemini-2.5-flash), 'flash-lite' (gemini-2.5-flash-lite) "
+    "or 'auto' (flash for planning queries and unusable flash-lite answers)",
 )
 @click.option(
     "--stdin",
@@ -54,7 +182,132 @@ logger = get_logger(__name__)
     "--text",
     "-t",
     is_flag=True,
-    help="Output markdown text instead of JSON",
+    help="Output markdown text instead of JSON (same as --format text)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    default=None,
+    help="Output format: json (indented, default), compact (one line), ndjson "
+    "(one flushed line) or text (markdown)",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print response text as it is generated, then the sources (implies --text)",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    help="Serve repeated queries from the on-disk response cache (default: off)",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.IntRange(min=1),
+    default=DEFAULT_TTL,
+    show_default=True,
+    metavar="SECONDS",
+    help="How long cached responses stay valid",
+)
+@click.option(
+    "--cache-geo-precision",
+    type=click.IntRange(min=1, max=12),
+    default=DEFAULT_GEO_PRECISION,
+    show_default=True,
+    help="Geohash precision used to bucket --lat-lon for cache keys (7 is ~150 m)",
+)
+@click.option(
+    "--cache-geo-radius",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_GEO_RADIUS_M,
+    show_default=True,
+    metavar="METERS",
+    help="Reuse a cached answer from a nearby cell within this distance (0 disables)",
+)
+@click.option(
+    "--rpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_RPM",
+    help="Client-side limit on requests per minute, shared by all processes on this host",
+)
+@click.option(
+    "--tpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_TPM",
+    help="Client-side limit on tokens per minute, shared by all processes on this host",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ATTEMPTS,
+    show_default=True,
+    help="Attempts per query; 429, 5xx, timeouts and empty candidates are retried",
+)
+@click.option(
+    "--retry-budget",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_RETRY_BUDGET,
+    show_default=True,
+    metavar="SECONDS",
+    help="Give up retrying once this much time has been spent on a query",
+)
+@click.option(
+    "--index-places",
+    "index_places_flag",
+    is_flag=True,
+    envvar="GEMINI_MAPS_INDEX_PLACES",
+    help="Add the places in the answer to the local index searched by 'places'",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Report per-phase timings and token usage (JSON: 'timings'/'usage' keys; "
+    "text: a summary on stderr); always runs the query in this process",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default=None,
+    envvar="GEMINI_MAPS_METRICS_FILE",
+    help="Write Prometheus metrics (requests, errors, latency, tokens) to this file "
+    "when the command exits ('-' for stdout)",
+)
+@click.option(
+    "--daemon/--no-daemon",
+    default=True,
+    help="Forward to a running 'serve' daemon when available (default: on)",
+)
+@click.option(
+    "--cassette",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    envvar="GEMINI_MAPS_CASSETTE",
+    help="Record API responses to, or replay them from, this directory (see --cassette-mode)",
+)
+@click.option(
+    "--cassette-mode",
+    type=click.Choice(CASSETTE_MODES, case_sensitive=False),
+    default=CASSETTE_REPLAY,
+    show_default=True,
+    envvar="GEMINI_MAPS_CASSETTE_MODE",
+    help="record: query the API and store responses; replay: answer offline from the cassette",
+)
+@click.option(
+    "--replay-latency",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    metavar="SECONDS",
+    help="Simulated latency per replayed response (default: none)",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="SECONDS",
+    help="Per-request timeout for Gemini API calls (default: no client-side limit)",
 )
 def query(
     query_text: str | None,
@@ -63,6 +316,24 @@ def query(
     model: str,
     stdin: bool,
     text: bool,
+    output_format: str | None,
+    stream: bool,
+    cache: bool,
+    cache_ttl: int,
+    cache_geo_precision: int,
+    cache_geo_radius: float,
+    rpm: float | None,
+    tpm: float | None,
+    max_attempts: int,
+    retry_budget: float,
+    index_places_flag: bool,
+    timings: bool,
+    metrics_file: str | None,
+    daemon: bool,
+    cassette: Path | None,
+    cassette_mode: str,
+    replay_latency: float,
+    timeout: float | None,
 ) -> None:
     """Query Gemini with Google Maps grounding for location-aware information.
 
@@ -76,8 +347,17 @@ def query(
       • Multi-level verbosity: -v (INFO), -vv (DEBUG), -vvv (TRACE)
       • Location context: --lat-lon for personalized results
       • Model choice: flash (powerful) or flash-lite (fast, default)
-      • Output formats: JSON (default) or Markdown (--text)
+      • Output formats: JSON (default), compact JSON, NDJSON or Markdown (--format)
+      • Streaming: --stream prints text as soon as the model produces it
       • Stdin support: pipe queries from other tools
+      • Response cache: --cache reuses answers to identical queries
+      • Rate limiting: --rpm/--tpm pace requests across processes
+      • Retries: transient failures are retried with jittered backoff
+      • Place index: --index-places keeps sources searchable via 'places'
+      • Timings: --timings breaks a query down into config, network and parsing
+      • Metrics: --metrics-file writes Prometheus metrics for alerting
+      • Daemon: forwards to a running 'serve' daemon for a warm client
+      • Offline runs: --cassette records API responses and replays them
 
     Examples:
 
@@ -101,6 +381,10 @@ def query(
     gemini-google-maps-tool query "Plan a 3-day trip to NYC" \\
         --model flash
 
+    \b
+    # Let flash-lite answer lookups, escalating to flash when it has no sources
+    gemini-google-maps-tool query "Pharmacies open now" --model auto -v
+
     \b
     # Reading from stdin (for pipelines)
     echo "Best sushi near Times Square" | \\
@@ -112,6 +396,35 @@ def query(
     gemini-google-maps-tool query "Best museums in Paris" \\
         --text
 
+    \b
+    # Single-line JSON for machine consumers
+    gemini-google-maps-tool query "Parks in Berlin" --format compact
+
+    \b
+    # Stream the answer as it is generated
+    gemini-google-maps-tool query "Plan a day in Rome" --model flash \\
+        --stream
+
+    \b
+    # Cache responses for an hour (hit/miss is reported with -v)
+    gemini-google-maps-tool query "Best bakeries in Utrecht" \\
+        --cache --cache-ttl 3600 -v
+
+    \b
+    # Where does the time go? (per-phase milliseconds and token usage)
+    gemini-google-maps-tool query "Hotels in Lisbon" --timings
+
+    \b
+    # Export Prometheus metrics for node_exporter's textfile collector
+    gemini-google-maps-tool query "Bakeries in Utrecht" \\
+        --metrics-file /var/lib/node_exporter/gemini_maps.prom
+
+    \b
+    # Record responses once, then replay them offline (no API key needed)
+    gemini-google-maps-tool query "Museums in Paris" \\
+        --cassette ./cassettes --cassette-mode record
+    gemini-google-maps-tool query "Museums in Paris" --cassette ./cassettes
+
     \b
     Output Format:
         JSON (default):
@@ -121,10 +434,17 @@ def query(
             "grounding_chunks": [...],
             "grounding_supports": [...],
             "google_maps_widget_context_token": "..."
-          }
+          },
+          "cache": "hit",  // Only with --cache and -v or higher
+          "attempts": 2,   // Only with -v or higher when a retry was needed
+          "usage": {"prompt_tokens": 12, "total_tokens": 360, ...},  // -v or --timings
+          "timings": {"network_ms": 812.4, "total_ms": 815.0, ...}   // -v or --timings
         }
 
-        Markdown (with --text):
+        Compact JSON (with --format compact or ndjson):
+        {"response_text":"...","grounding_metadata":{...}}
+
+        Markdown (with --text or --format text):
         <response text>
 
         ---
@@ -137,12 +457,36 @@ def query(
     Environment Variables:
         GEMINI_API_KEY: Required API key for Gemini authentication
                        Get your key: https://aistudio.google.com/app/apikey
+        GEMINI_MAPS_RPM: Default for --rpm
+        GEMINI_MAPS_TPM: Default for --tpm
+        GEMINI_MAPS_SOCKET: Socket of the 'serve' daemon to forward to
+        GEMINI_MAPS_INDEX_PLACES: Set to 1 to always use --index-places
+        GEMINI_MAPS_PLACES_DB: Place index path
+        GEMINI_MAPS_CASSETTE: Default for --cassette
+        GEMINI_MAPS_CASSETTE_MODE: Default for --cassette-mode
+        GEMINI_MAPS_METRICS_FILE: Default for --metrics-file
     """
     # Setup logging based on verbosity count
     setup_logging(verbose)
     logger.info("Starting Maps query command")
 
+    metrics = None
+    if metrics_file:
+        metrics = QueryMetrics()
+        click.get_current_context().call_on_close(
+            partial(write_metrics, metrics.registry, metrics_file)
+        )
+
     try:
+        if text or stream:
+            if output_format not in (None, "text"):
+                raise click.UsageError(
+                    f"Cannot combine --format {output_format} with --text or --stream."
+                )
+            output_format = "text"
+        output_format = (output_format or "json").lower()
+        text = output_format == "text"
+
         # Determine query source
         if stdin:
             if query_text:
@@ -174,89 +518,107 @@ def query(
                 sys.exit(1)
 
         # Map model choice to full model name
-        model_name = "gemini-2.5-flash" if model == "flash" else "gemini-2.5-flash-lite"
+        model_name = resolve_model_name(model)
         logger.info(f"Using model: {model_name}")
 
-        # Get client and execute query
-        client = get_client()
-        logger.info("Querying with Google Maps grounding...")
-
-        # Include grounding if verbose >= 1 OR text mode (for sources)
-        include_grounding = verbose >= 1 or text
-
-        result = query_maps(
-            client=client,
-            query=query_input,
-            lat_lon=lat_lon_tuple,
-            model=model_name,
-            include_grounding=include_grounding,
-        )
+        # Include grounding if verbose >= 1, text mode (for sources) or indexing
+        include_grounding = verbose >= 1 or text or stream or index_places_flag
+        retry = RetryPolicy(max_attempts=max_attempts, budget=retry_budget)
+
+        # Forward to a running daemon; streaming, the on-disk cache, cassettes
+        # and timings need local state, and the daemon applies its own rate
+        # limits and timeout, so those queries always run in this process
+        result = None
+        local_only = stream or cache or cassette is not None or timings
+        if daemon and not local_only and not (rpm or tpm or timeout):
+            tracked: AbstractContextManager[QueryObservation] = nullcontext(QueryObservation())
+            if metrics is not None:
+                tracked = metrics.track(model_name)
+            with tracked as observation:
+                result = query_via_daemon(
+                    query_input, lat_lon_tuple, model_name, include_grounding, retry=retry
+                )
+                observation.result = result
+            if result is not None:
+                logger.info("Query answered by daemon")
+
+        if result is None:
+            # Get client and execute query
+            client = get_client(
+                TransportOptions(
+                    timeout=timeout,
+                    cassette=cassette,
+                    cassette_mode=cassette_mode.lower(),
+                    replay_latency=replay_latency,
+                )
+            )
+            logger.info("Querying with Google Maps grounding...")
+
+            response_cache = None
+            if cache:
+                geo = GeoGrid(precision=cache_geo_precision, max_distance_m=cache_geo_radius)
+                response_cache = ResponseCache(ttl=cache_ttl, geo=geo)
+
+            rate_limiter = None
+            if rpm or tpm:
+                rate_limiter = RateLimiter(rpm=rpm, tpm=tpm, state_path=default_state_path())
+                logger.info(f"Rate limiting to rpm={rpm}, tpm={tpm}")
+
+            if stream:
+                result = stream_query(
+                    client,
+                    query_input,
+                    lat_lon_tuple,
+                    model_name,
+                    cache=response_cache,
+                    rate_limiter=rate_limiter,
+                    retry=retry,
+                    metrics=metrics,
+                )
+                if index_places_flag:
+                    index_places(result, query_input, lat_lon_tuple, result.model or model_name)
+                if timings:
+                    log_timings(result.timings, result.usage)
+                logger.info("Query completed successfully")
+                return
+
+            result = query_maps(
+                client=client,
+                query=query_input,
+                lat_lon=lat_lon_tuple,
+                model=model_name,
+                include_grounding=include_grounding,
+                cache=response_cache,
+                rate_limiter=rate_limiter,
+                retry=retry,
+                metrics=metrics,
+            )
 
         logger.info("Query completed successfully")
+        if model_name == MODEL_AUTO:
+            logger.info(f"Answered by {result.model}")
+
+        if index_places_flag:
+            index_places(result, query_input, lat_lon_tuple, result.model or model_name)
 
         # Output based on format preference
         if text:
-            # Text/markdown output
-            grounding_dict: dict[str, object] | None = None
-            if result.grounding_metadata:
-                metadata = result.grounding_metadata
-                grounding_dict = {}
-
-                # Add grounding chunks for markdown sources
-                if metadata.grounding_chunks:
-                    grounding_dict["grounding_chunks"] = [
-                        {
-                            "title": chunk.title,
-                            "uri": chunk.uri,
-                            "place_id": chunk.place_id,
-                        }
-                        for chunk in metadata.grounding_chunks
-                    ]
-
-            output_markdown(result.response_text, grounding_dict)
+            output_markdown(result.response_text, result.grounding_metadata)
+            if timings:
+                log_timings(result.timings, result.usage)
         else:
-            # JSON output
-            output: dict[str, object] = {"response_text": result.response_text}
-
-            if verbose >= 1 and result.grounding_metadata:
-                metadata = result.grounding_metadata
-                grounding_dict_json: dict[str, object] = {}
-
-                # Add grounding chunks
-                if metadata.grounding_chunks:
-                    grounding_dict_json["grounding_chunks"] = [
-                        {
-                            "title": chunk.title,
-                            "uri": chunk.uri,
-                            "place_id": chunk.place_id,
-                        }
-                        for chunk in metadata.grounding_chunks
-                    ]
-
-                # Add grounding supports
-                if metadata.grounding_supports:
-                    grounding_dict_json["grounding_supports"] = [
-                        {
-                            "segment": {
-                                "start_index": support.segment.start_index,
-                                "end_index": support.segment.end_index,
-                                "text": support.segment.text,
-                            },
-                            "grounding_chunk_indices": support.grounding_chunk_indices,
-                        }
-                        for support in metadata.grounding_supports
-                    ]
-
-                # Add widget token
-                if metadata.google_maps_widget_context_token:
-                    grounding_dict_json["google_maps_widget_context_token"] = (
-                        metadata.google_maps_widget_context_token
-                    )
-
-                if grounding_dict_json:
-                    output["grounding_metadata"] = grounding_dict_json
-
-            output_json(output)
+            output = result.to_dict(include_grounding=verbose >= 1)
+            if verbose >= 1 and cache:
+                output["cache"] = "hit" if result.from_cache else "miss"
+            if verbose >= 1 and result.attempts > 1:
+                output["attempts"] = result.attempts
+            if verbose >= 1 and model_name == MODEL_AUTO and result.model is not None:
+                output["model"] = result.model
+            if (verbose >= 1 or timings) and result.usage is not None:
+                output["usage"] = result.usage.to_dict()
+            if (verbose >= 1 or timings) and result.timings is not None:
+                output["timings"] = result.timings.to_dict()
+            output_json(output, output_format)
 
     except ClientError as e:
         log_error(str(e))
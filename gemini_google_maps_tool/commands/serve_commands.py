@@ -0,0 +1,200 @@
+"""Serve command implementation for the local query daemon.
+
+Provides the 'serve' CLI command that keeps a warm Gemini client and an
+in-memory cache alive on a Unix socket, so 'query' invocations can forward
+to it instead of paying client startup and connection setup on every call.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import signal
+import sys
+import threading
+from pathlib import Path
+from types import FrameType
+
+import click
+
+from gemini_google_maps_tool.core import get_client
+from gemini_google_maps_tool.core.cache import MemoryCache
+from gemini_google_maps_tool.core.client import ClientError, TransportOptions
+from gemini_google_maps_tool.core.geo import DEFAULT_GEO_PRECISION, DEFAULT_GEO_RADIUS_M, GeoGrid
+from gemini_google_maps_tool.core.ratelimit import RateLimiter, default_state_path
+from gemini_google_maps_tool.core.retry import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_RETRY_BUDGET,
+    RetryPolicy,
+)
+from gemini_google_maps_tool.core.server import (
+    DEFAULT_DAEMON_CACHE_ENTRIES,
+    DEFAULT_DAEMON_CACHE_TTL,
+    QueryDaemon,
+    default_socket_path,
+)
+from gemini_google_maps_tool.logging_config import get_logger, setup_logging
+from gemini_google_maps_tool.utils import log_error
+
+logger = get_logger(__name__)
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Unix socket to listen on (default: $GEMINI_MAPS_SOCKET or a per-user path)",
+)
+@click.option(
+    "--cache-entries",
+    type=click.IntRange(min=1),
+    default=DEFAULT_DAEMON_CACHE_ENTRIES,
+    show_default=True,
+    help="Maximum number of results kept in the in-memory cache",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.IntRange(min=1),
+    default=DEFAULT_DAEMON_CACHE_TTL,
+    show_default=True,
+    metavar="SECONDS",
+    help="How long cached results stay valid",
+)
+@click.option(
+    "--cache-geo-precision",
+    type=click.IntRange(min=1, max=12),
+    default=DEFAULT_GEO_PRECISION,
+    show_default=True,
+    help="Geohash precision used to bucket locations for cache keys (7 is ~150 m)",
+)
+@click.option(
+    "--cache-geo-radius",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    metavar="METERS",
+    help="Reuse a cached answer from a nearby cell within this distance, e.g. "
+    f"{DEFAULT_GEO_RADIUS_M:.0f} (0: only the same cell)",
+)
+@click.option(
+    "--rpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_RPM",
+    help="Client-side limit on requests per minute, shared by all processes on this host",
+)
+@click.option(
+    "--tpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_TPM",
+    help="Client-side limit on tokens per minute, shared by all processes on this host",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ATTEMPTS,
+    show_default=True,
+    help="Default attempts per query when the caller does not specify them",
+)
+@click.option(
+    "--retry-budget",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_RETRY_BUDGET,
+    show_default=True,
+    metavar="SECONDS",
+    help="Default time limit for retrying one query",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="SECONDS",
+    help="Per-request timeout for Gemini API calls (default: no client-side limit)",
+)
+def serve(
+    socket_path: Path | None,
+    cache_entries: int,
+    cache_ttl: int,
+    cache_geo_precision: int,
+    cache_geo_radius: float,
+    rpm: float | None,
+    tpm: float | None,
+    max_attempts: int,
+    retry_budget: float,
+    timeout: float | None,
+    verbose: int,
+) -> None:
+    """Run a local daemon that answers queries with a warm client.
+
+    Listens on a Unix socket (only accessible by the current user) and keeps
+    one Gemini client with pooled keep-alive connections plus an in-memory
+    result cache. While it runs, the 'query' command forwards to it
+    automatically; identical concurrent queries share one API call.
+
+    Stop the daemon with Ctrl+C or SIGTERM.
+
+    Examples:
+
+    \b
+    # Start the daemon in the background
+    gemini-google-maps-tool serve &
+
+    \b
+    # Queries now go through the daemon
+    gemini-google-maps-tool query "Best coffee near Dam Square"
+
+    \b
+    # Bypass the daemon for one query
+    gemini-google-maps-tool query "Museums in Paris" --no-daemon
+
+    Environment Variables:
+        GEMINI_API_KEY: Required API key for Gemini authentication
+        GEMINI_MAPS_SOCKET: Default for --socket
+        GEMINI_MAPS_RPM: Default for --rpm
+        GEMINI_MAPS_TPM: Default for --tpm
+    """
+    setup_logging(verbose)
+    path = socket_path or default_socket_path()
+
+    try:
+        client = get_client(TransportOptions(timeout=timeout))
+        geo = GeoGrid(precision=cache_geo_precision, max_distance_m=cache_geo_radius)
+        rate_limiter = None
+        if rpm or tpm:
+            rate_limiter = RateLimiter(rpm=rpm, tpm=tpm, state_path=default_state_path())
+        daemon = QueryDaemon(
+            path,
+            client,
+            cache=MemoryCache(cache_entries, ttl=cache_ttl, geo=geo),
+            rate_limiter=rate_limiter,
+            retry=RetryPolicy(max_attempts=max_attempts, budget=retry_budget),
+        )
+    except ClientError as e:
+        log_error(str(e))
+        sys.exit(1)
+    except OSError as e:
+        log_error(f"Cannot listen on {path}: {e}")
+        sys.exit(1)
+
+    def stop(signum: int, frame: FrameType | None) -> None:
+        # shutdown() blocks until serve_forever() returns, so call it off-thread
+        threading.Thread(target=daemon.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    logger.info(f"Serving queries on {path}")
+    click.echo(f"Listening on {path}", err=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+        logger.info("Daemon stopped")
@@ -0,0 +1,277 @@
+"""Sweep command implementation for covering an area with grounded queries.
+
+Provides the 'sweep' CLI command that runs one query over a grid of points
+in a bounding box, refines dense cells, and prints the places found,
+de-duplicated by place id.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import sys
+
+import click
+
+from gemini_google_maps_tool.core import get_async_client
+from gemini_google_maps_tool.core.client import ClientError, TransportOptions
+from gemini_google_maps_tool.core.costs import Budget
+from gemini_google_maps_tool.core.maps import DEFAULT_CONCURRENCY, MODEL_AUTO, resolve_model_name
+from gemini_google_maps_tool.core.ratelimit import RateLimiter, default_state_path
+from gemini_google_maps_tool.core.retry import DEFAULT_MAX_ATTEMPTS, RetryPolicy
+from gemini_google_maps_tool.core.sweep import (
+    DEFAULT_GRID_SIZE,
+    DEFAULT_SPLIT_THRESHOLD,
+    MAX_SWEEP_DEPTH,
+    BoundingBox,
+    SweepPlace,
+    sweep_async,
+)
+from gemini_google_maps_tool.logging_config import get_logger, setup_logging
+from gemini_google_maps_tool.utils import OUTPUT_FORMATS, log_error, log_run_usage, output_records
+
+logger = get_logger(__name__)
+
+
+def output_sweep_markdown(places: list[SweepPlace]) -> None:
+    """Output swept places as a numbered markdown list.
+
+    Args:
+        places: Places to print, in order.
+    """
+    for i, place in enumerate(places, 1):
+        title = place.chunk.title or "Unknown"
+        uri = place.chunk.uri
+        click.echo(f"{i}. [{title}]({uri})" if uri else f"{i}. {title}")
+        if place.chunk.place_id:
+            click.echo(f"   place_id: {place.chunk.place_id}")
+        lat, lon = place.lat_lon
+        click.echo(f"   found in {place.hits} cell(s), first near {lat:.5f},{lon:.5f}")
+
+
+@click.command()
+@click.argument("query_text")
+@click.option(
+    "--bbox",
+    required=True,
+    metavar="MIN_LAT,MIN_LON,MAX_LAT,MAX_LON",
+    help="Area to cover (e.g., 52.35,4.85,52.39,4.93)",
+)
+@click.option(
+    "--grid",
+    "grid_size",
+    type=click.IntRange(min=1, max=32),
+    default=DEFAULT_GRID_SIZE,
+    show_default=True,
+    help="Split the area into an N x N grid and query the center of every cell",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0, max=MAX_SWEEP_DEPTH),
+    default=0,
+    show_default=True,
+    help="Split cells that return many places into quadrants, up to this many times",
+)
+@click.option(
+    "--split-threshold",
+    type=click.IntRange(min=1),
+    default=DEFAULT_SPLIT_THRESHOLD,
+    show_default=True,
+    help="Places a cell must return to be split (with --max-depth)",
+)
+@click.option(
+    "--model",
+    type=click.Choice(["flash", "flash-lite", MODEL_AUTO], case_sensitive=False),
+    default="flash-lite",
+    help="Model to use: 'flash' (gemini-2.5-flash), 'flash-lite' (gemini-2.5-flash-lite) "
+    "or 'auto' (flash only where flash-lite finds no places)",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Maximum number of queries in flight at once",
+)
+@click.option(
+    "--text",
+    "-t",
+    is_flag=True,
+    help="Output markdown text instead of JSON (same as --format text)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    default=None,
+    help="Output format: json (indented array, default), compact (one-line array), "
+    "ndjson (one place per line) or text (markdown)",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Enable verbose output (use -v for INFO, -vv for DEBUG, -vvv for TRACE)",
+)
+@click.option(
+    "--rpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_RPM",
+    help="Client-side limit on requests per minute, shared by all processes on this host",
+)
+@click.option(
+    "--tpm",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    envvar="GEMINI_MAPS_TPM",
+    help="Client-side limit on tokens per minute, shared by all processes on this host",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ATTEMPTS,
+    show_default=True,
+    help="Attempts per query; 429, 5xx, timeouts and empty candidates are retried",
+)
+@click.option(
+    "--max-tokens",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="GEMINI_MAPS_MAX_TOKENS",
+    help="Stop sending queries once the sweep has used this many tokens",
+)
+@click.option(
+    "--max-cost",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="USD",
+    envvar="GEMINI_MAPS_MAX_COST",
+    help="Stop sending queries once the sweep's estimated cost reaches this many US dollars",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="SECONDS",
+    help="Per-request timeout for Gemini API calls (default: no client-side limit)",
+)
+def sweep(
+    query_text: str,
+    bbox: str,
+    grid_size: int,
+    max_depth: int,
+    split_threshold: int,
+    model: str,
+    workers: int,
+    text: bool,
+    output_format: str | None,
+    verbose: int,
+    rpm: float | None,
+    tpm: float | None,
+    max_attempts: int,
+    max_tokens: int | None,
+    max_cost: float | None,
+    timeout: float | None,
+) -> None:
+    """Cover an area with one query and list every place found.
+
+    QUERY_TEXT: The query to run at every sample point (e.g., "Bakeries")
+
+    The bounding box is split into a --grid x --grid grid and the query runs
+    concurrently with the center of every cell as location context. With
+    --max-depth, cells whose answer cites at least --split-threshold places
+    are split into quadrants and queried again, so requests go where places
+    are dense rather than to empty cells. Places are merged and
+    de-duplicated by place id; a summary of the cells queried goes to stderr.
+
+    Examples:
+
+    \b
+    # Bakeries across central Amsterdam on a 4x4 grid
+    gemini-google-maps-tool sweep "Bakeries" --bbox 52.35,4.85,52.39,4.93 --grid 4
+
+    \b
+    # Refine dense cells up to two levels deep, one place per line
+    gemini-google-maps-tool sweep "Coffee shops" --bbox 52.35,4.85,52.39,4.93 \\
+        --max-depth 2 --format ndjson > coffee.jsonl
+
+    \b
+    # Cap the estimated cost of a large sweep
+    gemini-google-maps-tool sweep "Pharmacies" --bbox 52.0,4.0,53.0,5.5 \\
+        --grid 8 --max-depth 1 --max-cost 2
+
+    \b
+    Output Format:
+        [
+          {
+            "title": "...",
+            "uri": "https://maps.google.com/?cid=...",
+            "place_id": "places/ChIJ...",
+            "lat_lon": [52.3567, 4.8633],
+            "hits": 2
+          }
+        ]
+
+    Environment Variables:
+        GEMINI_API_KEY: Required API key for Gemini authentication
+        GEMINI_MAPS_RPM: Default for --rpm
+        GEMINI_MAPS_TPM: Default for --tpm
+        GEMINI_MAPS_MAX_TOKENS: Default for --max-tokens
+        GEMINI_MAPS_MAX_COST: Default for --max-cost
+    """
+    setup_logging(verbose)
+
+    if text and output_format not in (None, "text"):
+        raise click.UsageError(f"Cannot combine --format {output_format} with --text.")
+    output_format = "text" if text else (output_format or "json").lower()
+    try:
+        area = BoundingBox.parse(bbox)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--bbox'") from e
+
+    budget = Budget(max_tokens=max_tokens, max_cost=max_cost)
+    try:
+        rate_limiter = None
+        if rpm or tpm:
+            rate_limiter = RateLimiter(rpm=rpm, tpm=tpm, state_path=default_state_path())
+        transport = TransportOptions(
+            timeout=timeout, max_connections=workers, max_keepalive_connections=workers
+        )
+        result = asyncio.run(
+            sweep_async(
+                get_async_client(transport),
+                query_text,
+                area,
+                grid_size,
+                max_depth,
+                split_threshold,
+                resolve_model_name(model),
+                workers,
+                rate_limiter=rate_limiter,
+                retry=RetryPolicy(max_attempts=max_attempts),
+                budget=budget,
+            )
+        )
+    except ClientError as e:
+        log_error(str(e))
+        sys.exit(1)
+
+    depths = max(cell.depth for cell in result.cells)
+    click.echo(
+        f"Swept {len(result.cells)} cells ({result.failed} failed, depth 0-{depths}), "
+        f"found {len(result.places)} places",
+        err=True,
+    )
+    if max_tokens is not None or max_cost is not None:
+        log_run_usage(budget.usage)
+    if result.failed == len(result.cells):
+        reasons = sorted({cell.error for cell in result.cells if cell.error})
+        log_error(f"Every query of the sweep failed ({', '.join(reasons)})")
+        sys.exit(1)
+
+    if output_format == "text":
+        output_sweep_markdown(result.places)
+    else:
+        output_records((place.to_dict() for place in result.places), output_format)
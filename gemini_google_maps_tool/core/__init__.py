@@ -3,11 +3,157 @@
 This module provides the core business logic for querying Gemini with
 Google Maps integration, independent of CLI concerns.
 
+Public names are resolved lazily on first access, so importing the package
+(for example by the CLI to render --help) does not load the submodules.
+
 Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
-from gemini_google_maps_tool.core.client import get_client
-from gemini_google_maps_tool.core.maps import MapsQueryResult, query_maps
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from gemini_google_maps_tool.core.batchjob import run_batch_job
+    from gemini_google_maps_tool.core.cache import MemoryCache, ResponseCache
+    from gemini_google_maps_tool.core.client import (
+        TransportOptions,
+        get_async_client,
+        get_client,
+    )
+    from gemini_google_maps_tool.core.corridor import CorridorResult, corridor_async, parse_route
+    from gemini_google_maps_tool.core.costs import Budget, ModelPricing, RunUsage
+    from gemini_google_maps_tool.core.geo import GeoGrid
+    from gemini_google_maps_tool.core.journal import RunJournal
+    from gemini_google_maps_tool.core.keypool import KeyPool
+    from gemini_google_maps_tool.core.maps import (
+        MapsQueryRequest,
+        MapsQueryResult,
+        MapsQueryStream,
+        TokenUsage,
+        query_many_as_completed,
+        query_many_async,
+        query_maps,
+        query_maps_async,
+        query_maps_stream,
+    )
+    from gemini_google_maps_tool.core.metrics import MetricsRegistry, QueryMetrics
+    from gemini_google_maps_tool.core.places import PlaceIndex, PlaceRecord
+    from gemini_google_maps_tool.core.ratelimit import RateLimiter
+    from gemini_google_maps_tool.core.retry import RetryPolicy
+    from gemini_google_maps_tool.core.routing import ModelRouter
+    from gemini_google_maps_tool.core.session import MapsSession
+    from gemini_google_maps_tool.core.sweep import BoundingBox, SweepResult, sweep_async
+    from gemini_google_maps_tool.core.tracing import QueryTimings, Tracer
+
+# Public name -> defining module, imported on first attribute access
+_LAZY_EXPORTS = {
+    "get_client": "gemini_google_maps_tool.core.client",
+    "get_async_client": "gemini_google_maps_tool.core.client",
+    "query_maps": "gemini_google_maps_tool.core.maps",
+    "query_maps_async": "gemini_google_maps_tool.core.maps",
+    "query_maps_stream": "gemini_google_maps_tool.core.maps",
+    "query_many_async": "gemini_google_maps_tool.core.maps",
+    "query_many_as_completed": "gemini_google_maps_tool.core.maps",
+    "MapsQueryRequest": "gemini_google_maps_tool.core.maps",
+    "MapsQueryResult": "gemini_google_maps_tool.core.maps",
+    "MapsQueryStream": "gemini_google_maps_tool.core.maps",
+    "TokenUsage": "gemini_google_maps_tool.core.maps",
+    "ResponseCache": "gemini_google_maps_tool.core.cache",
+    "MemoryCache": "gemini_google_maps_tool.core.cache",
+    "GeoGrid": "gemini_google_maps_tool.core.geo",
+    "PlaceIndex": "gemini_google_maps_tool.core.places",
+    "PlaceRecord": "gemini_google_maps_tool.core.places",
+    "RateLimiter": "gemini_google_maps_tool.core.ratelimit",
+    "RetryPolicy": "gemini_google_maps_tool.core.retry",
+    "MapsSession": "gemini_google_maps_tool.core.session",
+    "TransportOptions": "gemini_google_maps_tool.core.client",
+    "QueryTimings": "gemini_google_maps_tool.core.tracing",
+    "Tracer": "gemini_google_maps_tool.core.tracing",
+    "QueryMetrics": "gemini_google_maps_tool.core.metrics",
+    "MetricsRegistry": "gemini_google_maps_tool.core.metrics",
+    "Budget": "gemini_google_maps_tool.core.costs",
+    "RunUsage": "gemini_google_maps_tool.core.costs",
+    "ModelPricing": "gemini_google_maps_tool.core.costs",
+    "BoundingBox": "gemini_google_maps_tool.core.sweep",
+    "SweepResult": "gemini_google_maps_tool.core.sweep",
+    "sweep_async": "gemini_google_maps_tool.core.sweep",
+    "CorridorResult": "gemini_google_maps_tool.core.corridor",
+    "corridor_async": "gemini_google_maps_tool.core.corridor",
+    "parse_route": "gemini_google_maps_tool.core.corridor",
+    "ModelRouter": "gemini_google_maps_tool.core.routing",
+    "KeyPool": "gemini_google_maps_tool.core.keypool",
+    "RunJournal": "gemini_google_maps_tool.core.journal",
+    "run_batch_job": "gemini_google_maps_tool.core.batchjob",
+}
+
+__all__ = [
+    "get_client",
+    "get_async_client",
+    "query_maps",
+    "query_maps_async",
+    "query_maps_stream",
+    "query_many_async",
+    "query_many_as_completed",
+    "MapsQueryRequest",
+    "MapsQueryResult",
+    "MapsQueryStream",
+    "TokenUsage",
+    "ResponseCache",
+    "MemoryCache",
+    "GeoGrid",
+    "PlaceIndex",
+    "PlaceRecord",
+    "RateLimiter",
+    "RetryPolicy",
+    "MapsSession",
+    "TransportOptions",
+    "KeyPool",
+    "RunJournal",
+    "run_batch_job",
+    "QueryTimings",
+    "Tracer",
+    "QueryMetrics",
+    "MetricsRegistry",
+    "Budget",
+    "RunUsage",
+    "ModelPricing",
+    "BoundingBox",
+    "SweepResult",
+    "sweep_async",
+    "CorridorResult",
+    "corridor_async",
+    "parse_route",
+    "ModelRouter",
+]
+
+
+def _load_lazy_export(exports: dict[str, str], module_name: str, name: str) -> Any:
+    """Import and return a lazily exported attribute (module __getattr__ helper).
+
+    Args:
+        exports: Mapping of public names to the modules defining them.
+        module_name: Name of the package doing the lookup, for the error message.
+        name: The attribute being looked up.
+
+    Returns:
+        The attribute from its defining module.
+
+    Raises:
+        AttributeError: If the name is not a lazy export.
+    """
+    if name not in exports:
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(exports[name]), name)
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names on first access and cache them on the module."""
+    value = _load_lazy_export(_LAZY_EXPORTS, __name__, name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["get_client", "query_maps", "MapsQueryResult"]
+def __dir__() -> list[str]:
+    """List lazily exported names alongside the loaded module attributes."""
+    return sorted(list(globals()) + __all__)
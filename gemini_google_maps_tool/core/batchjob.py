@@ -0,0 +1,346 @@
+"""Offline execution of grounded queries through the Gemini Batch API.
+
+Provides run_batch_job(), which packages Maps-grounded requests (with the
+config query_maps() builds) into one batch job per model, submits the jobs,
+polls them with backoff and converts their responses into MapsQueryResult
+records. A batch job answers within 24 hours instead of seconds, at half the
+price of interactive requests and without counting against their rate
+limits, which suits large enrichment runs.
+
+Requests are sent inline, which the API accepts up to 20 MB per job.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Mapping, Sequence
+from typing import TYPE_CHECKING
+
+from gemini_google_maps_tool.core.maps import (
+    MODEL_AUTO,
+    MapsQueryRequest,
+    MapsQueryResult,
+    QueryError,
+    build_config,
+    classify_exception,
+    result_from_response,
+)
+
+# The SDK is only loaded once a job is submitted (see core.maps)
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+
+    from gemini_google_maps_tool.core.costs import Budget
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 10.0
+DEFAULT_MAX_POLL_INTERVAL = 300.0
+POLL_BACKOFF = 1.5
+DEFAULT_DISPLAY_NAME = "gemini-google-maps-tool"
+
+JOB_SUCCEEDED = "JOB_STATE_SUCCEEDED"
+JOB_PARTIALLY_SUCCEEDED = "JOB_STATE_PARTIALLY_SUCCEEDED"
+JOB_FAILED = "JOB_STATE_FAILED"
+JOB_CANCELLED = "JOB_STATE_CANCELLED"
+JOB_EXPIRED = "JOB_STATE_EXPIRED"
+TERMINAL_STATES = frozenset(
+    {JOB_SUCCEEDED, JOB_PARTIALLY_SUCCEEDED, JOB_FAILED, JOB_CANCELLED, JOB_EXPIRED}
+)
+
+# Failure reason of every request of a job that ended without results
+_JOB_FAILURE_REASONS = {
+    JOB_FAILED: QueryError.REASON_SERVER_ERROR,
+    JOB_EXPIRED: QueryError.REASON_TIMEOUT,
+}
+
+# Errors while polling that do not mean the job is gone
+_TRANSIENT_REASONS = frozenset(
+    {
+        QueryError.REASON_RATE_LIMITED,
+        QueryError.REASON_SERVER_ERROR,
+        QueryError.REASON_TIMEOUT,
+        QueryError.REASON_NETWORK,
+    }
+)
+
+# Per-request errors are google.rpc.Status objects with gRPC status codes
+_GRPC_REASONS = {
+    3: QueryError.REASON_INVALID_ARGUMENT,
+    4: QueryError.REASON_TIMEOUT,
+    7: QueryError.REASON_AUTH,
+    8: QueryError.REASON_RATE_LIMITED,
+    13: QueryError.REASON_SERVER_ERROR,
+    14: QueryError.REASON_SERVER_ERROR,
+    16: QueryError.REASON_AUTH,
+}
+
+# Metadata key of an inlined request holding its position in the job
+_INDEX_KEY = "index"
+
+BatchOutcome = MapsQueryResult | QueryError
+# Called with a job's name, model and the indices of its requests
+SubmitHook = Callable[[str, str, list[int]], None]
+# Called with a finished job's name, the indices of its requests and their outcomes
+DoneHook = Callable[[str, list[int], list[BatchOutcome]], None]
+
+
+def _job_state(job: types.BatchJob) -> str:
+    """Return the state of a job as a JOB_STATE_* string."""
+    return job.state.value if job.state is not None else "JOB_STATE_UNSPECIFIED"
+
+
+def submit_batch_job(
+    client: genai.Client,
+    requests: Sequence[MapsQueryRequest],
+    model: str,
+    display_name: str = DEFAULT_DISPLAY_NAME,
+) -> types.BatchJob:
+    """Submit grounded requests as one batch job.
+
+    Args:
+        client: Initialized Gemini API client.
+        requests: Requests of the job; their own model is ignored.
+        model: Full model name answering every request of the job.
+        display_name: Name of the job in the API's job list.
+
+    Returns:
+        The created job; pass its name to wait_for_batch_job().
+
+    Raises:
+        QueryError: If the job cannot be created.
+    """
+    from google.genai import types
+
+    inlined = [
+        types.InlinedRequest(
+            contents=request.query,
+            config=build_config(request.lat_lon),
+            metadata={_INDEX_KEY: str(index)},
+        )
+        for index, request in enumerate(requests)
+    ]
+    try:
+        job = client.batches.create(
+            model=model, src=inlined, config=types.CreateBatchJobConfig(display_name=display_name)
+        )
+    except Exception as e:
+        raise QueryError(f"Could not create batch job: {e}", classify_exception(e)) from e
+    logger.info(f"Submitted batch job {job.name} with {len(requests)} {model} requests")
+    return job
+
+
+def wait_for_batch_job(
+    client: genai.Client,
+    name: str,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    timeout: float | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> types.BatchJob:
+    """Poll a batch job until it succeeds, fails, expires or is cancelled.
+
+    The first poll is made poll_interval after the call; every further wait
+    is 1.5 times longer, up to max_poll_interval. Rate limits, server errors
+    and network errors while polling are logged and polled through.
+
+    Args:
+        client: Initialized Gemini API client.
+        name: Job name ("batches/...").
+        poll_interval: Seconds before the first poll.
+        max_poll_interval: Longest wait between polls.
+        timeout: Optional limit on the seconds spent waiting.
+        sleep: Function used to wait (replaceable for tests).
+
+    Returns:
+        The job in a terminal state.
+
+    Raises:
+        QueryError: With reason "timeout" if the job is still running when
+            the timeout passes (it keeps running on the server), or if a
+            poll fails for any other reason than a transient error.
+    """
+    started = time.monotonic()
+    delay = poll_interval
+    while True:
+        if timeout is not None and time.monotonic() - started + delay > timeout:
+            raise QueryError(
+                f"Batch job {name} did not finish within {timeout:.0f}s; "
+                "it keeps running on the server",
+                QueryError.REASON_TIMEOUT,
+            )
+        sleep(delay)
+        delay = min(delay * POLL_BACKOFF, max_poll_interval)
+        try:
+            job = client.batches.get(name=name)
+        except Exception as e:
+            reason = classify_exception(e)
+            if reason not in _TRANSIENT_REASONS:
+                raise QueryError(f"Could not poll batch job {name}: {e}", reason) from e
+            logger.warning(f"Polling batch job {name} failed ({reason}); trying again")
+            continue
+        state = _job_state(job)
+        if state in TERMINAL_STATES:
+            logger.info(f"Batch job {name} finished with {state}")
+            return job
+        logger.debug(f"Batch job {name} is {state}; polling again in {delay:.0f}s")
+
+
+def batch_job_results(
+    job: types.BatchJob, requests: Sequence[MapsQueryRequest]
+) -> list[BatchOutcome]:
+    """Convert the responses of a finished job into results.
+
+    Args:
+        job: Job returned by wait_for_batch_job().
+        requests: The requests the job was submitted with, in the same order.
+
+    Returns:
+        One outcome per request, in request order: a MapsQueryResult (with
+        grounding metadata if the request asked for it) or the QueryError
+        the request failed with.
+    """
+    state = _job_state(job)
+    if state not in (JOB_SUCCEEDED, JOB_PARTIALLY_SUCCEEDED):
+        detail = f": {job.error.message}" if job.error and job.error.message else ""
+        reason = _JOB_FAILURE_REASONS.get(state, QueryError.REASON_UNEXPECTED)
+        return [
+            QueryError(f"Batch job {job.name} ended with {state}{detail}", reason) for _ in requests
+        ]
+
+    outcomes: list[BatchOutcome] = [
+        QueryError(f"Batch job {job.name} returned no response for this request") for _ in requests
+    ]
+    responses = (job.dest.inlined_responses if job.dest else None) or []
+    for position, inlined in enumerate(responses):
+        # Responses come back in request order, which the index confirms
+        tag = (inlined.metadata or {}).get(_INDEX_KEY, "")
+        index = int(tag) if tag.isdigit() else position
+        if not 0 <= index < len(requests):
+            continue
+        request = requests[index]
+        if inlined.error is not None:
+            reason = _GRPC_REASONS.get(inlined.error.code or 0, QueryError.REASON_UNEXPECTED)
+            outcomes[index] = QueryError(
+                f"Request failed in batch job: {inlined.error.message}", reason
+            )
+        elif inlined.response is not None:
+            try:
+                result = result_from_response(inlined.response, request.include_grounding)
+            except QueryError as e:
+                outcomes[index] = e
+                continue
+            result.model = request.model
+            outcomes[index] = result
+    return outcomes
+
+
+def run_batch_job(
+    client: genai.Client,
+    requests: Sequence[MapsQueryRequest],
+    *,
+    display_name: str = DEFAULT_DISPLAY_NAME,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    timeout: float | None = None,
+    budget: Budget | None = None,
+    jobs: Mapping[str, Sequence[int]] | None = None,
+    on_submit: SubmitHook | None = None,
+    on_done: DoneHook | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> list[BatchOutcome]:
+    """Run grounded requests as Batch API jobs and wait for their results.
+
+    Requests are grouped into one job per model. All jobs are submitted
+    before the first is polled, so they run on the server at the same time.
+
+    Args:
+        client: Initialized Gemini API client.
+        requests: Requests to run. Model "auto" is not supported, since a job
+            cannot escalate single requests; such requests fail with reason
+            "invalid_argument".
+        display_name: Name of the jobs in the API's job list.
+        poll_interval: Seconds before the first poll of a job.
+        max_poll_interval: Longest wait between polls.
+        timeout: Optional limit on the seconds spent waiting for all jobs.
+        budget: Optional budget charged with the usage of every result. It
+            cannot stop a job once submitted, so it is not checked.
+        jobs: Jobs submitted by an earlier run to wait for instead of
+            submitting their requests again, by name, with the indices of
+            their requests in the order they were submitted.
+        on_submit: Optional hook called as soon as a job is created, with
+            its name, model and request indices, so the job can be recorded
+            and reattached to after a crash.
+        on_done: Optional hook called when a job has ended (successfully or
+            not), with its name, request indices and their outcomes. It is
+            not called for a job that timed out or could not be polled,
+            since that job may still be running on the server.
+        sleep: Function used to wait (replaceable for tests).
+
+    Returns:
+        One outcome per request, in request order: a MapsQueryResult or the
+        QueryError the request failed with. A job that could not be created,
+        failed or timed out fails all of its requests.
+
+    Example:
+        >>> requests = [MapsQueryRequest(f"Opening hours of {name}") for name in names]
+        >>> outcomes = run_batch_job(client, requests, poll_interval=60)
+        >>> sum(isinstance(outcome, MapsQueryResult) for outcome in outcomes)
+        998
+    """
+    outcomes: list[BatchOutcome | None] = [None] * len(requests)
+    pending: list[tuple[str, list[int]]] = [
+        (name, list(indices)) for name, indices in (jobs or {}).items()
+    ]
+    attached = {i for _, indices in pending for i in indices}
+    if pending:
+        logger.info(f"Reattaching to {len(pending)} batch jobs submitted earlier")
+    groups: dict[str, list[int]] = {}
+    for index, request in enumerate(requests):
+        if index in attached:
+            continue
+        if request.model == MODEL_AUTO:
+            outcomes[index] = QueryError(
+                "Model 'auto' cannot be used with the Batch API; choose a model",
+                QueryError.REASON_INVALID_ARGUMENT,
+            )
+        else:
+            groups.setdefault(request.model, []).append(index)
+
+    for model, indices in groups.items():
+        try:
+            job = submit_batch_job(client, [requests[i] for i in indices], model, display_name)
+        except QueryError as e:
+            for i in indices:
+                outcomes[i] = e
+            continue
+        assert job.name is not None  # nosec B101 - created jobs always have a name
+        if on_submit is not None:
+            on_submit(job.name, model, indices)
+        pending.append((job.name, indices))
+
+    started = time.monotonic()
+    for name, indices in pending:
+        group = [requests[i] for i in indices]
+        remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+        try:
+            job = wait_for_batch_job(
+                client, name, poll_interval, max_poll_interval, remaining, sleep
+            )
+            group_outcomes = batch_job_results(job, group)
+        except QueryError as e:
+            group_outcomes = [e] * len(group)
+        else:
+            if on_done is not None:
+                on_done(name, indices, group_outcomes)
+        for i, outcome in zip(indices, group_outcomes, strict=True):
+            outcomes[i] = outcome
+            if budget is not None and isinstance(outcome, MapsQueryResult):
+                budget.record(requests[i].model, outcome)
+
+    return [outcome for outcome in outcomes if outcome is not None]
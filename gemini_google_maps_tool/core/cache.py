@@ -0,0 +1,600 @@
+"""Response caching for Google Maps grounded queries.
+
+Provides a persistent SQLite-backed cache keyed on the normalized request
+(model, query text, location, grounding flag), with per-entry TTL, a
+max-bytes limit with least-recently-used eviction and short-lived negative
+caching of deterministic empty-response failures, plus an in-process LRU
+cache that collapses concurrent identical queries into one API call.
+Both collapse identical concurrent async queries as well.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from gemini_google_maps_tool.core.geo import GeoGrid
+from gemini_google_maps_tool.core.maps import (
+    MapsQueryResult,
+    QueryError,
+    RequestKey,
+    make_request_key,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL = 5 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 1024
+
+# Version of the stored payload format (MapsQueryResult.to_dict()); databases
+# written with another version are emptied on open.
+CACHE_FORMAT_VERSION = 1
+
+# Only failures that repeat deterministically for the same request are worth
+# caching; "no candidates" is frequently caused by throttling and is not.
+NEGATIVE_CACHE_REASONS = frozenset({QueryError.REASON_EMPTY_TEXT})
+
+
+def default_cache_path() -> Path:
+    """Return the default cache database path under the user cache directory."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "gemini-google-maps-tool" / "responses.sqlite3"
+
+
+def _candidate_keys(key: RequestKey, grid: GeoGrid | None) -> list[RequestKey]:
+    """Keys to probe for a lookup: the exact key, then nearby grid cells."""
+    if grid is None or key.origin is None or grid.max_distance_m <= 0:
+        return [key]
+    return [replace(key, lat_lon=center) for center in grid.nearby_centers(key.origin)]
+
+
+class _AsyncFlights:
+    """Single-flight for coroutines: one computation per key and event loop.
+
+    Thread-safe; callers on different event loops never share a flight.
+    """
+
+    def __init__(self) -> None:
+        self._futures: dict[
+            tuple[asyncio.AbstractEventLoop, RequestKey], asyncio.Future[MapsQueryResult]
+        ] = {}
+        self._lock = threading.Lock()
+
+    async def run(
+        self,
+        key: RequestKey,
+        compute: Callable[[], Awaitable[MapsQueryResult]],
+        joined: Callable[[bool], None] | None = None,
+    ) -> tuple[MapsQueryResult, bool]:
+        """Run compute() once for all concurrent callers with the same key.
+
+        Args:
+            key: Normalized request key.
+            compute: Coroutine function that produces (and stores) the result.
+            joined: Optional callback told whether the caller leads the flight.
+
+        Returns:
+            The result, and whether it was shared from another caller's flight.
+
+        Raises:
+            QueryError: If the (shared) computation fails.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                future = self._futures.get((loop, key))
+                leader = future is None
+                if future is None:
+                    future = self._futures[(loop, key)] = loop.create_future()
+            if joined is not None:
+                joined(leader)
+                joined = None
+            if leader:
+                break
+            logger.debug("Waiting for identical in-flight query")
+            try:
+                return await asyncio.shield(future), True
+            except QueryError as e:
+                raise QueryError(str(e), reason=e.reason) from e
+            except asyncio.CancelledError:
+                # The leader was cancelled, not this caller: take over its flight
+                if not future.cancelled():
+                    raise
+
+        try:
+            result = await compute()
+            future.set_result(result)
+            return result, False
+        except QueryError as e:
+            future.set_exception(e)
+            raise
+        except Exception as e:
+            # Never leave followers waiting on a flight that failed unexpectedly
+            future.set_exception(QueryError(str(e)))
+            raise
+        finally:
+            with self._lock:
+                self._futures.pop((loop, key), None)
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()  # Retrieved, whether or not anyone waited on it
+
+
+class ResponseCache:
+    """Persistent, size-bounded SQLite cache of query results.
+
+    Safe to share between threads; multiple processes may use the same
+    database file concurrently (SQLite handles file locking). The async
+    get_or_compute_async() runs its database access in worker threads and
+    collapses concurrent identical queries into one API call.
+
+    Example:
+        >>> cache = ResponseCache(ttl=3600)
+        >>> result = query_maps(client, "Coffee near Dam Square", cache=cache)
+        >>> result.from_cache
+        False
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        geo: GeoGrid | None = None,
+    ) -> None:
+        """Open (and create if needed) the cache database.
+
+        Args:
+            path: Database file path (default: default_cache_path()).
+            ttl: Seconds a successful result stays valid.
+            max_bytes: Maximum total payload size before LRU eviction.
+            negative_ttl: Seconds a cached empty-response failure stays valid.
+            geo: Optional geohash grid for location bucketing and nearby fallback.
+        """
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.geo = geo
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._flights = _AsyncFlights()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        logger.debug(f"Opening response cache at {self.path}")
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " is_error INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " size INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+            )
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != CACHE_FORMAT_VERSION:
+                logger.info(f"Discarding cache entries in format {version}")
+                self._conn.execute("DELETE FROM responses")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_FORMAT_VERSION}")
+
+    def key_for(
+        self,
+        query: str,
+        lat_lon: tuple[float, float] | None,
+        model: str,
+        include_grounding: bool,
+    ) -> RequestKey:
+        """Build the cache key for a request (see make_request_key())."""
+        return make_request_key(query, lat_lon, model, include_grounding, self.geo)
+
+    def get(self, key: RequestKey) -> MapsQueryResult | None:
+        """Look up a cached result.
+
+        Args:
+            key: Normalized request key.
+
+        Returns:
+            Cached result (with from_cache=True), or None on a miss.
+
+        Raises:
+            QueryError: If a negative (empty response) entry is cached.
+        """
+        now = time.time()
+        digests = [candidate.digest for candidate in _candidate_keys(key, self.geo)]
+        placeholders = ",".join("?" * len(digests))
+        with self._lock, self._conn:
+            rows = {
+                digest: (payload, is_error)
+                for digest, payload, is_error in self._conn.execute(
+                    "SELECT key, payload, is_error FROM responses"
+                    f" WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*digests, now),
+                )
+            }
+            # Prefer the exact cell, then the nearest neighboring cell
+            found = next((digest for digest in digests if digest in rows), None)
+            if found is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, found)
+                )
+
+        if found is None:
+            logger.info("Cache miss")
+            return None
+
+        payload, is_error = rows[found]
+        nearby = " from nearby cell" if found != digests[0] else ""
+        if is_error:
+            logger.info(f"Cache hit{nearby} (cached empty response)")
+            raise QueryError(payload, reason=QueryError.REASON_EMPTY_TEXT)
+        logger.info(f"Cache hit{nearby}")
+        return replace(MapsQueryResult.from_dict(json.loads(payload)), from_cache=True)
+
+    def put(self, key: RequestKey, result: MapsQueryResult, ttl: float | None = None) -> None:
+        """Store a successful result.
+
+        Args:
+            key: Normalized request key.
+            result: Result to cache.
+            ttl: Optional per-entry TTL in seconds (default: the cache TTL).
+        """
+        payload = json.dumps(result.to_dict(), separators=(",", ":"))
+        self._store(key, payload, False, self.ttl if ttl is None else ttl)
+
+    def put_error(self, key: RequestKey, error: QueryError) -> None:
+        """Store a failure if it is deterministic enough to cache.
+
+        Args:
+            key: Normalized request key.
+            error: The QueryError raised by the query.
+        """
+        if error.reason in NEGATIVE_CACHE_REASONS:
+            self._store(key, str(error), True, self.negative_ttl)
+
+    def get_or_compute(
+        self, key: RequestKey, compute: Callable[[], MapsQueryResult]
+    ) -> MapsQueryResult:
+        """Return the cached result for key, computing and storing it on a miss.
+
+        Args:
+            key: Normalized request key.
+            compute: Function that executes the query.
+
+        Returns:
+            Cached or freshly computed result.
+
+        Raises:
+            QueryError: If the query fails or a negative entry is cached.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        try:
+            result = compute()
+        except QueryError as e:
+            self.put_error(key, e)
+            raise
+        self.put(key, result)
+        return result
+
+    async def get_or_compute_async(
+        self, key: RequestKey, compute: Callable[[], Awaitable[MapsQueryResult]]
+    ) -> MapsQueryResult:
+        """Async get_or_compute(), sharing one computation between concurrent callers.
+
+        Database access runs in worker threads, off the event loop.
+
+        Args:
+            key: Normalized request key.
+            compute: Coroutine function that executes the query.
+
+        Returns:
+            Cached, shared, or freshly computed result.
+
+        Raises:
+            QueryError: If the (shared) query fails or a negative entry is cached.
+        """
+
+        async def lookup_or_compute() -> MapsQueryResult:
+            cached = await asyncio.to_thread(self.get, key)
+            if cached is not None:
+                return cached
+            try:
+                result = await compute()
+            except QueryError as e:
+                await asyncio.to_thread(self.put_error, key, e)
+                raise
+            await asyncio.to_thread(self.put, key, result)
+            return result
+
+        result, shared = await self._flights.run(key, lookup_or_compute)
+        if not shared:
+            return result
+        with self._lock:
+            self.coalesced += 1
+        return replace(result, from_cache=True)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _store(self, key: RequestKey, payload: str, is_error: bool, ttl: float) -> None:
+        """Insert or replace an entry, then evict to stay within max_bytes."""
+        now = time.time()
+        size = len(payload.encode())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, payload, is_error, expires_at, accessed_at, size)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key.digest, payload, int(is_error), now + ttl, now, size),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least-recently-used ones over max_bytes."""
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+
+        victims: list[str] = []
+        for victim, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            victims.append(victim)
+            excess -= size
+            if excess <= 0:
+                break
+        logger.debug(f"Evicting {len(victims)} cache entries to stay within {self.max_bytes} bytes")
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", [(v,) for v in victims])
+
+
+@dataclass
+class _Flight:
+    """An in-flight computation that concurrent callers wait on."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    result: MapsQueryResult | None = None
+    error: QueryError | None = None
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with single-flight de-duplication.
+
+    When several threads ask for the same key while it is not cached, only
+    the first one calls the API; the others block until that call finishes
+    and share its result (or its error). Failures are never cached.
+
+    Single-flight applies to get_or_compute(), which query_maps() uses, and
+    to get_or_compute_async(), which query_maps_async() uses.
+
+    Example:
+        >>> cache = MemoryCache(max_entries=10_000, ttl=300)
+        >>> # Safe to share between request-handling threads
+        >>> result = query_maps(client, "Coffee near Union Square", cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float | None = None,
+        geo: GeoGrid | None = None,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached results before LRU eviction.
+            ttl: Optional seconds a result stays valid (default: no expiry).
+            geo: Optional geohash grid for location bucketing and nearby fallback.
+
+        Raises:
+            ValueError: If max_entries is less than 1.
+        """
+        if max_entries < 1:
+            raise ValueError(f"Invalid max_entries: {max_entries}. Must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.geo = geo
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[RequestKey, tuple[MapsQueryResult, float | None]] = OrderedDict()
+        self._inflight: dict[RequestKey, _Flight] = {}
+        self._flights = _AsyncFlights()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def key_for(
+        self,
+        query: str,
+        lat_lon: tuple[float, float] | None,
+        model: str,
+        include_grounding: bool,
+    ) -> RequestKey:
+        """Build the cache key for a request (see make_request_key())."""
+        return make_request_key(query, lat_lon, model, include_grounding, self.geo)
+
+    def get(self, key: RequestKey) -> MapsQueryResult | None:
+        """Look up a cached result.
+
+        Args:
+            key: Normalized request key.
+
+        Returns:
+            Cached result (with from_cache=True), or None on a miss.
+        """
+        with self._lock:
+            result = self._lookup(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        logger.debug("Memory cache hit" if result else "Memory cache miss")
+        return result
+
+    def put(self, key: RequestKey, result: MapsQueryResult) -> None:
+        """Store a successful result, evicting the least recently used entry if full.
+
+        Args:
+            key: Normalized request key.
+            result: Result to cache.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put_error(self, key: RequestKey, error: QueryError) -> None:
+        """Ignore failures; the in-memory cache only stores successes."""
+
+    def get_or_compute(
+        self, key: RequestKey, compute: Callable[[], MapsQueryResult]
+    ) -> MapsQueryResult:
+        """Return the cached result, or compute it once for all concurrent callers.
+
+        Args:
+            key: Normalized request key.
+            compute: Function that executes the query.
+
+        Returns:
+            Cached, shared, or freshly computed result.
+
+        Raises:
+            QueryError: If the (shared) query fails.
+        """
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            logger.debug("Waiting for identical in-flight query")
+            flight.done.wait()
+            if flight.error is not None:
+                raise QueryError(str(flight.error), reason=flight.error.reason) from flight.error
+            assert flight.result is not None
+            return replace(flight.result, from_cache=True)
+
+        try:
+            flight.result = compute()
+            self.put(key, flight.result)
+            return flight.result
+        except QueryError as e:
+            flight.error = e
+            raise
+        except Exception as e:
+            # Never leave followers waiting on a flight that failed unexpectedly
+            flight.error = QueryError(str(e))
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    async def get_or_compute_async(
+        self, key: RequestKey, compute: Callable[[], Awaitable[MapsQueryResult]]
+    ) -> MapsQueryResult:
+        """Async get_or_compute(): concurrent callers on one event loop share a query.
+
+        Args:
+            key: Normalized request key.
+            compute: Coroutine function that executes the query.
+
+        Returns:
+            Cached, shared, or freshly computed result.
+
+        Raises:
+            QueryError: If the (shared) query fails.
+        """
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+        async def compute_and_store() -> MapsQueryResult:
+            with self._lock:
+                # A flight for the key may have finished since the lookup above
+                cached = self._lookup(key)
+            if cached is not None:
+                return cached
+            result = await compute()
+            self.put(key, result)
+            return result
+
+        result, shared = await self._flights.run(key, compute_and_store, self._count_flight)
+        return replace(result, from_cache=True) if shared else result
+
+    def clear(self) -> None:
+        """Remove all cached entries (in-flight queries are unaffected)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: RequestKey) -> MapsQueryResult | None:
+        """Return an unexpired entry and mark it recently used; lock must be held."""
+        now = time.monotonic()
+        for candidate in _candidate_keys(key, self.geo):
+            entry = self._entries.get(candidate)
+            if entry is None:
+                continue
+            result, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[candidate]
+                continue
+            self._entries.move_to_end(candidate)
+            return replace(result, from_cache=True)
+        return None
+
+    def _count_flight(self, leader: bool) -> None:
+        """Count a miss for the caller leading a flight, else a coalesced call."""
+        with self._lock:
+            if leader:
+                self.misses += 1
+            else:
+                self.coalesced += 1
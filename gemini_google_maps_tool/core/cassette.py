@@ -0,0 +1,279 @@
+"""Record/replay HTTP transports for deterministic offline runs.
+
+Provides httpx transports that record raw Gemini API request/response pairs
+into a cassette directory, keyed by the request content, and replay them
+later without network access or API quota, optionally with a simulated
+latency. Cassette entries are plain JSON files, so responses can be edited
+by hand to reproduce parsing edge cases.
+
+Enable them through TransportOptions(cassette=..., cassette_mode=...).
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Throttling and server failures are transient; replaying them would make
+# every replayed run fail the same way, so they are never recorded.
+_UNRECORDED_STATUSES = frozenset({408, 429})
+
+# Query parameters that never take part in the key (and are never stored)
+_IGNORED_PARAMS = frozenset({"key"})
+
+
+@dataclass(frozen=True, slots=True)
+class CassetteEntry:
+    """A recorded response.
+
+    Attributes:
+        status: HTTP status code.
+        content_type: Response Content-Type header.
+        body: Decoded response body.
+        elapsed: Seconds the original request took.
+    """
+
+    status: int
+    content_type: str
+    body: bytes
+    elapsed: float
+
+
+class Cassette:
+    """Directory of recorded responses, one JSON file per request key.
+
+    Keys hash the method, URL path, query parameters and the canonical JSON
+    request body; headers (including the API key) are not part of the key
+    and are never stored. Safe for concurrent writers: entries are written
+    to a temporary file and renamed into place.
+
+    Example:
+        >>> cassette = Cassette("cassettes/smoke")
+        >>> len(cassette)
+        12
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Use (and create if needed) a cassette directory.
+
+        Args:
+            path: Cassette directory.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.path.glob("*.json"))
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        """Return the content key of a request."""
+        params = sorted(
+            (name, value)
+            for name, value in request.url.params.multi_items()
+            if name not in _IGNORED_PARAMS
+        )
+        body = request.content
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+        except ValueError:
+            pass  # Not JSON: key on the raw bytes
+        digest = hashlib.sha256()
+        for part in (request.method, request.url.path, json.dumps(params)):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(body)
+        return digest.hexdigest()[:32]
+
+    def get(self, key: str) -> CassetteEntry | None:
+        """Load a recorded response, or None if the request was never recorded."""
+        try:
+            data = json.loads((self.path / f"{key}.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        response = data["response"]
+        return CassetteEntry(
+            status=int(response["status"]),
+            content_type=str(response.get("content_type") or "application/json"),
+            body=str(response["body"]).encode(),
+            elapsed=float(data.get("elapsed", 0.0)),
+        )
+
+    def put(self, key: str, request: httpx.Request, entry: CassetteEntry) -> None:
+        """Store a response together with a readable copy of its request."""
+        try:
+            request_body: Any = json.loads(request.content)
+        except ValueError:
+            request_body = request.content.decode(errors="replace")
+        data = {
+            "request": {
+                "method": request.method,
+                "path": request.url.path,
+                "body": request_body,
+            },
+            "response": {
+                "status": entry.status,
+                "content_type": entry.content_type,
+                "body": entry.body.decode(errors="replace"),
+            },
+            "elapsed": round(entry.elapsed, 6),
+        }
+        descriptor, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.path / f"{key}.json")
+        logger.debug(f"Recorded {request.method} {request.url.path} as {key}")
+
+
+def _should_record(status: int) -> bool:
+    return status < 500 and status not in _UNRECORDED_STATUSES
+
+
+def _entry_for(response: httpx.Response, elapsed: float) -> CassetteEntry:
+    return CassetteEntry(
+        status=response.status_code,
+        content_type=response.headers.get("content-type", "application/json"),
+        body=response.content,
+        elapsed=elapsed,
+    )
+
+
+def _replayed_response(entry: CassetteEntry, request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        entry.status,
+        headers={"content-type": entry.content_type},
+        content=entry.body,
+        request=request,
+    )
+
+
+def _miss_response(key: str, request: httpx.Request) -> httpx.Response:
+    # A 404 surfaces as a non-retryable invalid_argument QueryError
+    message = (
+        f"No cassette entry {key} for {request.method} {request.url.path}. "
+        "Record it first with --cassette-mode record."
+    )
+    return httpx.Response(
+        404,
+        json={"error": {"code": 404, "message": message, "status": "NOT_FOUND"}},
+        request=request,
+    )
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport that forwards requests and records the responses.
+
+    Wraps a sync transport, an async transport, or an object that is both
+    (like httpx.MockTransport). Responses are read fully before they are
+    returned, so streamed answers arrive in one piece while recording.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Create a recording transport.
+
+        Args:
+            cassette: Cassette receiving the recorded responses.
+            transport: Transport that sends sync requests.
+            async_transport: Transport that sends async requests.
+        """
+        self.cassette = cassette
+        self._transport = transport
+        self._async_transport = async_transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            raise RuntimeError("RecordingTransport has no sync transport")
+        request.read()
+        start = time.perf_counter()
+        response = self._transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        self._record(request, response, time.perf_counter() - start)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._async_transport is None:
+            raise RuntimeError("RecordingTransport has no async transport")
+        await request.aread()
+        start = time.perf_counter()
+        response = await self._async_transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        # Writing the cassette file is blocking file I/O
+        await asyncio.to_thread(self._record, request, response, time.perf_counter() - start)
+        return response
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    async def aclose(self) -> None:
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
+
+    def _record(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        if _should_record(response.status_code):
+            self.cassette.put(Cassette.key_for(request), request, _entry_for(response, elapsed))
+        else:
+            logger.debug(f"Not recording transient HTTP {response.status_code}")
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport that answers requests from a cassette without network access.
+
+    Unrecorded requests get an HTTP 404 naming the missing cassette key.
+    """
+
+    def __init__(self, cassette: Cassette, latency: float = 0.0) -> None:
+        """Create a replay transport.
+
+        Args:
+            cassette: Cassette with the recorded responses.
+            latency: Seconds to wait before each replayed response.
+        """
+        self.cassette = cassette
+        self.latency = latency
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        key = Cassette.key_for(request)
+        entry = self.cassette.get(key)
+        if entry is None:
+            logger.warning(f"Cassette miss for {request.url.path} ({key})")
+            return _miss_response(key, request)
+        if self.latency:
+            time.sleep(self.latency)
+        return _replayed_response(entry, request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key = Cassette.key_for(request)
+        entry = await asyncio.to_thread(self.cassette.get, key)
+        if entry is None:
+            logger.warning(f"Cassette miss for {request.url.path} ({key})")
+            return _miss_response(key, request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return _replayed_response(entry, request)
@@ -1,18 +1,35 @@
 """Client management for Gemini API.
 
-Handles creation and caching of Gemini API clients with proper error handling.
+Handles creation and caching of Gemini API clients with proper error handling,
+including clients that record or replay API traffic through a cassette and
+clients that spread requests over a pool of API keys.
 
 Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+from __future__ import annotations
+
 import logging
 import os
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+    from google.genai.client import AsyncClient
 
-from google import genai
+    from gemini_google_maps_tool.core.keypool import KeyPool
 
 logger = logging.getLogger(__name__)
 
+CASSETTE_RECORD = "record"
+CASSETTE_REPLAY = "replay"
+CASSETTE_MODES = (CASSETTE_RECORD, CASSETTE_REPLAY)
+
 
 class ClientError(Exception):
     """Raised when client initialization fails."""
@@ -20,11 +37,209 @@ class ClientError(Exception):
     pass
 
 
-_client: genai.Client | None = None
+@dataclass(frozen=True)
+class TransportOptions:
+    """HTTP transport settings for the Gemini client.
+
+    Attributes:
+        timeout: Per-request timeout in seconds (None for the SDK default).
+        max_connections: Maximum number of open connections in the pool.
+        max_keepalive_connections: Idle connections kept open for reuse.
+        keepalive_expiry: Seconds an idle connection stays in the pool.
+        http2: Use HTTP/2, multiplexing requests over fewer connections
+            (requires the `http2` extra: pip install 'gemini-google-maps-tool[http2]').
+        cassette: Directory to record API responses to or replay them from
+            (None talks to the API normally).
+        cassette_mode: "record" queries the API and stores each response;
+            "replay" answers from the cassette without network access.
+        replay_latency: Seconds to wait before each replayed response.
+        key_pool: Pool of API keys to send requests with (see core.keypool);
+            built from GEMINI_API_KEYS or GEMINI_API_KEYS_FILE when several
+            keys are configured.
+
+    Example:
+        >>> client = get_client(TransportOptions(timeout=30, max_connections=200))
+        >>> offline = get_client(TransportOptions(cassette=Path("cassettes/ci")))
+    """
+
+    timeout: float | None = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+    cassette: Path | None = None
+    cassette_mode: str = CASSETTE_REPLAY
+    replay_latency: float = 0.0
+    key_pool: KeyPool | None = None
+
+    def __post_init__(self) -> None:
+        if self.cassette_mode not in CASSETTE_MODES:
+            raise ValueError(
+                f"Invalid cassette_mode: {self.cassette_mode!r}. "
+                f"Must be {CASSETTE_RECORD!r} or {CASSETTE_REPLAY!r}"
+            )
+        if self.replay_latency < 0:
+            raise ValueError(f"Invalid replay_latency: {self.replay_latency}. Must be >= 0")
+
+    @property
+    def replaying(self) -> bool:
+        """Whether requests are answered from a cassette instead of the API."""
+        return self.cassette is not None and self.cassette_mode == CASSETTE_REPLAY
+
+    def to_http_options(self) -> types.HttpOptions:
+        """Convert to the SDK's HttpOptions (httpx client arguments)."""
+        import httpx
+        from google.genai import types
+
+        # The SDK takes the request timeout in milliseconds
+        timeout = int(self.timeout * 1000) if self.timeout is not None else None
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+        if self.cassette is not None or self.key_pool is not None:
+            sync_transport: httpx.BaseTransport = httpx.HTTPTransport(
+                limits=limits, http2=self.http2
+            )
+            async_transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+                limits=limits, http2=self.http2
+            )
+            if self.key_pool is not None:
+                # Imported here: the key pool is only needed with several API keys
+                from gemini_google_maps_tool.core.keypool import KeyPoolTransport
+
+                key_transport = KeyPoolTransport(self.key_pool, sync_transport, async_transport)
+                sync_transport, async_transport = key_transport, key_transport
+
+            if self.cassette is not None:
+                # Imported here: the cassette module is only needed when recording or replaying
+                from gemini_google_maps_tool.core.cassette import (
+                    Cassette,
+                    RecordingTransport,
+                    ReplayTransport,
+                )
+
+                cassette = Cassette(self.cassette)
+                if self.replaying:
+                    replay = ReplayTransport(cassette, self.replay_latency)
+                    sync_transport, async_transport = replay, replay
+                else:
+                    recording = RecordingTransport(cassette, sync_transport, async_transport)
+                    sync_transport, async_transport = recording, recording
+            return types.HttpOptions(
+                timeout=timeout,
+                httpx_client=httpx.Client(transport=sync_transport),
+                httpx_async_client=httpx.AsyncClient(transport=async_transport),
+            )
+
+        client_args: dict[str, Any] = {"limits": limits, "http2": self.http2}
+        return types.HttpOptions(
+            timeout=timeout,
+            client_args=client_args,
+            async_client_args=dict(client_args),
+        )
+
+
+def load_api_keys() -> list[str]:
+    """Read the configured API keys from the environment.
+
+    GEMINI_API_KEYS holds keys separated by commas or whitespace;
+    GEMINI_API_KEYS_FILE names a file with one key per line (blank lines and
+    lines starting with "#" are skipped). Both are combined; without either,
+    GEMINI_API_KEY is the only key.
+
+    Returns:
+        The keys in order of appearance, without duplicates (may be empty).
+
+    Raises:
+        ClientError: If GEMINI_API_KEYS_FILE cannot be read.
+
+    Example:
+        >>> os.environ["GEMINI_API_KEYS"] = "key-a,key-b"
+        >>> load_api_keys()
+        ['key-a', 'key-b']
+    """
+    keys = os.environ.get("GEMINI_API_KEYS", "").replace(",", " ").split()
+    keys_file = os.environ.get("GEMINI_API_KEYS_FILE")
+    if keys_file:
+        try:
+            lines = Path(keys_file).expanduser().read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            raise ClientError(f"Cannot read GEMINI_API_KEYS_FILE {keys_file}: {e}") from e
+        stripped = (line.strip() for line in lines)
+        keys += [line for line in stripped if line and not line.startswith("#")]
+    if not keys and os.environ.get("GEMINI_API_KEY"):
+        keys = [os.environ["GEMINI_API_KEY"]]
+    return list(dict.fromkeys(keys))
+
+
+# Clients are cached per transport configuration and shared by all threads
+_clients: dict[TransportOptions, genai.Client] = {}
+_clients_lock = threading.Lock()
 
 
-def get_client() -> genai.Client:
-    """Get or create the Gemini API client.
+def create_client(transport: TransportOptions | None = None) -> genai.Client:
+    """Create a new, uncached Gemini API client.
+
+    Args:
+        transport: HTTP transport settings (default: TransportOptions()).
+
+    Returns:
+        Initialized Gemini client instance.
+
+    With several keys configured (see load_api_keys()), requests are spread
+    over them through a KeyPool unless the transport brings its own.
+
+    Raises:
+        ClientError: If no API key is configured (and not replaying a cassette)
+            or the transport is unavailable.
+
+    Example:
+        >>> client = create_client(TransportOptions(http2=True))
+    """
+    logger.debug("Initializing Gemini API client")
+    options = transport or TransportOptions()
+    keys = load_api_keys()
+    if not keys and (options.replaying or options.key_pool is not None):
+        # Replayed requests never reach the API and pooled requests carry
+        # their own key, so no real key is needed
+        keys = ["unused"]
+    if not keys:
+        logger.error("GEMINI_API_KEY environment variable not set")
+        raise ClientError(
+            "GEMINI_API_KEY environment variable is required. "
+            "Set it with: export GEMINI_API_KEY='your-api-key'"
+        )
+    if len(keys) > 1 and options.key_pool is None and not options.replaying:
+        from gemini_google_maps_tool.core.keypool import KeyPool
+
+        logger.info(f"Spreading requests over {len(keys)} API keys")
+        options = replace(options, key_pool=KeyPool(keys))
+    api_key = keys[0]
+    # Deferred so that commands which never query skip the SDK import
+    from google import genai
+
+    logger.debug("Creating Gemini client with API key")
+    try:
+        client = genai.Client(api_key=api_key, http_options=options.to_http_options())
+    except ImportError as e:
+        raise ClientError(
+            f"Cannot create HTTP transport: {e}\n"
+            "For HTTP/2 install: pip install 'gemini-google-maps-tool[http2]'"
+        ) from e
+    logger.debug("Gemini client initialized successfully")
+    return client
+
+
+def get_client(transport: TransportOptions | None = None) -> genai.Client:
+    """Get or create the shared Gemini API client for a transport configuration.
+
+    Thread-safe: concurrent first calls create exactly one client.
+
+    Args:
+        transport: HTTP transport settings (default: TransportOptions()).
 
     Returns:
         Initialized Gemini client instance.
@@ -36,19 +251,37 @@ def get_client() -> genai.Client:
         >>> client = get_client()
         >>> # Use client for API calls
     """
-    global _client
-    if _client is None:
-        logger.debug("Initializing Gemini API client")
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
-            logger.error("GEMINI_API_KEY environment variable not set")
-            raise ClientError(
-                "GEMINI_API_KEY environment variable is required. "
-                "Set it with: export GEMINI_API_KEY='your-api-key'"
-            )
-        logger.debug("Creating Gemini client with API key")
-        _client = genai.Client(api_key=api_key)
-        logger.debug("Gemini client initialized successfully")
-    else:
+    options = transport or TransportOptions()
+    client = _clients.get(options)
+    if client is not None:
         logger.debug("Reusing existing Gemini client")
-    return _client
+        return client
+    with _clients_lock:
+        client = _clients.get(options)
+        if client is None:
+            client = create_client(options)
+            _clients[options] = client
+        return client
+
+
+def get_async_client(transport: TransportOptions | None = None) -> AsyncClient:
+    """Get the async Gemini API client.
+
+    The async client shares configuration and credentials with the client
+    returned by get_client(), but its methods are coroutines that can run
+    concurrently on one event loop.
+
+    Args:
+        transport: HTTP transport settings (default: TransportOptions()).
+
+    Returns:
+        Async Gemini client instance (the `aio` view of the cached client).
+
+    Raises:
+        ClientError: If GEMINI_API_KEY environment variable is not set.
+
+    Example:
+        >>> client = get_async_client()
+        >>> response = await client.models.generate_content(...)
+    """
+    return get_client(transport).aio
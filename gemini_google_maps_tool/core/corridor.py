@@ -0,0 +1,304 @@
+"""Corridor queries: grounded queries sampled along a route.
+
+Provides parse_route(), which reads an encoded polyline or a GeoJSON
+LineString, and corridor_async(), which runs one query at points sampled
+at a fixed spacing along the route (closer together inside optional dense
+areas) and merges the places found, de-duplicated by place id and ordered
+by distance along the route.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from gemini_google_maps_tool.core.geo import decode_polyline, sample_polyline
+from gemini_google_maps_tool.core.maps import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MODEL,
+    GroundingChunk,
+    MapsQueryRequest,
+    QueryError,
+    ResultCache,
+    query_many_async,
+)
+from gemini_google_maps_tool.core.ratelimit import RateLimiter
+from gemini_google_maps_tool.core.retry import RetryPolicy
+from gemini_google_maps_tool.core.sweep import BoundingBox
+from gemini_google_maps_tool.core.tracing import Tracer
+
+if TYPE_CHECKING:
+    from google.genai.client import AsyncClient
+
+    from gemini_google_maps_tool.core.costs import Budget
+    from gemini_google_maps_tool.core.metrics import QueryMetrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPACING_M = 5000.0
+MAX_CORRIDOR_SAMPLES = 1000
+
+
+def _geojson_lines(data: Any) -> list[list[tuple[float, float]]]:
+    """Collect the (latitude, longitude) lines of a GeoJSON object."""
+    if not isinstance(data, dict):
+        raise ValueError("Invalid GeoJSON: Expected an object")
+    kind = data.get("type")
+    if kind == "FeatureCollection":
+        return [line for feature in data.get("features") or [] for line in _geojson_lines(feature)]
+    if kind == "Feature":
+        geometry = data.get("geometry")
+        return _geojson_lines(geometry) if geometry else []
+    lines: list[Any]
+    if kind == "LineString":
+        lines = [data.get("coordinates") or []]
+    elif kind == "MultiLineString":
+        lines = data.get("coordinates") or []
+    else:
+        return []
+    try:
+        # GeoJSON positions are [longitude, latitude(, altitude)]
+        return [[(float(position[1]), float(position[0])) for position in line] for line in lines]
+    except (TypeError, ValueError, IndexError) as e:
+        raise ValueError(f"Invalid GeoJSON coordinates: {e}") from e
+
+
+def parse_route(text: str, precision: int = 5) -> list[tuple[float, float]]:
+    """Parse a route given as GeoJSON or as an encoded polyline.
+
+    GeoJSON may be a LineString or MultiLineString geometry, a Feature, or a
+    FeatureCollection; all of its lines are joined in order. Anything that
+    does not start with "{" is decoded as an encoded polyline.
+
+    Args:
+        text: GeoJSON document or encoded polyline.
+        precision: Decimal digits of an encoded polyline (5 or 6).
+
+    Returns:
+        The route's (latitude, longitude) points.
+
+    Raises:
+        ValueError: If the route cannot be parsed, has fewer than two points
+            or has coordinates out of range.
+
+    Example:
+        >>> parse_route('{"type": "LineString", "coordinates": [[4.89, 52.37], [5.12, 52.09]]}')
+        [(52.37, 4.89), (52.09, 5.12)]
+    """
+    text = text.strip()
+    if text.startswith("{"):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid GeoJSON: {e}") from e
+        points = [point for line in _geojson_lines(data) for point in line]
+    else:
+        points = decode_polyline(text, precision)
+
+    if len(points) < 2:
+        raise ValueError(
+            "Invalid route: Expected a GeoJSON LineString or an encoded polyline "
+            "with at least two points"
+        )
+    for lat, lon in points:
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"Invalid route: Coordinates out of range: {lat},{lon}")
+    return points
+
+
+@dataclass(frozen=True, slots=True)
+class CorridorSample:
+    """One queried point along the route.
+
+    Attributes:
+        lat_lon: The sample point, used as the query's location.
+        distance_m: Meters from the start of the route.
+        place_count: Distinct places the answer cited.
+        error: Failure reason if the query failed.
+    """
+
+    lat_lon: tuple[float, float]
+    distance_m: float
+    place_count: int = 0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the sample."""
+        data: dict[str, Any] = {
+            "lat_lon": list(self.lat_lon),
+            "distance_m": round(self.distance_m, 1),
+            "place_count": self.place_count,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+@dataclass(slots=True)
+class CorridorPlace:
+    """A de-duplicated place found along the route.
+
+    Attributes:
+        chunk: The place as first cited.
+        lat_lon: The first sample point whose answer cited it.
+        distance_m: Distance along the route of that sample.
+        hits: Number of samples whose answers cited it.
+    """
+
+    chunk: GroundingChunk
+    lat_lon: tuple[float, float]
+    distance_m: float
+    hits: int = 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the place."""
+        return {
+            **self.chunk.to_dict(),
+            "distance_m": round(self.distance_m, 1),
+            "lat_lon": list(self.lat_lon),
+            "hits": self.hits,
+        }
+
+
+@dataclass(slots=True)
+class CorridorResult:
+    """Merged outcome of a corridor query.
+
+    Attributes:
+        places: Distinct places ordered by distance along the route.
+        samples: Every queried point, in route order.
+        length_m: Length of the route in meters.
+    """
+
+    places: list[CorridorPlace] = field(default_factory=list)
+    samples: list[CorridorSample] = field(default_factory=list)
+    length_m: float = 0.0
+
+    @property
+    def failed(self) -> int:
+        """Number of samples whose query failed."""
+        return sum(1 for sample in self.samples if sample.error is not None)
+
+
+async def corridor_async(
+    client: AsyncClient,
+    query: str,
+    route: Sequence[tuple[float, float]],
+    spacing_m: float = DEFAULT_SPACING_M,
+    dense_areas: Sequence[BoundingBox] = (),
+    dense_spacing_m: float | None = None,
+    model: str = DEFAULT_MODEL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    *,
+    cache: ResultCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    tracer: Tracer | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+) -> CorridorResult:
+    """Run a query at points along a route and merge the places found.
+
+    Points are sampled every spacing_m meters from the start of the route,
+    including both ends, and every dense_spacing_m meters inside the dense
+    areas (e.g. bounding boxes of towns the route passes). All queries run
+    concurrently; failed samples are recorded and never abort the run.
+
+    Args:
+        client: Async Gemini API client (see get_async_client()).
+        query: The query text, sent unchanged for every sample.
+        route: The route's (latitude, longitude) points (see parse_route()).
+        spacing_m: Meters between samples.
+        dense_areas: Areas where samples are dense_spacing_m apart instead.
+        dense_spacing_m: Meters between samples inside dense areas
+            (default: a quarter of spacing_m).
+        model: Model name to use.
+        concurrency: Maximum number of queries in flight at once.
+        cache: Optional result cache shared by all samples.
+        rate_limiter: Optional limiter shared by all samples.
+        retry: Optional retry policy applied to each sample.
+        tracer: Optional tracer receiving spans for every query.
+        metrics: Optional metrics shared by all queries.
+        budget: Optional budget shared by all queries (see core.costs).
+
+    Returns:
+        CorridorResult with places ordered by distance along the route.
+
+    Raises:
+        ValueError: If a spacing is not positive, the route has fewer than two
+            points, or sampling would exceed MAX_CORRIDOR_SAMPLES points.
+
+    Example:
+        >>> route = parse_route(polyline)
+        >>> result = asyncio.run(corridor_async(client, "EV chargers", route, 10_000))
+        >>> [(round(p.distance_m / 1000), p.chunk.title) for p in result.places][:2]
+        [(0, 'Fastned Amsterdam'), (21, 'Tesla Supercharger Breukelen')]
+    """
+    dense_spacing = dense_spacing_m if dense_spacing_m is not None else spacing_m / 4
+    if spacing_m <= 0 or dense_spacing <= 0:
+        raise ValueError(f"Invalid spacing: {spacing_m}, {dense_spacing}. Must be positive")
+    if len(route) < 2:
+        raise ValueError("Invalid route: Expected at least two points")
+
+    def spacing_at(point: tuple[float, float]) -> float:
+        return dense_spacing if any(area.contains(point) for area in dense_areas) else spacing_m
+
+    points = list(islice(sample_polyline(route, spacing_at), MAX_CORRIDOR_SAMPLES + 1))
+    if len(points) > MAX_CORRIDOR_SAMPLES:
+        raise ValueError(
+            f"Too many sample points: more than {MAX_CORRIDOR_SAMPLES}. "
+            "Increase the spacing or shorten the route"
+        )
+    logger.info(f"Querying {len(points)} points along the route")
+
+    requests = [
+        MapsQueryRequest(query=query, lat_lon=point, model=model, include_grounding=True)
+        for point, _ in points
+    ]
+    outcomes = await query_many_async(
+        client,
+        requests,
+        concurrency,
+        cache=cache,
+        rate_limiter=rate_limiter,
+        retry=retry,
+        tracer=tracer,
+        metrics=metrics,
+        budget=budget,
+    )
+
+    result = CorridorResult(length_m=points[-1][1])
+    places: dict[str, CorridorPlace] = {}
+    for (point, distance), outcome in zip(points, outcomes, strict=True):
+        if isinstance(outcome, QueryError):
+            logger.debug(f"Sample at {distance:.0f} m failed ({outcome.reason})")
+            result.samples.append(CorridorSample(point, distance, error=outcome.reason))
+            continue
+        metadata = outcome.grounding_metadata
+        seen: set[str] = set()
+        for chunk in metadata.grounding_chunks if metadata else []:
+            key = chunk.place_key
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            place = places.get(key)
+            if place is None:
+                places[key] = CorridorPlace(chunk, point, distance)
+            else:
+                place.hits += 1
+        result.samples.append(CorridorSample(point, distance, place_count=len(seen)))
+
+    # Samples are merged in route order, so insertion order is distance order
+    result.places = list(places.values())
+    logger.info(
+        f"Corridor queried {len(result.samples)} points ({result.failed} failed) "
+        f"and found {len(result.places)} places"
+    )
+    return result
@@ -0,0 +1,213 @@
+"""Token and cost accounting with budget caps for grounded queries.
+
+Provides a per-model pricing table, RunUsage, which adds up the token usage
+and estimated cost of a run, and Budget, which stops new API requests once
+a token or cost limit is reached.
+
+Costs are estimates at list price: free tiers, batch discounts and price
+changes are not taken into account. Check https://ai.google.dev/pricing.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from gemini_google_maps_tool.core.maps import MapsQueryResult, QueryError, TokenUsage
+
+
+@dataclass(frozen=True, slots=True)
+class ModelPricing:
+    """List prices of a model in US dollars.
+
+    Attributes:
+        input_per_million: Per million prompt and tool-use prompt tokens.
+        output_per_million: Per million output tokens, including thinking.
+        cached_input_per_million: Per million prompt tokens served from cache.
+        grounded_request: Per request grounded with Google Maps.
+    """
+
+    input_per_million: float
+    output_per_million: float
+    cached_input_per_million: float
+    grounded_request: float = 0.025  # $25 per 1,000 grounded prompts
+
+    def cost(self, usage: TokenUsage, requests: int = 1) -> float:
+        """Return the estimated cost of token usage over a number of requests."""
+        cached = min(usage.cached_tokens, usage.prompt_tokens)
+        input_tokens = usage.prompt_tokens - cached + usage.tool_use_prompt_tokens
+        output_tokens = usage.output_tokens + usage.thoughts_tokens
+        return (
+            input_tokens * self.input_per_million
+            + cached * self.cached_input_per_million
+            + output_tokens * self.output_per_million
+        ) / 1_000_000 + requests * self.grounded_request
+
+
+PRICING: dict[str, ModelPricing] = {
+    "gemini-2.5-flash": ModelPricing(0.30, 2.50, 0.03),
+    "gemini-2.5-flash-lite": ModelPricing(0.10, 0.40, 0.01),
+}
+
+
+def pricing_for(model: str, pricing: Mapping[str, ModelPricing] = PRICING) -> ModelPricing:
+    """Return the prices of a model.
+
+    Unknown models are priced like the most expensive known model, so a
+    budget errs on the side of stopping early.
+    """
+    known = pricing.get(model)
+    if known is not None:
+        return known
+    return max(pricing.values(), key=lambda p: (p.output_per_million, p.input_per_million))
+
+
+class RunUsage:
+    """Token usage and estimated cost of the API requests of a run, per model.
+
+    Only requests answered by the API are counted; cached results cost
+    nothing. Safe to share between threads.
+
+    Example:
+        >>> usage = RunUsage()
+        >>> usage.record("gemini-2.5-flash", result)
+        >>> usage.requests, usage.total_tokens, round(usage.cost, 4)
+        (1, 360, 0.0252)
+    """
+
+    def __init__(self, pricing: Mapping[str, ModelPricing] = PRICING) -> None:
+        """Start an empty run.
+
+        Args:
+            pricing: Prices per model name.
+        """
+        self.pricing = pricing
+        self._requests: dict[str, int] = {}
+        self._usage: dict[str, TokenUsage] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, result: MapsQueryResult) -> None:
+        """Add one result; cached results and results without usage add no tokens."""
+        if result.from_cache:
+            return
+        with self._lock:
+            self._requests[model] = self._requests.get(model, 0) + 1
+            if result.usage is not None:
+                self._usage[model] = self._usage.get(model, TokenUsage()) + result.usage
+
+    @property
+    def requests(self) -> int:
+        """Number of grounded requests answered by the API."""
+        with self._lock:
+            return sum(self._requests.values())
+
+    @property
+    def total_tokens(self) -> int:
+        """Total tokens over all models."""
+        with self._lock:
+            return sum(usage.total_tokens for usage in self._usage.values())
+
+    @property
+    def cost(self) -> float:
+        """Estimated cost in US dollars over all models."""
+        with self._lock:
+            return sum(self._model_cost(model) for model in self._requests)
+
+    def _model_cost(self, model: str) -> float:
+        usage = self._usage.get(model, TokenUsage())
+        return pricing_for(model, self.pricing).cost(usage, self._requests[model])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return totals and a per-model breakdown (cost rounded to micro-dollars)."""
+        with self._lock:
+            models = {
+                model: {
+                    "requests": requests,
+                    **self._usage.get(model, TokenUsage()).to_dict(),
+                    "estimated_cost_usd": round(self._model_cost(model), 6),
+                }
+                for model, requests in sorted(self._requests.items())
+            }
+        return {
+            "requests": sum(data["requests"] for data in models.values()),
+            "total_tokens": sum(data["total_tokens"] for data in models.values()),
+            "estimated_cost_usd": round(
+                sum(data["estimated_cost_usd"] for data in models.values()), 6
+            ),
+            "models": models,
+        }
+
+
+class Budget:
+    """Token and cost limits for a run, with the usage recorded against them.
+
+    Queries given a budget check it before every API attempt and fail with
+    a QueryError whose reason is "budget_exceeded" once a limit has been
+    reached; results that completed are unaffected. Requests already in
+    flight still finish, so a concurrent run can overshoot a limit by up to
+    its concurrency. A budget without limits only accounts.
+
+    Example:
+        >>> budget = Budget(max_cost=5.00)
+        >>> results = asyncio.run(query_many_async(client, requests, budget=budget))
+        >>> budget.usage.to_dict()["estimated_cost_usd"]
+        4.987
+    """
+
+    def __init__(
+        self,
+        max_tokens: int | None = None,
+        max_cost: float | None = None,
+        usage: RunUsage | None = None,
+    ) -> None:
+        """Create a budget.
+
+        Args:
+            max_tokens: Stop after this many tokens in total.
+            max_cost: Stop after this estimated cost in US dollars.
+            usage: Usage to record into (default: a new RunUsage).
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        if max_tokens is not None and max_tokens <= 0:
+            raise ValueError(f"Invalid max_tokens: {max_tokens}. Must be positive")
+        if max_cost is not None and max_cost <= 0:
+            raise ValueError(f"Invalid max_cost: {max_cost}. Must be positive")
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.usage = usage if usage is not None else RunUsage()
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether a limit has been reached."""
+        if self.max_tokens is not None and self.usage.total_tokens >= self.max_tokens:
+            return True
+        return self.max_cost is not None and self.usage.cost >= self.max_cost
+
+    def check(self) -> None:
+        """Allow another API request, or fail if a limit has been reached.
+
+        Raises:
+            QueryError: With reason "budget_exceeded" once the budget is exhausted.
+        """
+        if not self.exhausted:
+            return
+        raise QueryError(
+            f"Budget exhausted after {self.usage.requests} requests "
+            f"({self.usage.total_tokens} tokens, ~${self.usage.cost:.4f}); "
+            "no new requests are sent.\n"
+            "Suggestions:\n"
+            "  - Raise --max-tokens/--max-cost to continue\n"
+            "  - Re-run only the records that failed with reason budget_exceeded",
+            reason=QueryError.REASON_BUDGET_EXCEEDED,
+        )
+
+    def record(self, model: str, result: MapsQueryResult) -> None:
+        """Record the usage of a completed query."""
+        self.usage.record(model, result)
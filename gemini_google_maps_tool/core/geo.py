@@ -0,0 +1,289 @@
+"""Geospatial helpers for location-aware caching.
+
+Provides geohash encoding/decoding, great-circle distances and a geohash
+grid that quantizes coordinates to cell centers and finds nearby cells, so
+requests a few meters apart can share cached results. Also decodes encoded
+polylines and samples points at a fixed spacing along a route.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import math
+from collections.abc import Callable, Iterator, Sequence
+from itertools import pairwise
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_BASE32_INDEX = {char: index for index, char in enumerate(_BASE32)}
+
+EARTH_RADIUS_M = 6_371_008.8
+DEFAULT_GEO_PRECISION = 7
+DEFAULT_GEO_RADIUS_M = 250.0
+MAX_NEIGHBOR_RINGS = 3
+
+
+def geohash_encode(lat: float, lon: float, precision: int = DEFAULT_GEO_PRECISION) -> str:
+    """Encode coordinates as a geohash string.
+
+    Args:
+        lat: Latitude in degrees (-90 to 90).
+        lon: Longitude in degrees (-180 to 180).
+        precision: Number of geohash characters (1-12).
+
+    Returns:
+        Geohash of the cell containing the point.
+
+    Raises:
+        ValueError: If precision is outside 1-12.
+
+    Example:
+        >>> geohash_encode(52.3731, 4.8926, 7)
+        'u173zq4'
+    """
+    if not 1 <= precision <= 12:
+        raise ValueError(f"Invalid geohash precision: {precision}. Must be between 1 and 12")
+
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars: list[str] = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, interval = (lon, lon_range) if even else (lat, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            interval[0] = mid
+        else:
+            bits <<= 1
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_bounds(cell: str) -> tuple[float, float, float, float]:
+    """Decode a geohash into its bounding box.
+
+    Args:
+        cell: Geohash string.
+
+    Returns:
+        Tuple of (min_lat, min_lon, max_lat, max_lon).
+
+    Raises:
+        ValueError: If the geohash contains invalid characters.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in cell:
+        if char not in _BASE32_INDEX:
+            raise ValueError(f"Invalid geohash: {cell}")
+        value = _BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if (value >> shift) & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    return (lat_range[0], lon_range[0], lat_range[1], lon_range[1])
+
+
+def geohash_center(cell: str) -> tuple[float, float]:
+    """Return the (latitude, longitude) center of a geohash cell."""
+    min_lat, min_lon, max_lat, max_lon = geohash_bounds(cell)
+    return ((min_lat + max_lat) / 2, (min_lon + max_lon) / 2)
+
+
+def haversine_m(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Great-circle distance in meters between two (latitude, longitude) points.
+
+    Example:
+        >>> round(haversine_m((52.3731, 4.8926), (52.3676, 4.9041)))
+        992
+    """
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> list[tuple[float, float]]:
+    """Decode an encoded polyline (Google's polyline algorithm) into points.
+
+    Args:
+        encoded: Encoded polyline string, e.g. from the Directions or Routes API.
+        precision: Decimal digits of the encoding (5, or 6 for OSRM/Valhalla polyline6).
+
+    Returns:
+        List of (latitude, longitude) points.
+
+    Raises:
+        ValueError: If the string is not a valid encoded polyline.
+
+    Example:
+        >>> decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+        [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    """
+    factor = 10**precision
+    points: list[tuple[float, float]] = []
+    index = lat = lon = 0
+    while index < len(encoded):
+        deltas: list[int] = []
+        for _ in range(2):
+            result = shift = 0
+            while True:
+                if index >= len(encoded):
+                    raise ValueError("Invalid polyline: Truncated at the end of the string")
+                byte = ord(encoded[index]) - 63
+                index += 1
+                if not 0 <= byte < 64:
+                    raise ValueError(f"Invalid polyline: Unexpected character at {index - 1}")
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / factor, lon / factor))
+    return points
+
+
+def sample_polyline(
+    points: Sequence[tuple[float, float]],
+    spacing_m: Callable[[tuple[float, float]], float],
+) -> Iterator[tuple[tuple[float, float], float]]:
+    """Yield points at a spacing along a polyline, with their distance along it.
+
+    The first and last points of the line are always sampled. Points between
+    vertices are interpolated linearly in latitude and longitude, which is
+    accurate for the short segments of routes.
+
+    Args:
+        points: The (latitude, longitude) vertices of the line.
+        spacing_m: Meters to the next sample, given the current sample point,
+            so spacing can vary along the line (it must be positive).
+
+    Yields:
+        Tuples of ((latitude, longitude), meters along the line).
+
+    Example:
+        >>> [round(d) for _, d in sample_polyline([(0, 0), (0, 0.05)], lambda p: 2000)]
+        [0, 2000, 4000, 5560]
+    """
+    if not points:
+        return
+    yield points[0], 0.0
+    last_sampled = 0.0
+    next_at = spacing_m(points[0])
+    travelled = 0.0
+    for start, end in pairwise(points):
+        length = haversine_m(start, end)
+        while next_at <= travelled + length:
+            fraction = (next_at - travelled) / length
+            point = (
+                start[0] + fraction * (end[0] - start[0]),
+                start[1] + fraction * (end[1] - start[1]),
+            )
+            yield point, next_at
+            last_sampled = next_at
+            next_at += spacing_m(point)
+        travelled += length
+    if travelled - last_sampled > 1:
+        yield points[-1], travelled
+
+
+class GeoGrid:
+    """Geohash grid used to bucket locations for cache keys.
+
+    Points in the same cell quantize to the same cell center. With a
+    max_distance_m threshold, nearby_centers() also returns the centers of
+    surrounding cells within that distance, nearest first, so a cache lookup
+    can fall back to the closest cell that already has an answer.
+
+    Example:
+        >>> grid = GeoGrid(precision=7, max_distance_m=250)
+        >>> grid.quantize((37.78193, -122.40476))
+        (37.78129577636719, -122.40486145019531)
+    """
+
+    def __init__(self, precision: int = DEFAULT_GEO_PRECISION, max_distance_m: float = 0) -> None:
+        """Create a grid.
+
+        Args:
+            precision: Geohash precision (7 is roughly a 150 m cell).
+            max_distance_m: Fallback radius for nearby cells (0 disables fallback).
+
+        Raises:
+            ValueError: If precision is outside 1-12 or the radius is negative.
+        """
+        if not 1 <= precision <= 12:
+            raise ValueError(f"Invalid geohash precision: {precision}. Must be between 1 and 12")
+        if max_distance_m < 0:
+            raise ValueError(f"Invalid max distance: {max_distance_m}. Must not be negative")
+        self.precision = precision
+        self.max_distance_m = max_distance_m
+        bits = precision * 5
+        self.cell_height_deg = 180 / 2 ** (bits // 2)
+        self.cell_width_deg = 360 / 2 ** (bits - bits // 2)
+
+    def cell(self, lat_lon: tuple[float, float]) -> str:
+        """Return the geohash cell containing a point."""
+        return geohash_encode(lat_lon[0], lat_lon[1], self.precision)
+
+    def quantize(self, lat_lon: tuple[float, float]) -> tuple[float, float]:
+        """Snap a point to the center of its grid cell."""
+        return geohash_center(self.cell(lat_lon))
+
+    def nearby_centers(self, lat_lon: tuple[float, float]) -> list[tuple[float, float]]:
+        """Return cell centers to probe for a point, own cell first.
+
+        Args:
+            lat_lon: The requested (latitude, longitude).
+
+        Returns:
+            The point's own cell center followed by centers of neighboring
+            cells within max_distance_m, ordered by distance.
+        """
+        own = self.cell(lat_lon)
+        if self.max_distance_m <= 0:
+            return [geohash_center(own)]
+
+        lat, lon = geohash_center(own)
+        cell_width_m = (
+            math.radians(self.cell_width_deg) * EARTH_RADIUS_M * math.cos(math.radians(lat))
+        )
+        cell_height_m = math.radians(self.cell_height_deg) * EARTH_RADIUS_M
+        smallest = max(min(cell_width_m, cell_height_m), 1e-9)
+        rings = min(MAX_NEIGHBOR_RINGS, math.ceil(self.max_distance_m / smallest))
+
+        candidates: dict[str, float] = {}
+        for dy in range(-rings, rings + 1):
+            for dx in range(-rings, rings + 1):
+                if dx == dy == 0:
+                    continue
+                neighbor_lat = lat + dy * self.cell_height_deg
+                if not -90 <= neighbor_lat <= 90:
+                    continue
+                neighbor_lon = (lon + dx * self.cell_width_deg + 180) % 360 - 180
+                neighbor = geohash_encode(neighbor_lat, neighbor_lon, self.precision)
+                if neighbor == own or neighbor in candidates:
+                    continue
+                distance = haversine_m(lat_lon, geohash_center(neighbor))
+                if distance <= self.max_distance_m:
+                    candidates[neighbor] = distance
+
+        ordered = sorted(candidates, key=candidates.__getitem__)
+        return [geohash_center(own)] + [geohash_center(cell) for cell in ordered]
@@ -0,0 +1,251 @@
+"""Append-only journal for resumable bulk runs.
+
+Provides RunJournal, a JSONL write-ahead journal of completed requests. Each
+result is appended (and flushed) before it is reported, so a run that dies
+can be restarted with the same journal: completed requests are answered
+from it instead of the API, and only the rest are sent again. Batch API
+jobs are recorded as soon as they are submitted, so a restarted run waits
+for them instead of paying for their requests twice. compact() rewrites the
+journal with one entry per request once a run ends.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+from gemini_google_maps_tool.core.maps import MapsQueryRequest, make_request_key
+
+logger = logging.getLogger(__name__)
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def request_fingerprint(request: MapsQueryRequest) -> str:
+    """Return a short digest of a request's query, location, model and grounding.
+
+    Journal entries store it next to the record id, so an entry is only
+    reused for the same request even if the input file was edited.
+    """
+    key = make_request_key(request.query, request.lat_lon, request.model, request.include_grounding)
+    return key.digest[:16]
+
+
+@dataclass(frozen=True)
+class JournaledJob:
+    """A Batch API job that was submitted but whose results are not journaled.
+
+    Attributes:
+        name: Job name ("batches/...").
+        model: Model answering the job's requests.
+        records: (record id, fingerprint) of each request, in job order.
+    """
+
+    name: str
+    model: str
+    records: tuple[tuple[str, str], ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the journal line of the job."""
+        return {"job": self.name, "model": self.model, "records": [list(r) for r in self.records]}
+
+
+class RunJournal:
+    """Append-only JSONL journal of completed requests, keyed by record id.
+
+    Every line is {"id": ..., "key": ..., "result": {...}}, or for Batch API
+    jobs {"job": ..., "model": ..., "records": [[id, key], ...]} when a job
+    is submitted and {"job": ..., "done": true} once its results are
+    journaled. Lines are flushed
+    as they are written, so they survive the process being killed; the file
+    is synced to disk when the journal is compacted or closed. A torn last
+    line left by a crash is dropped when the journal is opened. Safe to use
+    from multiple threads.
+
+    Example:
+        >>> with RunJournal("enrich.journal") as journal:
+        ...     done = journal.get("42", fingerprint)
+        ...     if done is None:
+        ...         journal.append("42", fingerprint, {"id": "42", "response_text": "..."})
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (and create if needed) a journal and load its entries.
+
+        Args:
+            path: Journal file path.
+
+        Raises:
+            OSError: If the journal cannot be read or opened for appending.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._entries: dict[str, tuple[str, dict[str, Any]]] = {}
+        self._jobs: dict[str, JournaledJob] = {}
+        self._load()
+        self._file: IO[str] = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Read existing entries, truncating a torn last line."""
+        if not self.path.exists():
+            return
+        valid_bytes = 0
+        with self.path.open("rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Torn by a crash in the middle of a write
+                valid_bytes += len(raw)
+                try:
+                    entry = json.loads(raw)
+                    if "job" not in entry:
+                        self._entries[str(entry["id"])] = (str(entry["key"]), dict(entry["result"]))
+                    elif entry.get("done"):
+                        self._jobs.pop(str(entry["job"]), None)
+                    else:
+                        records = tuple((str(i), str(k)) for i, k in entry["records"])
+                        job = JournaledJob(str(entry["job"]), str(entry["model"]), records)
+                        self._jobs[job.name] = job
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping invalid journal line in {self.path}: {e}")
+        if valid_bytes < self.path.stat().st_size:
+            logger.warning(f"Dropping incomplete last entry of {self.path}")
+            with self.path.open("rb+") as f:
+                f.truncate(valid_bytes)
+        logger.debug(f"Loaded {len(self._entries)} journal entries from {self.path}")
+
+    def get(self, record_id: str, fingerprint: str) -> dict[str, Any] | None:
+        """Return the journaled result of a record, if it was completed.
+
+        Args:
+            record_id: Id of the record.
+            fingerprint: request_fingerprint() of the record's request.
+
+        Returns:
+            The result line, or None if the record has no entry or its entry
+            was written for a different request.
+        """
+        with self._lock:
+            entry = self._entries.get(record_id)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        return entry[1]
+
+    def append(self, record_id: str, fingerprint: str, result: dict[str, Any]) -> None:
+        """Record a completed request and flush it to the journal file.
+
+        Args:
+            record_id: Id of the record.
+            fingerprint: request_fingerprint() of the record's request.
+            result: JSON-serializable result line.
+        """
+        with self._lock:
+            self._write({"id": record_id, "key": fingerprint, "result": result})
+            self._entries[record_id] = (fingerprint, result)
+
+    def add_job(self, name: str, model: str, records: Sequence[tuple[str, str]]) -> None:
+        """Record a submitted Batch API job and flush it to the journal file.
+
+        Args:
+            name: Job name ("batches/...").
+            model: Model answering the job's requests.
+            records: (record id, fingerprint) of each request, in job order.
+        """
+        job = JournaledJob(name, model, tuple(records))
+        with self._lock:
+            self._write(job.to_dict())
+            self._jobs[name] = job
+
+    def finish_job(self, name: str) -> None:
+        """Record that the results of a Batch API job are journaled.
+
+        Args:
+            name: Job name passed to add_job().
+        """
+        with self._lock:
+            if self._jobs.pop(name, None) is not None:
+                self._write({"job": name, "done": True})
+
+    def pending_jobs(self) -> list[JournaledJob]:
+        """Return the submitted Batch API jobs whose results are not journaled."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        """Append and flush one line; the caller holds the lock."""
+        self._file.write(json.dumps(entry, separators=_COMPACT_SEPARATORS) + "\n")
+        self._file.flush()
+
+    def compact(self, keep: Iterable[tuple[str, str]] | None = None) -> int:
+        """Rewrite the journal with one entry per record and its pending jobs.
+
+        The new journal is written to a temporary file, synced and renamed
+        over the old one, so a crash during compaction leaves either journal
+        intact.
+
+        Args:
+            keep: Optional (record id, fingerprint) pairs to keep, in the
+                order to write them; other entries are dropped.
+
+        Returns:
+            Number of record entries in the compacted journal; pending jobs are
+            kept as well and not counted.
+        """
+        with self._lock:
+            if keep is None:
+                kept = dict(self._entries)
+            else:
+                kept = {}
+                for record_id, fingerprint in keep:
+                    entry = self._entries.get(record_id)
+                    if entry is not None and entry[0] == fingerprint:
+                        kept[record_id] = entry
+            descriptor, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                for record_id, (fingerprint, result) in kept.items():
+                    entry_line = {"id": record_id, "key": fingerprint, "result": result}
+                    f.write(json.dumps(entry_line, separators=_COMPACT_SEPARATORS) + "\n")
+                for job in self._jobs.values():
+                    f.write(json.dumps(job.to_dict(), separators=_COMPACT_SEPARATORS) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = self.path.open("a", encoding="utf-8")
+            self._entries = kept
+        logger.debug(f"Compacted {self.path} to {len(kept)} entries")
+        return len(kept)
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self) -> RunJournal:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,285 @@
+"""API key pool for spreading queries over several Gemini projects.
+
+Provides KeyPool, which hands out the least-loaded usable API key and keeps
+per-key throttling state, and KeyPoolTransport, an httpx transport that
+sets the key of every request. A key answered with HTTP 429 cools down for
+the server's retry delay and a key rejected as invalid or unauthorized is
+set aside for longer; in both cases the request is sent again at once with
+another usable key, so one exhausted project shifts its load to the others.
+
+Enable it with several keys in GEMINI_API_KEYS or GEMINI_API_KEYS_FILE, or
+through TransportOptions(key_pool=...).
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+API_KEY_HEADER = "x-goog-api-key"
+DEFAULT_THROTTLE_COOLDOWN = 30.0
+DEFAULT_AUTH_COOLDOWN = 600.0
+
+# Failure reasons, named like the QueryError reasons they would surface as
+REASON_RATE_LIMITED = "rate_limited"
+REASON_AUTH = "auth"
+
+# Google reports an unknown or malformed key as HTTP 400 with this reason
+_INVALID_KEY_MARKER = b"API_KEY_INVALID"
+_RETRY_DELAY = re.compile(rb'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"')
+
+
+def mask_key(key: str) -> str:
+    """Return a key shortened to its last four characters, for logs."""
+    return f"...{key[-4:]}"
+
+
+@dataclass(slots=True)
+class KeyState:
+    """Usage and throttling state of one API key.
+
+    Attributes:
+        key: The API key.
+        in_flight: Requests currently using the key.
+        requests: Requests sent with the key.
+        throttled: Responses with HTTP 429.
+        auth_failures: Responses rejecting the key.
+        unavailable_until: Monotonic time until which the key is set aside.
+    """
+
+    key: str
+    in_flight: int = 0
+    requests: int = 0
+    throttled: int = 0
+    auth_failures: int = 0
+    unavailable_until: float = 0.0
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        """Return the JSON-serializable state with the key masked."""
+        return {
+            "key": mask_key(self.key),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "auth_failures": self.auth_failures,
+            "cooldown_s": round(max(0.0, self.unavailable_until - now), 1),
+        }
+
+
+class KeyPool:
+    """Thread-safe pool of API keys with least-loaded selection.
+
+    acquire() returns the usable key with the fewest requests in flight, and
+    among those the one used least, so load is spread round-robin when
+    requests are sequential. When every key is set aside, the one available
+    soonest is returned and the API's answer decides what happens next.
+
+    Example:
+        >>> pool = KeyPool(["key-a", "key-b", "key-c"])
+        >>> client = get_client(TransportOptions(key_pool=pool))
+        >>> pool.stats()[0]["requests"]
+        0
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        throttle_cooldown: float = DEFAULT_THROTTLE_COOLDOWN,
+        auth_cooldown: float = DEFAULT_AUTH_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a pool.
+
+        Args:
+            keys: API keys; duplicates are ignored.
+            throttle_cooldown: Seconds a throttled key is set aside when the
+                API does not say how long to wait.
+            auth_cooldown: Seconds a rejected key is set aside.
+            clock: Monotonic clock in seconds (replaceable for tests).
+
+        Raises:
+            ValueError: If no keys are given or a cooldown is negative.
+        """
+        unique = list(dict.fromkeys(key for key in keys if key))
+        if not unique:
+            raise ValueError("KeyPool needs at least one API key")
+        if throttle_cooldown < 0 or auth_cooldown < 0:
+            raise ValueError("Key cooldowns must not be negative")
+        self.throttle_cooldown = throttle_cooldown
+        self.auth_cooldown = auth_cooldown
+        self._states = [KeyState(key) for key in unique]
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def acquire(self, exclude: Collection[str] = ()) -> str | None:
+        """Take the least-loaded key for a request.
+
+        Args:
+            exclude: Keys already tried for this request. When given, only a
+                key that is usable right now is returned.
+
+        Returns:
+            The key to use (release it afterwards), or None if exclude was
+            given and no other key is usable.
+        """
+        with self._lock:
+            now = self._clock()
+            candidates = [state for state in self._states if state.key not in exclude]
+            if not candidates:
+                return None
+            state = min(
+                candidates,
+                key=lambda s: (max(0.0, s.unavailable_until - now), s.in_flight, s.requests),
+            )
+            if exclude and state.unavailable_until > now:
+                return None
+            state.in_flight += 1
+            state.requests += 1
+            return state.key
+
+    def release(
+        self, key: str, reason: str | None = None, retry_after: float | None = None
+    ) -> None:
+        """Return a key after its request, recording how the API answered.
+
+        Args:
+            key: Key returned by acquire().
+            reason: None on success or any failure unrelated to the key,
+                "rate_limited" after HTTP 429, "auth" if the key was rejected.
+            retry_after: Seconds the API asked to wait (throttling only).
+        """
+        with self._lock:
+            state = next(s for s in self._states if s.key == key)
+            state.in_flight -= 1
+            if reason == REASON_RATE_LIMITED:
+                state.throttled += 1
+                cooldown = retry_after if retry_after is not None else self.throttle_cooldown
+                event = "was throttled"
+            elif reason == REASON_AUTH:
+                state.auth_failures += 1
+                cooldown = self.auth_cooldown
+                event = "was rejected"
+            else:
+                return
+            state.unavailable_until = max(state.unavailable_until, self._clock() + cooldown)
+        logger.warning(f"API key {mask_key(key)} {event}; setting it aside for {cooldown:.0f}s")
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Return the state of every key, with keys masked."""
+        with self._lock:
+            now = self._clock()
+            return [state.to_dict(now) for state in self._states]
+
+
+def _failure(response: httpx.Response) -> tuple[str | None, float | None]:
+    """Classify a read response as (reason, retry_after) for KeyPool.release()."""
+    status = response.status_code
+    if status == 429:
+        header = response.headers.get("retry-after", "")
+        if header.replace(".", "", 1).isdigit():
+            return REASON_RATE_LIMITED, float(header)
+        match = _RETRY_DELAY.search(response.content)
+        return REASON_RATE_LIMITED, float(match.group(1)) if match else None
+    if status in (401, 403) or (status == 400 and _INVALID_KEY_MARKER in response.content):
+        return REASON_AUTH, None
+    return None, None
+
+
+def _may_be_key_failure(response: httpx.Response) -> bool:
+    """Whether a response status can mean a throttled or rejected key."""
+    return response.status_code in (400, 401, 403, 429)
+
+
+class KeyPoolTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport that sends every request with a key from a KeyPool.
+
+    A request answered with HTTP 429 or a rejected key is sent again with
+    another usable key; once no other key is usable, the failure is returned
+    to the caller (and its retry policy) unchanged.
+    """
+
+    def __init__(
+        self,
+        pool: KeyPool,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Create a key-rotating transport.
+
+        Args:
+            pool: Pool providing the keys.
+            transport: Transport that sends sync requests.
+            async_transport: Transport that sends async requests.
+        """
+        self.pool = pool
+        self._transport = transport
+        self._async_transport = async_transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            raise RuntimeError("KeyPoolTransport has no sync transport")
+        request.read()
+        tried: list[str] = []
+        key = self.pool.acquire()
+        while True:
+            assert key is not None  # nosec B101 - the first acquire() always returns a key
+            request.headers[API_KEY_HEADER] = key
+            try:
+                response = self._transport.handle_request(request)
+                if _may_be_key_failure(response):
+                    response.read()
+            except BaseException:
+                self.pool.release(key)
+                raise
+            reason, retry_after = _failure(response)
+            self.pool.release(key, reason, retry_after)
+            tried.append(key)
+            key = self.pool.acquire(tried) if reason is not None else None
+            if key is None:
+                return response
+            response.close()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._async_transport is None:
+            raise RuntimeError("KeyPoolTransport has no async transport")
+        await request.aread()
+        tried: list[str] = []
+        key = self.pool.acquire()
+        while True:
+            assert key is not None  # nosec B101 - the first acquire() always returns a key
+            request.headers[API_KEY_HEADER] = key
+            try:
+                response = await self._async_transport.handle_async_request(request)
+                if _may_be_key_failure(response):
+                    await response.aread()
+            except BaseException:
+                self.pool.release(key)
+                raise
+            reason, retry_after = _failure(response)
+            self.pool.release(key, reason, retry_after)
+            tried.append(key)
+            key = self.pool.acquire(tried) if reason is not None else None
+            if key is None:
+                return response
+            await response.aclose()
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    async def aclose(self) -> None:
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
@@ -6,22 +6,89 @@ Note: This code was generated with assistance from AI coding tools
 and has been reviewed and tested by a human.
 """
 
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator, Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Protocol
+
+from gemini_google_maps_tool.core.geo import GeoGrid
+from gemini_google_maps_tool.core.ratelimit import RateLimiter, estimate_tokens, is_throttle_error
+from gemini_google_maps_tool.core.retry import NO_RETRY, RetryPolicy
+from gemini_google_maps_tool.core.tracing import (
+    PHASE_CONFIG,
+    PHASE_EXTRACT,
+    PHASE_GROUNDING,
+    PHASE_NETWORK,
+    PHASE_RATE_LIMIT,
+    SPAN_QUERY,
+    PhaseTimer,
+    QueryTimings,
+    Tracer,
+    set_span_attributes,
+)
+
+# The SDK takes most of a second to import, so it is only loaded once a query
+# is built; annotations refer to it through TYPE_CHECKING imports.
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+    from google.genai.client import AsyncClient
 
-from google import genai
-from google.genai import types
+    from gemini_google_maps_tool.core.costs import Budget
+    from gemini_google_maps_tool.core.metrics import QueryMetrics
+    from gemini_google_maps_tool.core.routing import ModelRouter
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "gemini-2.5-flash-lite"
+MODEL_ALIASES = {
+    "flash": "gemini-2.5-flash",
+    "flash-lite": "gemini-2.5-flash-lite",
+}
+# Pseudo model name that lets a ModelRouter pick the model per query
+MODEL_AUTO = "auto"
+DEFAULT_CONCURRENCY = 32
+
 
 class QueryError(Exception):
-    """Raised when a query operation fails."""
+    """Raised when a query operation fails.
 
-    pass
+    Attributes:
+        reason: Machine-readable failure cause, one of the REASON_* constants.
+        attempts: Number of attempts made before giving up.
+        timings: Per-phase timings of the failed query, summed over its
+            attempts (set when a query gives up).
+    """
 
+    REASON_NO_CANDIDATES = "no_candidates"
+    REASON_EMPTY_TEXT = "empty_text"
+    REASON_RATE_LIMITED = "rate_limited"
+    REASON_SERVER_ERROR = "server_error"
+    REASON_TIMEOUT = "timeout"
+    REASON_NETWORK = "network"
+    REASON_AUTH = "auth"
+    REASON_INVALID_ARGUMENT = "invalid_argument"
+    REASON_BUDGET_EXCEEDED = "budget_exceeded"
+    REASON_UNEXPECTED = "unexpected"
 
-@dataclass
+    def __init__(self, message: str, reason: str = REASON_UNEXPECTED) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.attempts = 1
+        self.timings: QueryTimings | None = None
+
+
+# Grounding types are immutable and slotted: batch runs can hold hundreds of
+# thousands of them, and immutability lets GroundingChunkPool share instances.
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class GroundingChunk:
     """Represents a single Google Maps source."""
 
@@ -29,8 +96,22 @@ class GroundingChunk:
     uri: str | None
     place_id: str | None
 
+    @property
+    def place_key(self) -> str | None:
+        """Identity of the place: its place id, else its URI, else its title."""
+        return self.place_id or self.uri or self.title
 
-@dataclass
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the source."""
+        return {"title": self.title, "uri": self.uri, "place_id": self.place_id}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GroundingChunk:
+        """Build a source from its to_dict() form."""
+        return cls(title=data.get("title"), uri=data.get("uri"), place_id=data.get("place_id"))
+
+
+@dataclass(frozen=True, slots=True)
 class GroundingSegment:
     """Represents a text segment linked to sources."""
 
@@ -38,16 +119,44 @@ class GroundingSegment:
     end_index: int | None
     text: str
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the segment."""
+        return {"start_index": self.start_index, "end_index": self.end_index, "text": self.text}
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GroundingSegment:
+        """Build a segment from its to_dict() form."""
+        return cls(
+            start_index=data.get("start_index"),
+            end_index=data.get("end_index"),
+            text=data.get("text") or "",
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class GroundingSupport:
     """Represents a text segment and its associated source indices."""
 
     segment: GroundingSegment
     grounding_chunk_indices: list[int]
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the support."""
+        return {
+            "segment": self.segment.to_dict(),
+            "grounding_chunk_indices": self.grounding_chunk_indices,
+        }
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GroundingSupport:
+        """Build a support from its to_dict() form."""
+        return cls(
+            segment=GroundingSegment.from_dict(data.get("segment") or {}),
+            grounding_chunk_indices=list(data.get("grounding_chunk_indices") or []),
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class GroundingMetadata:
     """Complete grounding metadata from a query response."""
 
@@ -55,18 +164,323 @@ class GroundingMetadata:
     grounding_supports: list[GroundingSupport]
     google_maps_widget_context_token: str | None
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the metadata.
 
-@dataclass
+        Empty sections are omitted, matching the `query` command's JSON output.
+        """
+        data: dict[str, Any] = {}
+        if self.grounding_chunks:
+            data["grounding_chunks"] = [chunk.to_dict() for chunk in self.grounding_chunks]
+        if self.grounding_supports:
+            data["grounding_supports"] = [support.to_dict() for support in self.grounding_supports]
+        if self.google_maps_widget_context_token:
+            data["google_maps_widget_context_token"] = self.google_maps_widget_context_token
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GroundingMetadata:
+        """Build metadata from its to_dict() form (missing sections are empty)."""
+        return cls(
+            grounding_chunks=[
+                GroundingChunk.from_dict(chunk) for chunk in data.get("grounding_chunks") or []
+            ],
+            grounding_supports=[
+                GroundingSupport.from_dict(support)
+                for support in data.get("grounding_supports") or []
+            ],
+            google_maps_widget_context_token=data.get("google_maps_widget_context_token"),
+        )
+
+
+class GroundingChunkPool:
+    """Interning pool that lets identical grounding chunks share one object.
+
+    Popular places appear in many results; interning stores each distinct
+    (title, uri, place_id) once. The pool only holds weak references, so a
+    chunk is released when no result uses it anymore. Thread-safe.
+
+    Example:
+        >>> pool = GroundingChunkPool()
+        >>> results = await query_many_async(client, requests, chunk_pool=pool)
+        >>> len(pool)  # distinct places across all results
+        42
+    """
+
+    def __init__(self) -> None:
+        """Create an empty pool."""
+        self._chunks: weakref.WeakValueDictionary[
+            tuple[str | None, str | None, str | None], GroundingChunk
+        ] = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def intern(self, chunk: GroundingChunk) -> GroundingChunk:
+        """Return the pooled chunk equal to `chunk`, adding it if new."""
+        key = (chunk.title, chunk.uri, chunk.place_id)
+        with self._lock:
+            pooled = self._chunks.get(key)
+            if pooled is None:
+                self._chunks[key] = chunk
+                return chunk
+            return pooled
+
+    def intern_result(self, result: MapsQueryResult) -> MapsQueryResult:
+        """Replace the grounding chunks of a result with pooled instances.
+
+        Args:
+            result: Result to compact; it is updated in place.
+
+        Returns:
+            The same result object, for chaining.
+        """
+        metadata = result.grounding_metadata
+        if metadata is not None and metadata.grounding_chunks:
+            result.grounding_metadata = replace(
+                metadata,
+                grounding_chunks=[self.intern(chunk) for chunk in metadata.grounding_chunks],
+            )
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class TokenUsage:
+    """Token counts reported by the API for one response.
+
+    Attributes:
+        prompt_tokens: Tokens in the prompt.
+        cached_tokens: Prompt tokens served from the context cache.
+        tool_use_prompt_tokens: Tokens added by the Google Maps tool results.
+        thoughts_tokens: Tokens spent on model reasoning.
+        output_tokens: Tokens in the generated candidates.
+        total_tokens: All tokens billed for the request.
+    """
+
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    tool_use_prompt_tokens: int = 0
+    thoughts_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+    @classmethod
+    def from_metadata(cls, usage: types.GenerateContentResponseUsageMetadata) -> TokenUsage:
+        """Build token usage from a response's usage_metadata (missing counts are 0)."""
+        return cls(
+            prompt_tokens=usage.prompt_token_count or 0,
+            cached_tokens=usage.cached_content_token_count or 0,
+            tool_use_prompt_tokens=usage.tool_use_prompt_token_count or 0,
+            thoughts_tokens=usage.thoughts_token_count or 0,
+            output_tokens=usage.candidates_token_count or 0,
+            total_tokens=usage.total_token_count or 0,
+        )
+
+    def __add__(self, other: TokenUsage) -> TokenUsage:
+        """Return the sum of two usages, for totals over several responses."""
+        return TokenUsage(
+            *(getattr(self, name) + getattr(other, name) for name in self.__dataclass_fields__)
+        )
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "tool_use_prompt_tokens": self.tool_use_prompt_tokens,
+            "thoughts_tokens": self.thoughts_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TokenUsage:
+        """Build token usage from its to_dict() form (missing counts are 0)."""
+        return cls(**{name: int(data.get(name) or 0) for name in cls.__dataclass_fields__})
+
+
+@dataclass(slots=True)
 class MapsQueryResult:
     """Result from a Google Maps grounded query.
 
     Attributes:
         response_text: The generated text response from the model.
         grounding_metadata: Optional grounding metadata with sources and citations.
+        from_cache: Whether the result was served from a response cache.
+        attempts: Number of API attempts needed (1 when the first one succeeded).
+        usage: Token usage reported by the API, if any.
+        timings: Per-phase timings of the query that produced the result.
+        model: Model that answered, which differs from the one requested
+            with model "auto" (see core.routing).
+
+    Caches keep neither usage, timings nor model, and all three are ignored
+    when comparing results.
     """
 
     response_text: str
     grounding_metadata: GroundingMetadata | None = None
+    from_cache: bool = False
+    attempts: int = 1
+    usage: TokenUsage | None = field(default=None, compare=False)
+    timings: QueryTimings | None = field(default=None, compare=False)
+    model: str | None = field(default=None, compare=False)
+
+    def to_dict(self, include_grounding: bool = True) -> dict[str, Any]:
+        """Return the JSON-serializable form of the result.
+
+        Only the response content is included; from_cache, attempts, usage,
+        timings and model describe how the result was obtained and are left to
+        the caller.
+
+        Args:
+            include_grounding: Whether to include grounding metadata (if not empty).
+
+        Returns:
+            Dictionary with response_text and, if present, grounding_metadata.
+        """
+        data: dict[str, Any] = {"response_text": self.response_text}
+        if include_grounding and self.grounding_metadata is not None:
+            grounding = self.grounding_metadata.to_dict()
+            if grounding:
+                data["grounding_metadata"] = grounding
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MapsQueryResult:
+        """Build a result from its to_dict() form.
+
+        Raises:
+            KeyError: If response_text is missing.
+        """
+        grounding = data.get("grounding_metadata")
+        return cls(
+            response_text=data["response_text"],
+            grounding_metadata=(
+                GroundingMetadata.from_dict(grounding) if grounding is not None else None
+            ),
+        )
+
+
+@dataclass
+class MapsQueryRequest:
+    """A single query to execute as part of a concurrent run.
+
+    Attributes:
+        query: The query text to send to the model.
+        lat_lon: Optional (latitude, longitude) tuple for location context.
+        model: Model name to use.
+        include_grounding: Whether to include grounding metadata in the result.
+    """
+
+    query: str
+    lat_lon: tuple[float, float] | None = None
+    model: str = DEFAULT_MODEL
+    include_grounding: bool = False
+
+
+@dataclass(frozen=True)
+class RequestKey:
+    """Normalized identity of a query, used as the cache key.
+
+    Attributes:
+        model: Full model name.
+        query: Query text with whitespace collapsed and case folded.
+        lat_lon: Optional (latitude, longitude) tuple, quantized when a grid is used.
+        include_grounding: Whether grounding metadata was requested.
+        origin: The unquantized location; not part of the key's identity.
+    """
+
+    model: str
+    query: str
+    lat_lon: tuple[float, float] | None
+    include_grounding: bool
+    origin: tuple[float, float] | None = field(default=None, compare=False)
+
+    @property
+    def digest(self) -> str:
+        """Stable SHA-256 hex digest of the key."""
+        payload = json.dumps(
+            [self.model, self.query, self.lat_lon, self.include_grounding],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def make_request_key(
+    query: str,
+    lat_lon: tuple[float, float] | None,
+    model: str,
+    include_grounding: bool,
+    grid: GeoGrid | None = None,
+) -> RequestKey:
+    """Build a normalized cache key for a query.
+
+    Args:
+        query: The query text.
+        lat_lon: Optional (latitude, longitude) tuple.
+        model: Full model name.
+        include_grounding: Whether grounding metadata is requested.
+        grid: Optional geohash grid; locations are snapped to their cell center
+            so nearby requests share a key.
+
+    Returns:
+        RequestKey that compares equal for equivalent requests.
+
+    Example:
+        >>> make_request_key("Coffee  near me", None, "gemini-2.5-flash-lite", False)
+        RequestKey(model='gemini-2.5-flash-lite', query='coffee near me', ...)
+    """
+    normalized = " ".join(query.split()).casefold()
+    key_lat_lon = grid.quantize(lat_lon) if grid is not None and lat_lon else lat_lon
+    return RequestKey(
+        model=model,
+        query=normalized,
+        lat_lon=key_lat_lon,
+        include_grounding=include_grounding,
+        origin=lat_lon,
+    )
+
+
+class ResultCache(Protocol):
+    """Interface for caches that query_maps() can consult.
+
+    Implementations decide how requests are normalized into keys and how
+    failures are remembered; see core.cache.ResponseCache.
+    """
+
+    def key_for(
+        self,
+        query: str,
+        lat_lon: tuple[float, float] | None,
+        model: str,
+        include_grounding: bool,
+    ) -> RequestKey:
+        """Build the cache key for a request."""
+        ...
+
+    def get(self, key: RequestKey) -> MapsQueryResult | None:
+        """Return a cached result or None; may raise a cached QueryError."""
+        ...
+
+    def put(self, key: RequestKey, result: MapsQueryResult) -> None:
+        """Store a successful result."""
+        ...
+
+    def put_error(self, key: RequestKey, error: QueryError) -> None:
+        """Store a failure if the cache considers it cacheable."""
+        ...
+
+    def get_or_compute(
+        self, key: RequestKey, compute: Callable[[], MapsQueryResult]
+    ) -> MapsQueryResult:
+        """Return the cached result, computing and storing it on a miss."""
+        ...
+
+    async def get_or_compute_async(
+        self, key: RequestKey, compute: Callable[[], Awaitable[MapsQueryResult]]
+    ) -> MapsQueryResult:
+        """Async get_or_compute(); must not block the event loop."""
+        ...
 
 
 def parse_lat_lon(lat_lon_str: str) -> tuple[float, float]:
@@ -119,6 +533,22 @@ def parse_lat_lon(lat_lon_str: str) -> tuple[float, float]:
     return (lat, lon)
 
 
+def resolve_model_name(model: str) -> str:
+    """Map a short model alias to its full Gemini model name.
+
+    Args:
+        model: Alias ("flash", "flash-lite") or full model name.
+
+    Returns:
+        Full model name; unknown names (including "auto") are returned unchanged.
+
+    Example:
+        >>> resolve_model_name("flash")
+        'gemini-2.5-flash'
+    """
+    return MODEL_ALIASES.get(model.lower(), model)
+
+
 def extract_grounding_metadata(
     response: types.GenerateContentResponse,
 ) -> GroundingMetadata | None:
@@ -193,12 +623,353 @@ def extract_grounding_metadata(
     )
 
 
+def build_config(lat_lon: tuple[float, float] | None) -> types.GenerateContentConfig:
+    """Build the request config with the Google Maps tool and optional location.
+
+    Args:
+        lat_lon: Optional (latitude, longitude) tuple for location context.
+
+    Returns:
+        GenerateContentConfig ready to pass to generate_content. It is not
+        modified by queries, so it can be reused (see MapsSession).
+    """
+    from google.genai import types
+
+    # Build Google Maps tool
+    logger.debug("Building Google Maps tool configuration")
+    google_maps_tool = types.Tool(google_maps=types.GoogleMaps())
+
+    # Build config
+    config = types.GenerateContentConfig(tools=[google_maps_tool])
+
+    # Add location context if provided
+    if lat_lon:
+        lat, lon = lat_lon
+        logger.debug(f"Adding location context: lat={lat}, lon={lon}")
+        lat_lng = types.LatLng(latitude=lat, longitude=lon)
+        config.tool_config = types.ToolConfig(
+            retrieval_config=types.RetrievalConfig(lat_lng=lat_lng)
+        )
+    else:
+        logger.debug("No location context provided")
+
+    return config
+
+
+def _parse_response(
+    response: types.GenerateContentResponse, include_grounding: bool, timer: PhaseTimer
+) -> MapsQueryResult:
+    """Validate a Gemini response and convert it into a MapsQueryResult.
+
+    Args:
+        response: The GenerateContentResponse from Gemini API.
+        include_grounding: Whether to extract grounding metadata.
+        timer: Timer recording the extraction phases.
+
+    Returns:
+        MapsQueryResult with response text and optional grounding metadata.
+
+    Raises:
+        QueryError: If the response has no candidates or no text.
+    """
+    with timer.phase(PHASE_EXTRACT):
+        response_text = _extract_text(response)
+
+    # Extract grounding metadata if requested
+    grounding_metadata = None
+    if include_grounding:
+        logger.debug("Extracting grounding metadata")
+        with timer.phase(PHASE_GROUNDING):
+            grounding_metadata = extract_grounding_metadata(response)
+        if grounding_metadata:
+            chunk_count = len(grounding_metadata.grounding_chunks)
+            logger.debug(f"Found {chunk_count} grounding chunks (sources)")
+        else:
+            logger.debug("No grounding metadata found in response")
+
+    usage = response.usage_metadata
+    return MapsQueryResult(
+        response_text=response_text,
+        grounding_metadata=grounding_metadata,
+        usage=TokenUsage.from_metadata(usage) if usage is not None else None,
+    )
+
+
+def result_from_response(
+    response: types.GenerateContentResponse, include_grounding: bool = False
+) -> MapsQueryResult:
+    """Convert a response obtained outside query_maps() into a MapsQueryResult.
+
+    Used for responses of batch jobs (see core.batchjob), which are not
+    timed per query.
+
+    Args:
+        response: A generateContent response to a Maps-grounded request.
+        include_grounding: Whether to extract grounding metadata.
+
+    Returns:
+        MapsQueryResult with response text, grounding metadata if requested
+        and token usage.
+
+    Raises:
+        QueryError: If the response has no candidates or no text.
+    """
+    return _parse_response(response, include_grounding, PhaseTimer())
+
+
+def _extract_text(response: types.GenerateContentResponse) -> str:
+    """Return the text of the first candidate of a response.
+
+    Raises:
+        QueryError: If the response has no candidates or no text.
+    """
+    # Check if response has candidates
+    candidate_count = len(response.candidates) if response.candidates else 0
+    logger.debug(f"Validating response: candidates count = {candidate_count}")
+    if not response.candidates or len(response.candidates) == 0:
+        logger.error("API returned no response candidates")
+        raise QueryError(
+            "API returned no response candidates. This may be due to:\n"
+            "  - Rate limiting (too many requests)\n"
+            "  - API service issues\n"
+            "  - Query content filtering\n"
+            "  - Invalid query format\n"
+            "Suggestions:\n"
+            "  - Wait a few seconds and try again\n"
+            "  - Rephrase your query\n"
+            "  - Check your API key has sufficient quota",
+            reason=QueryError.REASON_NO_CANDIDATES,
+        )
+
+    # Extract response text
+    logger.debug("Extracting response text from candidate")
+    response_text = ""
+    candidate = response.candidates[0]
+    if candidate.content and candidate.content.parts:
+        text_parts: list[str] = []
+        for part in candidate.content.parts:
+            if hasattr(part, "text") and part.text:
+                text_parts.append(part.text)
+        response_text = "".join(text_parts)
+    logger.debug(f"Extracted response text length: {len(response_text)}")
+
+    # Check if we got empty response text
+    if not response_text:
+        logger.error("API returned empty response text")
+        raise QueryError(
+            "API returned empty response text. This may be due to:\n"
+            "  - Content filtering or safety blocks\n"
+            "  - Query processing issues\n"
+            "  - Incomplete API response\n"
+            "Suggestions:\n"
+            "  - Rephrase your query\n"
+            "  - Try a simpler or more specific query\n"
+            "  - Wait a few seconds and try again",
+            reason=QueryError.REASON_EMPTY_TEXT,
+        )
+    return response_text
+
+
+# Headline and suggestions for each classified failure
+_ERROR_GUIDANCE: dict[str, tuple[str, tuple[str, ...]]] = {
+    QueryError.REASON_RATE_LIMITED: (
+        "API rate limit or quota exceeded",
+        (
+            "Wait a few seconds and try again",
+            "Lower the request rate with --rpm/--tpm",
+            "Check your API key has sufficient quota",
+        ),
+    ),
+    QueryError.REASON_SERVER_ERROR: (
+        "Gemini API server error",
+        ("Wait a few seconds and try again", "Check the Gemini API status page"),
+    ),
+    QueryError.REASON_TIMEOUT: (
+        "Request to Gemini API timed out",
+        ("Wait a few seconds and try again", "Check your internet connection"),
+    ),
+    QueryError.REASON_NETWORK: (
+        "Could not reach Gemini API",
+        ("Check your internet connection", "Wait a few seconds and try again"),
+    ),
+    QueryError.REASON_AUTH: (
+        "Gemini API rejected the credentials",
+        ("Verify your API key is valid", "Check the key has access to the Gemini API"),
+    ),
+    QueryError.REASON_INVALID_ARGUMENT: (
+        "Gemini API rejected the request",
+        ("Check the model name", "Try a different query"),
+    ),
+}
+
+
+def classify_exception(e: BaseException) -> str:
+    """Map an exception raised while querying to a QueryError reason.
+
+    Args:
+        e: Exception raised by the Gemini SDK or HTTP transport.
+
+    Returns:
+        One of the QueryError.REASON_* constants.
+    """
+    import httpx
+    from google.genai import errors as genai_errors
+
+    if is_throttle_error(e):
+        return QueryError.REASON_RATE_LIMITED
+    if isinstance(e, genai_errors.APIError):
+        if e.code >= 500:
+            return QueryError.REASON_SERVER_ERROR
+        if e.code in (401, 403):
+            return QueryError.REASON_AUTH
+        if e.code in (408, 504):
+            return QueryError.REASON_TIMEOUT
+        if 400 <= e.code < 500:
+            return QueryError.REASON_INVALID_ARGUMENT
+    if isinstance(e, httpx.TimeoutException | TimeoutError):
+        return QueryError.REASON_TIMEOUT
+    if isinstance(e, httpx.TransportError | ConnectionError):
+        return QueryError.REASON_NETWORK
+    return QueryError.REASON_UNEXPECTED
+
+
+def _unexpected_error(e: Exception) -> QueryError:
+    """Wrap an SDK or transport exception in an agent-friendly QueryError.
+
+    Args:
+        e: The exception raised while querying.
+
+    Returns:
+        QueryError with a classified reason, to be raised by the caller.
+    """
+    reason = classify_exception(e)
+    headline, suggestions = _ERROR_GUIDANCE.get(
+        reason,
+        (
+            "Unexpected error during query",
+            (
+                "Wait a few seconds and try again",
+                "Check your internet connection",
+                "Verify your API key is valid",
+                "Try a different query",
+            ),
+        ),
+    )
+    logger.error(f"{headline}: {type(e).__name__}: {str(e)}")
+    logger.debug("Full traceback:", exc_info=True)
+    lines = "".join(f"\n  - {suggestion}" for suggestion in suggestions)
+    return QueryError(f"{headline}: {str(e)}\nSuggestions:{lines}", reason=reason)
+
+
+def _total_tokens(response: types.GenerateContentResponse) -> int | None:
+    """Return the total token count reported in a response, if any."""
+    usage = response.usage_metadata
+    return usage.total_token_count if usage is not None else None
+
+
+def _query_span_attributes(model: str, include_grounding: bool) -> dict[str, str | bool]:
+    """Attributes of the span covering a whole query."""
+    return {"gemini_maps.model": model, "gemini_maps.include_grounding": include_grounding}
+
+
+def _result_span_attributes(result: MapsQueryResult) -> dict[str, int]:
+    """Attributes describing a completed query, set on its span."""
+    attributes = {"gemini_maps.attempts": result.attempts}
+    if result.usage is not None:
+        attributes["gemini_maps.prompt_tokens"] = result.usage.prompt_tokens
+        attributes["gemini_maps.output_tokens"] = result.usage.output_tokens
+        attributes["gemini_maps.total_tokens"] = result.usage.total_tokens
+    return attributes
+
+
+def _route(router: ModelRouter | None) -> ModelRouter:
+    """Return the router for a query with model "auto"."""
+    if router is not None:
+        return router
+    # Imported here because core.routing builds on this module
+    from gemini_google_maps_tool.core.routing import DEFAULT_ROUTER
+
+    return DEFAULT_ROUTER
+
+
+def _without_grounding(result: MapsQueryResult, include_grounding: bool) -> MapsQueryResult:
+    """Drop the grounding metadata a routed query fetched to check for sources."""
+    if include_grounding or result.grounding_metadata is None:
+        return result
+    return replace(result, grounding_metadata=None)
+
+
+def _log_query_start(query: str, model: str) -> None:
+    """Log the model and (truncated) query text at DEBUG level."""
+    logger.debug(f"Starting Maps query with model: {model}")
+    logger.debug(f"Query text: {query[:100]}..." if len(query) > 100 else f"Query text: {query}")
+
+
+def _query_maps_once(
+    client: genai.Client,
+    query: str,
+    lat_lon: tuple[float, float] | None,
+    model: str,
+    include_grounding: bool,
+    rate_limiter: RateLimiter | None,
+    config: types.GenerateContentConfig | None,
+    timer: PhaseTimer,
+) -> MapsQueryResult:
+    """Execute a single query attempt (see query_maps())."""
+    try:
+        _log_query_start(query, model)
+        if config is None:
+            with timer.phase(PHASE_CONFIG):
+                config = build_config(lat_lon)
+
+        estimated_tokens = 0
+        if rate_limiter is not None:
+            estimated_tokens = estimate_tokens(query)
+            with timer.phase(PHASE_RATE_LIMIT):
+                rate_limiter.acquire(estimated_tokens)
+
+        # Generate content
+        logger.debug(f"Calling Gemini API with model: {model}")
+        with timer.phase(PHASE_NETWORK):
+            response = client.models.generate_content(
+                model=model,
+                contents=query,
+                config=config,
+            )
+        logger.debug("Received response from Gemini API")
+
+        if rate_limiter is not None:
+            rate_limiter.settle(estimated_tokens, _total_tokens(response))
+
+        result = _parse_response(response, include_grounding, timer)
+        logger.debug("Query completed successfully")
+        return result
+
+    except QueryError:
+        # Re-raise QueryErrors with our detailed messages
+        raise
+    except Exception as e:
+        if rate_limiter is not None and is_throttle_error(e):
+            rate_limiter.on_throttle()
+        # Catch unexpected errors and provide agent-friendly message
+        raise _unexpected_error(e) from e
+
+
 def query_maps(
     client: genai.Client,
     query: str,
     lat_lon: tuple[float, float] | None = None,
-    model: str = "gemini-2.5-flash-lite",
+    model: str = DEFAULT_MODEL,
     include_grounding: bool = False,
+    *,
+    cache: ResultCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    config: types.GenerateContentConfig | None = None,
+    tracer: Tracer | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+    router: ModelRouter | None = None,
 ) -> MapsQueryResult:
     """Query Gemini with Google Maps grounding.
 
@@ -206,14 +977,29 @@ def query_maps(
         client: Initialized Gemini API client.
         query: The query text to send to the model.
         lat_lon: Optional (latitude, longitude) tuple for location context.
-        model: Model name to use (default: "gemini-2.5-flash-lite").
+        model: Model name to use (default: "gemini-2.5-flash-lite"), or "auto"
+            to let the router choose per query.
         include_grounding: Whether to include grounding metadata in response.
+        cache: Optional result cache consulted before calling the API.
+        rate_limiter: Optional limiter that paces requests to stay within quota.
+        retry: Optional retry policy for transient failures (default: one attempt).
+        config: Optional prebuilt request config (see MapsSession); built from
+            lat_lon when omitted.
+        tracer: Optional tracer receiving a span for the query and each of
+            its phases (see core.tracing).
+        metrics: Optional metrics recording the query's outcome, latency and
+            token usage (see core.metrics).
+        budget: Optional budget checked before every API attempt and charged
+            with the usage of the result (see core.costs).
+        router: Router used with model "auto" (default: a shared ModelRouter).
 
     Returns:
-        MapsQueryResult with response text and optional grounding metadata.
+        MapsQueryResult with response text, grounding metadata if requested,
+        token usage and per-phase timings.
 
     Raises:
-        QueryError: If the API query fails.
+        QueryError: If the API query fails (after any retries), or with reason
+            "budget_exceeded" if the budget is exhausted.
 
     Example:
         >>> from gemini_google_maps_tool.core import get_client, query_maps
@@ -229,111 +1015,687 @@ def query_maps(
         ...     for chunk in result.grounding_metadata.grounding_chunks:
         ...         print(f"Source: {chunk.title} - {chunk.uri}")
     """
-    try:
-        logger.debug(f"Starting Maps query with model: {model}")
-        logger.debug(
-            f"Query text: {query[:100]}..." if len(query) > 100 else f"Query text: {query}"
+    if model == MODEL_AUTO:
+        result = _route(router).query(
+            lambda routed_model, routed_retry: query_maps(
+                client,
+                query,
+                lat_lon,
+                routed_model,
+                True,
+                cache=cache,
+                rate_limiter=rate_limiter,
+                retry=routed_retry,
+                config=config,
+                tracer=tracer,
+                metrics=metrics,
+                budget=budget,
+            ),
+            query,
+            retry,
         )
+        return _without_grounding(result, include_grounding)
 
-        # Build Google Maps tool
-        logger.debug("Building Google Maps tool configuration")
-        google_maps_tool = types.Tool(google_maps=types.GoogleMaps())
+    if metrics is not None:
+        with metrics.track(model, cached=cache is not None) as observation:
+            result = query_maps(
+                client,
+                query,
+                lat_lon,
+                model,
+                include_grounding,
+                cache=cache,
+                rate_limiter=rate_limiter,
+                retry=retry,
+                config=config,
+                tracer=tracer,
+                budget=budget,
+            )
+            observation.result = result
+        return result
 
-        # Build config
-        config = types.GenerateContentConfig(tools=[google_maps_tool])
+    if cache is not None:
+        key = cache.key_for(query, lat_lon, model, include_grounding)
+        return cache.get_or_compute(
+            key,
+            lambda: query_maps(
+                client,
+                query,
+                lat_lon,
+                model,
+                include_grounding,
+                rate_limiter=rate_limiter,
+                retry=retry,
+                config=config,
+                tracer=tracer,
+                budget=budget,
+            ),
+        )
 
-        # Add location context if provided
-        if lat_lon:
-            lat, lon = lat_lon
-            logger.debug(f"Adding location context: lat={lat}, lon={lon}")
-            lat_lng = types.LatLng(latitude=lat, longitude=lon)
-            config.tool_config = types.ToolConfig(
-                retrieval_config=types.RetrievalConfig(lat_lng=lat_lng)
-            )
-        else:
-            logger.debug("No location context provided")
+    policy = retry or NO_RETRY
+    timer = PhaseTimer(tracer)
+    started = time.monotonic()
+    attempt = 1
+    with timer.span(SPAN_QUERY, _query_span_attributes(model, include_grounding)) as span:
+        while True:
+            try:
+                if budget is not None:
+                    budget.check()
+                result = _query_maps_once(
+                    client, query, lat_lon, model, include_grounding, rate_limiter, config, timer
+                )
+                if budget is not None:
+                    budget.record(model, result)
+                result.attempts = attempt
+                result.model = model
+                result.timings = timer.finish()
+                set_span_attributes(span, _result_span_attributes(result))
+                return result
+            except QueryError as e:
+                e.attempts = attempt
+                delay = policy.next_delay(e.reason, attempt, time.monotonic() - started)
+                if delay is None:
+                    e.timings = timer.finish()
+                    raise
+                logger.warning(f"Attempt {attempt} failed ({e.reason}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
 
-        # Generate content
-        logger.debug(f"Calling Gemini API with model: {model}")
-        response = client.models.generate_content(
+
+def _chunk_text(chunk: types.GenerateContentResponse) -> str:
+    """Concatenate the text parts of the first candidate of a response chunk."""
+    if not chunk.candidates:
+        return ""
+    content = chunk.candidates[0].content
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text)
+
+
+class MapsQueryStream:
+    """Iterator over the text of a streaming grounded query.
+
+    Yields response text chunks as the model produces them. Once iteration
+    is complete, `result` holds the assembled MapsQueryResult, including the
+    grounding metadata that only arrives with the final chunks.
+
+    Failures raise QueryError from iteration. Transient failures are retried
+    according to the retry policy only while no text has been yielded yet.
+
+    Example:
+        >>> stream = query_maps_stream(client, "Coffee in Delft", include_grounding=True)
+        >>> for text in stream:
+        ...     print(text, end="", flush=True)
+        >>> stream.result.grounding_metadata
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[[PhaseTimer], Iterator[types.GenerateContentResponse]],
+        query: str,
+        include_grounding: bool,
+        rate_limiter: RateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        tracer: Tracer | None = None,
+        metrics: QueryMetrics | None = None,
+        model: str = DEFAULT_MODEL,
+        budget: Budget | None = None,
+    ) -> None:
+        """Create a stream; no request is sent until iteration starts.
+
+        Args:
+            open_stream: Callable that issues the request and returns its chunks,
+                timing the config construction with the given timer.
+            query: The query text, used for rate limiter token estimates.
+            include_grounding: Whether to extract grounding metadata.
+            rate_limiter: Optional limiter that paces requests to stay within quota.
+            retry: Optional retry policy for failures before the first chunk.
+            tracer: Optional tracer receiving a span for each non-streaming phase.
+            metrics: Optional metrics recording the outcome of the stream.
+            model: Model name, used as the metrics label and for pricing.
+            budget: Optional budget checked before every attempt.
+        """
+        self._open_stream = open_stream
+        self._query = query
+        self._include_grounding = include_grounding
+        self._rate_limiter = rate_limiter
+        self._retry = retry or NO_RETRY
+        self._tracer = tracer
+        self._metrics = metrics
+        self._model = model
+        self._budget = budget
+        self._result: MapsQueryResult | None = None
+        self._texts = self._generate()
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        return next(self._texts)
+
+    @property
+    def result(self) -> MapsQueryResult:
+        """The complete result, available once the stream is exhausted.
+
+        Raises:
+            RuntimeError: If the stream has not been fully consumed.
+        """
+        if self._result is None:
+            raise RuntimeError("Stream has not been fully consumed")
+        return self._result
+
+    def _generate(self) -> Iterator[str]:
+        """Yield text chunks, recording metrics for the whole stream if requested."""
+        if self._metrics is None:
+            yield from self._generate_with_retries()
+            return
+        with self._metrics.track(self._model) as observation:
+            yield from self._generate_with_retries()
+            observation.result = self._result
+
+    def _generate_with_retries(self) -> Iterator[str]:
+        """Yield text chunks, retrying failures that happen before any text."""
+        timer = PhaseTimer(self._tracer)
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            text_parts: list[str] = []
+            try:
+                if self._budget is not None:
+                    self._budget.check()
+                result = yield from self._attempt(text_parts, timer)
+                if self._budget is not None:
+                    self._budget.record(self._model, result)
+                result.attempts = attempt
+                result.model = self._model
+                result.timings = timer.finish()
+                self._result = result
+                return
+            except QueryError as e:
+                e.attempts = attempt
+                delay = None
+                if not text_parts:
+                    delay = self._retry.next_delay(e.reason, attempt, time.monotonic() - started)
+                if delay is None:
+                    e.timings = timer.finish()
+                    raise
+                logger.warning(f"Attempt {attempt} failed ({e.reason}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def _attempt(
+        self, text_parts: list[str], timer: PhaseTimer
+    ) -> Generator[str, None, MapsQueryResult]:
+        """Run one streaming request, collecting its text into text_parts.
+
+        The network phase is timed without a span: spans must not stay open
+        across yields, where the consumer's code runs.
+        """
+        rate_limiter = self._rate_limiter
+        try:
+            estimated_tokens = 0
+            if rate_limiter is not None:
+                estimated_tokens = estimate_tokens(self._query)
+                with timer.phase(PHASE_RATE_LIMIT):
+                    rate_limiter.acquire(estimated_tokens)
+
+            grounding: types.GroundingMetadata | None = None
+            usage: types.GenerateContentResponseUsageMetadata | None = None
+            saw_candidates = False
+            chunks = self._open_stream(timer)
+            network_started = time.perf_counter()
+            for chunk in chunks:
+                usage = chunk.usage_metadata or usage
+                if chunk.candidates:
+                    saw_candidates = True
+                    grounding = chunk.candidates[0].grounding_metadata or grounding
+                text = _chunk_text(chunk)
+                if text:
+                    if not text_parts:
+                        logger.debug("Received first chunk from Gemini API")
+                        timer.mark_first_chunk()
+                    text_parts.append(text)
+                    yield text
+            timer.add(PHASE_NETWORK, time.perf_counter() - network_started)
+            logger.debug(f"Stream completed after {len(text_parts)} text chunks")
+        except QueryError:
+            raise
+        except Exception as e:
+            if rate_limiter is not None and is_throttle_error(e):
+                rate_limiter.on_throttle()
+            raise _unexpected_error(e) from e
+
+        # Reassemble the chunks into one response so it is validated and
+        # parsed exactly like a non-streaming response
+        from google.genai import types
+
+        candidates = None
+        if saw_candidates:
+            content = types.Content(role="model", parts=[types.Part(text="".join(text_parts))])
+            candidates = [types.Candidate(content=content, grounding_metadata=grounding)]
+        response = types.GenerateContentResponse(candidates=candidates, usage_metadata=usage)
+        if rate_limiter is not None:
+            rate_limiter.settle(estimated_tokens, _total_tokens(response))
+        return _parse_response(response, self._include_grounding, timer)
+
+
+def query_maps_stream(
+    client: genai.Client,
+    query: str,
+    lat_lon: tuple[float, float] | None = None,
+    model: str = DEFAULT_MODEL,
+    include_grounding: bool = False,
+    *,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    config: types.GenerateContentConfig | None = None,
+    tracer: Tracer | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+    router: ModelRouter | None = None,
+) -> MapsQueryStream:
+    """Query Gemini with Google Maps grounding, streaming the response text.
+
+    Uses generate_content_stream so text can be shown as soon as the model
+    produces it instead of after the full completion.
+
+    Args:
+        client: Initialized Gemini API client.
+        query: The query text to send to the model.
+        lat_lon: Optional (latitude, longitude) tuple for location context.
+        model: Model name to use (default: "gemini-2.5-flash-lite"), or "auto"
+            to let the router choose; streamed answers are never escalated,
+            since their text has already been shown.
+        include_grounding: Whether to include grounding metadata in the result.
+        rate_limiter: Optional limiter that paces requests to stay within quota.
+        retry: Optional retry policy for failures before the first chunk.
+        config: Optional prebuilt request config (see MapsSession); built from
+            lat_lon when omitted.
+        tracer: Optional tracer receiving spans for the phases that do not
+            span a yield (config, rate limiting and extraction).
+        metrics: Optional metrics recording the outcome of the stream.
+        budget: Optional budget checked before every attempt and charged with
+            the usage of the result (see core.costs).
+        router: Router used with model "auto" (default: a shared ModelRouter).
+
+    Returns:
+        MapsQueryStream yielding text chunks; its `result` is available after
+        iteration completes.
+
+    Example:
+        >>> stream = query_maps_stream(client, "Best ramen in Tokyo")
+        >>> for text in stream:
+        ...     print(text, end="", flush=True)
+        >>> print(stream.result.response_text)
+    """
+    if model == MODEL_AUTO:
+        model = _route(router).choose(query)
+
+    def open_stream(timer: PhaseTimer) -> Iterator[types.GenerateContentResponse]:
+        _log_query_start(query, model)
+        request_config = config
+        if request_config is None:
+            with timer.phase(PHASE_CONFIG):
+                request_config = build_config(lat_lon)
+        logger.debug(f"Calling Gemini API (streaming) with model: {model}")
+        return client.models.generate_content_stream(
             model=model,
             contents=query,
-            config=config,
+            config=request_config,
         )
-        logger.debug("Received response from Gemini API")
 
-        # Check if response has candidates
-        candidate_count = len(response.candidates) if response.candidates else 0
-        logger.debug(f"Validating response: candidates count = {candidate_count}")
-        if not response.candidates or len(response.candidates) == 0:
-            logger.error("API returned no response candidates")
-            raise QueryError(
-                "API returned no response candidates. This may be due to:\n"
-                "  - Rate limiting (too many requests)\n"
-                "  - API service issues\n"
-                "  - Query content filtering\n"
-                "  - Invalid query format\n"
-                "Suggestions:\n"
-                "  - Wait a few seconds and try again\n"
-                "  - Rephrase your query\n"
-                "  - Check your API key has sufficient quota"
-            )
+    return MapsQueryStream(
+        open_stream, query, include_grounding, rate_limiter, retry, tracer, metrics, model, budget
+    )
 
-        # Extract response text
-        logger.debug("Extracting response text from candidate")
-        response_text = ""
-        candidate = response.candidates[0]
-        if candidate.content and candidate.content.parts:
-            text_parts: list[str] = []
-            for part in candidate.content.parts:
-                if hasattr(part, "text") and part.text:
-                    text_parts.append(part.text)
-            response_text = "".join(text_parts)
-        logger.debug(f"Extracted response text length: {len(response_text)}")
-
-        # Check if we got empty response text
-        if not response_text:
-            logger.error("API returned empty response text")
-            raise QueryError(
-                "API returned empty response text. This may be due to:\n"
-                "  - Content filtering or safety blocks\n"
-                "  - Query processing issues\n"
-                "  - Incomplete API response\n"
-                "Suggestions:\n"
-                "  - Rephrase your query\n"
-                "  - Try a simpler or more specific query\n"
-                "  - Wait a few seconds and try again"
+
+async def _query_maps_once_async(
+    client: AsyncClient,
+    query: str,
+    lat_lon: tuple[float, float] | None,
+    model: str,
+    include_grounding: bool,
+    rate_limiter: RateLimiter | None,
+    config: types.GenerateContentConfig | None,
+    timer: PhaseTimer,
+) -> MapsQueryResult:
+    """Execute a single async query attempt (see query_maps_async())."""
+    try:
+        _log_query_start(query, model)
+        if config is None:
+            with timer.phase(PHASE_CONFIG):
+                config = build_config(lat_lon)
+
+        estimated_tokens = 0
+        if rate_limiter is not None:
+            estimated_tokens = estimate_tokens(query)
+            with timer.phase(PHASE_RATE_LIMIT):
+                await rate_limiter.acquire_async(estimated_tokens)
+
+        logger.debug(f"Calling Gemini API (async) with model: {model}")
+        with timer.phase(PHASE_NETWORK):
+            response = await client.models.generate_content(
+                model=model,
+                contents=query,
+                config=config,
             )
+        logger.debug("Received response from Gemini API")
 
-        # Extract grounding metadata if requested
-        grounding_metadata = None
-        if include_grounding:
-            logger.debug("Extracting grounding metadata")
-            grounding_metadata = extract_grounding_metadata(response)
-            if grounding_metadata:
-                chunk_count = len(grounding_metadata.grounding_chunks)
-                logger.debug(f"Found {chunk_count} grounding chunks (sources)")
-            else:
-                logger.debug("No grounding metadata found in response")
+        if rate_limiter is not None:
+            await rate_limiter.settle_async(estimated_tokens, _total_tokens(response))
 
+        result = _parse_response(response, include_grounding, timer)
         logger.debug("Query completed successfully")
-        return MapsQueryResult(
-            response_text=response_text,
-            grounding_metadata=grounding_metadata,
-        )
+        return result
 
     except QueryError:
-        # Re-raise QueryErrors with our detailed messages
         raise
     except Exception as e:
-        # Catch unexpected errors and provide agent-friendly message
-        logger.error(f"Unexpected error during query: {type(e).__name__}: {str(e)}")
-        logger.debug("Full traceback:", exc_info=True)
-        raise QueryError(
-            f"Unexpected error during query: {str(e)}\n"
-            "Suggestions:\n"
-            "  - Wait a few seconds and try again\n"
-            "  - Check your internet connection\n"
-            "  - Verify your API key is valid\n"
-            "  - Try a different query"
-        ) from e
+        if rate_limiter is not None and is_throttle_error(e):
+            await rate_limiter.on_throttle_async()
+        raise _unexpected_error(e) from e
+
+
+async def query_maps_async(
+    client: AsyncClient,
+    query: str,
+    lat_lon: tuple[float, float] | None = None,
+    model: str = DEFAULT_MODEL,
+    include_grounding: bool = False,
+    *,
+    cache: ResultCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    config: types.GenerateContentConfig | None = None,
+    tracer: Tracer | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+    router: ModelRouter | None = None,
+) -> MapsQueryResult:
+    """Query Gemini with Google Maps grounding without blocking the event loop.
+
+    Async counterpart of query_maps() that uses the SDK's native async client,
+    so many queries can be in flight on a single event loop.
+
+    Args:
+        client: Async Gemini API client (see get_async_client()).
+        query: The query text to send to the model.
+        lat_lon: Optional (latitude, longitude) tuple for location context.
+        model: Model name to use (default: "gemini-2.5-flash-lite"), or "auto"
+            to let the router choose per query.
+        include_grounding: Whether to include grounding metadata in response.
+        cache: Optional result cache consulted before calling the API.
+        rate_limiter: Optional limiter that paces requests to stay within quota.
+        retry: Optional retry policy for transient failures (default: one attempt).
+        config: Optional prebuilt request config (see MapsSession); built from
+            lat_lon when omitted.
+        tracer: Optional tracer receiving a span for the query and each of
+            its phases (see core.tracing).
+        metrics: Optional metrics recording the query's outcome, latency and
+            token usage (see core.metrics).
+        budget: Optional budget checked before every API attempt and charged
+            with the usage of the result (see core.costs).
+        router: Router used with model "auto" (default: a shared ModelRouter).
+
+    Returns:
+        MapsQueryResult with response text, grounding metadata if requested,
+        token usage and per-phase timings.
+
+    Raises:
+        QueryError: If the API query fails (after any retries), or with reason
+            "budget_exceeded" if the budget is exhausted.
+
+    Example:
+        >>> from gemini_google_maps_tool.core import get_async_client, query_maps_async
+        >>> client = get_async_client()
+        >>> result = await query_maps_async(client, "Best coffee shops near me")
+        >>> print(result.response_text)
+    """
+    if model == MODEL_AUTO:
+
+        async def run(routed_model: str, routed_retry: RetryPolicy | None) -> MapsQueryResult:
+            return await query_maps_async(
+                client,
+                query,
+                lat_lon,
+                routed_model,
+                True,
+                cache=cache,
+                rate_limiter=rate_limiter,
+                retry=routed_retry,
+                config=config,
+                tracer=tracer,
+                metrics=metrics,
+                budget=budget,
+            )
+
+        result = await _route(router).query_async(run, query, retry)
+        return _without_grounding(result, include_grounding)
+
+    if metrics is not None:
+        with metrics.track(model, cached=cache is not None) as observation:
+            result = await query_maps_async(
+                client,
+                query,
+                lat_lon,
+                model,
+                include_grounding,
+                cache=cache,
+                rate_limiter=rate_limiter,
+                retry=retry,
+                config=config,
+                tracer=tracer,
+                budget=budget,
+            )
+            observation.result = result
+        return result
+
+    if cache is not None:
+        key = cache.key_for(query, lat_lon, model, include_grounding)
+        return await cache.get_or_compute_async(
+            key,
+            lambda: query_maps_async(
+                client,
+                query,
+                lat_lon,
+                model,
+                include_grounding,
+                rate_limiter=rate_limiter,
+                retry=retry,
+                config=config,
+                tracer=tracer,
+                budget=budget,
+            ),
+        )
+
+    policy = retry or NO_RETRY
+    timer = PhaseTimer(tracer)
+    started = time.monotonic()
+    attempt = 1
+    with timer.span(SPAN_QUERY, _query_span_attributes(model, include_grounding)) as span:
+        while True:
+            try:
+                if budget is not None:
+                    budget.check()
+                result = await _query_maps_once_async(
+                    client, query, lat_lon, model, include_grounding, rate_limiter, config, timer
+                )
+                if budget is not None:
+                    budget.record(model, result)
+                result.attempts = attempt
+                result.model = model
+                result.timings = timer.finish()
+                set_span_attributes(span, _result_span_attributes(result))
+                return result
+            except QueryError as e:
+                e.attempts = attempt
+                delay = policy.next_delay(e.reason, attempt, time.monotonic() - started)
+                if delay is None:
+                    e.timings = timer.finish()
+                    raise
+                logger.warning(f"Attempt {attempt} failed ({e.reason}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+async def query_many_as_completed(
+    client: AsyncClient,
+    requests: Iterable[MapsQueryRequest],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    *,
+    cache: ResultCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    chunk_pool: GroundingChunkPool | None = None,
+    tracer: Tracer | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+    router: ModelRouter | None = None,
+) -> AsyncIterator[tuple[int, MapsQueryResult | QueryError]]:
+    """Run many queries concurrently and yield results as they complete.
+
+    A fixed pool of worker tasks pulls requests from the (possibly lazy)
+    iterable and completed results wait in a queue of the same size, so
+    memory stays bounded by the concurrency level rather than by the number
+    of requests, even when the consumer is slow.
+
+    Args:
+        client: Async Gemini API client (see get_async_client()).
+        requests: Requests to execute.
+        concurrency: Maximum number of queries in flight at once.
+        cache: Optional result cache shared by all queries.
+        rate_limiter: Optional limiter shared by all queries.
+        retry: Optional retry policy applied to each query.
+        chunk_pool: Optional pool that interns grounding chunks across results.
+        tracer: Optional tracer receiving spans for every query.
+        metrics: Optional metrics shared by all queries.
+        budget: Optional budget shared by all queries; once it is exhausted the
+            remaining requests fail with reason "budget_exceeded" without
+            being sent, while results already completed are still yielded.
+        router: Router shared by all requests with model "auto".
+
+    Yields:
+        Tuples of (request index, result), exactly one per request. Failed
+        queries yield their QueryError instead of raising, so one failure
+        never aborts the run; unexpected exceptions (from a cache, for
+        example) are wrapped in a QueryError as well.
+
+    Raises:
+        ValueError: If concurrency is less than 1.
+
+    Example:
+        >>> requests = [MapsQueryRequest(query=q) for q in queries]
+        >>> async for index, outcome in query_many_as_completed(client, requests, 64):
+        ...     print(index, outcome)
+    """
+    if concurrency < 1:
+        raise ValueError(f"Invalid concurrency: {concurrency}. Concurrency must be at least 1")
+
+    pending = enumerate(requests)
+    done: asyncio.Queue[tuple[int, MapsQueryResult | QueryError] | None] = asyncio.Queue(
+        maxsize=concurrency
+    )
+
+    async def worker() -> None:
+        try:
+            # Iterators are shared between workers; next() never awaits, so
+            # each request is handed out exactly once.
+            for index, request in pending:
+                outcome: MapsQueryResult | QueryError
+                try:
+                    outcome = await query_maps_async(
+                        client,
+                        request.query,
+                        lat_lon=request.lat_lon,
+                        model=request.model,
+                        include_grounding=request.include_grounding,
+                        cache=cache,
+                        rate_limiter=rate_limiter,
+                        retry=retry,
+                        tracer=tracer,
+                        metrics=metrics,
+                        budget=budget,
+                        router=router,
+                    )
+                    if chunk_pool is not None:
+                        chunk_pool.intern_result(outcome)
+                except QueryError as e:
+                    outcome = e
+                except Exception as e:
+                    outcome = _unexpected_error(e)
+                await done.put((index, outcome))
+        finally:
+            # A cancelled worker has no consumer left, and must not block on a full queue
+            task = asyncio.current_task()
+            if task is None or not task.cancelling():
+                await done.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            item = await done.get()
+            if item is None:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def query_many_async(
+    client: AsyncClient,
+    requests: Iterable[MapsQueryRequest],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    *,
+    cache: ResultCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    chunk_pool: GroundingChunkPool | None = None,
+    tracer: Tracer | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+    router: ModelRouter | None = None,
+) -> list[MapsQueryResult | QueryError]:
+    """Run many queries concurrently and return results in input order.
+
+    Args:
+        client: Async Gemini API client (see get_async_client()).
+        requests: Requests to execute.
+        concurrency: Maximum number of queries in flight at once.
+        cache: Optional result cache shared by all queries.
+        rate_limiter: Optional limiter shared by all queries.
+        retry: Optional retry policy applied to each query.
+        chunk_pool: Optional pool that interns grounding chunks across results.
+        tracer: Optional tracer receiving spans for every query.
+        metrics: Optional metrics shared by all queries.
+        budget: Optional budget shared by all queries; once it is exhausted the
+            remaining requests fail with reason "budget_exceeded" without
+            being sent, while results already completed are still yielded.
+        router: Router shared by all requests with model "auto".
+
+    Returns:
+        One entry per request, in input order: a MapsQueryResult on success
+        or the QueryError that the query raised.
+
+    Example:
+        >>> results = asyncio.run(query_many_async(client, requests, concurrency=100))
+    """
+    outcomes: dict[int, MapsQueryResult | QueryError] = {}
+    async for index, outcome in query_many_as_completed(
+        client,
+        requests,
+        concurrency,
+        cache=cache,
+        rate_limiter=rate_limiter,
+        retry=retry,
+        chunk_pool=chunk_pool,
+        tracer=tracer,
+        metrics=metrics,
+        budget=budget,
+        router=router,
+    ):
+        outcomes[index] = outcome
+    return [outcomes[index] for index in range(len(outcomes))]
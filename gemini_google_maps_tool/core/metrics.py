@@ -0,0 +1,434 @@
+"""In-process metrics with Prometheus text format export.
+
+Provides a small, dependency-free metrics registry (counters, gauges and
+histograms with labels) and QueryMetrics, the standard set of query
+metrics: requests and errors by cause, latency and response size
+histograms, per-phase durations, token counts, cache hits and in-flight
+requests.
+
+The registry renders the Prometheus text exposition format, so a run can
+dump it to a file for node_exporter's textfile collector, and the query
+daemon serves it on GET /metrics.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import abc
+import math
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from gemini_google_maps_tool.core.maps import MapsQueryResult, QueryError
+from gemini_google_maps_tool.core.tracing import (
+    PHASE_CONFIG,
+    PHASE_EXTRACT,
+    PHASE_GROUNDING,
+    PHASE_NETWORK,
+    PHASE_RATE_LIMIT,
+)
+
+METRIC_PREFIX = "gemini_maps_"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the latency buckets in seconds (grounded queries take ~1-10 s)
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds of the response size buckets in bytes
+DEFAULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value; integral values are written without a fraction."""
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric(abc.ABC):
+    """A named metric family with a fixed set of label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} takes labels {list(self.labelnames)}, got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def _samples(self) -> Iterator[str]:
+        """Yield the sample lines of the family."""
+
+    def render(self) -> str:
+        """Return the metric family in Prometheus text format."""
+        header = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        return "\n".join([*header, *self._samples()]) + "\n"
+
+
+class Counter(_Metric):
+    """A monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add a non-negative amount to the counter.
+
+        Raises:
+            ValueError: If amount is negative or the labels do not match.
+        """
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease (got {amount})")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current value for a label set (0 if never incremented)."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """A value per label set that can go up and down."""
+
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+@dataclass
+class _HistogramState:
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+class Histogram(_Metric):
+    """Counts of observations in cumulative buckets, plus their sum and count."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        """Create a histogram.
+
+        Raises:
+            ValueError: If buckets is empty or not strictly increasing.
+        """
+        super().__init__(name, documentation, labelnames)
+        bounds = [float(bound) for bound in buckets]
+        if not bounds or any(a >= b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError(f"Histogram {name} needs strictly increasing buckets")
+        if not math.isinf(bounds[-1]):
+            bounds.append(math.inf)
+        self.buckets = tuple(bounds)
+        self._states: dict[LabelValues, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _HistogramState(counts=[0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state.counts[i] += 1
+                    break
+            state.total += value
+            state.count += 1
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._states.get(key)
+            return state.count if state is not None else 0
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            states = sorted(
+                (key, list(state.counts), state.total, state.count)
+                for key, state in self._states.items()
+            )
+        names = (*self.labelnames, "le")
+        for key, counts, total, count in states:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """Thread-safe collection of metrics, rendered in registration order.
+
+    Registering a name twice returns the existing metric, so independent
+    components can share one registry.
+
+    Example:
+        >>> registry = MetricsRegistry()
+        >>> registry.counter("jobs_total", "Jobs run.", ["status"]).inc(status="ok")
+        >>> print(registry.render())
+        # HELP jobs_total Jobs run.
+        # TYPE jobs_total counter
+        jobs_total{status="ok"} 1
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} is already registered differently")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter with this name, registering it on first use."""
+        metric = self._register(Counter(name, documentation, labelnames))
+        assert isinstance(metric, Counter)  # nosec B101 - checked by _register
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Return the gauge with this name, registering it on first use."""
+        metric = self._register(Gauge(name, documentation, labelnames))
+        assert isinstance(metric, Gauge)  # nosec B101 - checked by _register
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram with this name, registering it on first use."""
+        metric = self._register(Histogram(name, documentation, labelnames, buckets))
+        assert isinstance(metric, Histogram)  # nosec B101 - checked by _register
+        return metric
+
+    def render(self) -> str:
+        """Return all metrics in Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+    def write(self, path: str | Path) -> None:
+        """Write all metrics to a file atomically.
+
+        The file is replaced with a rename, so a collector never reads a
+        partially written file.
+
+        Args:
+            path: Destination, e.g. a *.prom file in the textfile collector directory.
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, target)
+
+
+@dataclass
+class QueryObservation:
+    """Outcome of a tracked query; set result before the tracked block ends."""
+
+    result: MapsQueryResult | None = None
+
+
+class QueryMetrics:
+    """The standard query metrics, recorded by query_maps(metrics=...).
+
+    Metrics (all prefixed with gemini_maps_):
+        requests_total{model, outcome}: Queries by outcome (success or error).
+        errors_total{model, reason}: Failed queries by QueryError reason.
+        retries_total{model}: Attempts beyond the first one.
+        cache_requests_total{model, result}: Queries run with a cache, by
+            whether the cache (hit) or the API (miss) answered.
+        request_duration_seconds{model}: Query latency, including retries.
+        phase_duration_seconds{phase}: Time per query phase (see QueryTimings).
+        response_size_bytes{model}: Size of the response text.
+        tokens_total{model, kind}: Tokens reported by the API.
+        in_flight_requests: Queries currently running.
+
+    Example:
+        >>> metrics = QueryMetrics()
+        >>> result = query_maps(client, "Coffee in Delft", metrics=metrics)
+        >>> metrics.registry.write("/var/lib/node_exporter/gemini_maps.prom")
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        """Register the query metrics.
+
+        Args:
+            registry: Registry to register in (default: a new one).
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        p = METRIC_PREFIX
+        self.requests = self.registry.counter(
+            f"{p}requests_total", "Grounded queries by outcome.", ["model", "outcome"]
+        )
+        self.errors = self.registry.counter(
+            f"{p}errors_total", "Failed grounded queries by cause.", ["model", "reason"]
+        )
+        self.retries = self.registry.counter(
+            f"{p}retries_total", "Query attempts beyond the first one.", ["model"]
+        )
+        self.cache_requests = self.registry.counter(
+            f"{p}cache_requests_total",
+            "Cached queries answered from the cache (hit) or by the API (miss).",
+            ["model", "result"],
+        )
+        self.latency = self.registry.histogram(
+            f"{p}request_duration_seconds", "Query latency including retries.", ["model"]
+        )
+        self.phases = self.registry.histogram(
+            f"{p}phase_duration_seconds", "Time spent per query phase.", ["phase"]
+        )
+        self.response_size = self.registry.histogram(
+            f"{p}response_size_bytes",
+            "Size of the response text in bytes.",
+            ["model"],
+            DEFAULT_SIZE_BUCKETS,
+        )
+        self.tokens = self.registry.counter(
+            f"{p}tokens_total", "Tokens reported by the API.", ["model", "kind"]
+        )
+        self.in_flight = self.registry.gauge(f"{p}in_flight_requests", "Queries currently running.")
+        self.in_flight.set(0)
+
+    @contextmanager
+    def track(self, model: str, cached: bool = False) -> Iterator[QueryObservation]:
+        """Track one query: in-flight count, latency and outcome.
+
+        A QueryError raised inside the block is counted by its reason and
+        re-raised. Other exceptions are counted as "unexpected".
+
+        Args:
+            model: Model name, used as a label.
+            cached: Whether the query runs with a result cache.
+
+        Yields:
+            Observation whose result the block sets on success.
+        """
+        observation = QueryObservation()
+        started = time.perf_counter()
+        self.in_flight.inc()
+        try:
+            yield observation
+        except Exception as e:
+            self.requests.inc(model=model, outcome="error")
+            if isinstance(e, QueryError):
+                self.errors.inc(model=model, reason=e.reason)
+                self.retries.inc(e.attempts - 1, model=model)
+            else:
+                self.errors.inc(model=model, reason=QueryError.REASON_UNEXPECTED)
+            raise
+        else:
+            if observation.result is not None:
+                seconds = time.perf_counter() - started
+                self.observe(model, observation.result, seconds, cached)
+        finally:
+            self.in_flight.dec()
+
+    def observe(
+        self, model: str, result: MapsQueryResult, seconds: float, cached: bool = False
+    ) -> None:
+        """Record a successful query.
+
+        Args:
+            model: Model name, used as a label.
+            result: The query result.
+            seconds: Query latency.
+            cached: Whether the query ran with a result cache.
+        """
+        self.requests.inc(model=model, outcome="success")
+        self.latency.observe(seconds, model=model)
+        self.response_size.observe(len(result.response_text.encode()), model=model)
+        if cached:
+            self.cache_requests.inc(model=model, result="hit" if result.from_cache else "miss")
+        if result.from_cache:
+            return
+        self.retries.inc(result.attempts - 1, model=model)
+        timings = result.timings
+        if timings is not None:
+            for phase, milliseconds in (
+                (PHASE_CONFIG, timings.config_ms),
+                (PHASE_RATE_LIMIT, timings.rate_limit_ms),
+                (PHASE_NETWORK, timings.network_ms),
+                (PHASE_EXTRACT, timings.extract_ms),
+                (PHASE_GROUNDING, timings.grounding_ms),
+            ):
+                self.phases.observe(milliseconds / 1000, phase=phase)
+        if result.usage is not None:
+            for kind, count in result.usage.to_dict().items():
+                if count:
+                    self.tokens.inc(count, model=model, kind=kind.removesuffix("_tokens"))
@@ -0,0 +1,411 @@
+"""Local index of places seen in grounded query results.
+
+Provides a persistent SQLite index that accumulates the grounding chunks
+(place id, title and Maps URI) of every indexed query, together with the
+query text and location that surfaced them, so follow-up lookups such as
+"what was the URI for that bakery?" are answered locally without another
+API call. Names and query texts are searched with SQLite FTS5 full-text
+search, with a difflib-based fuzzy fallback for misspelled names.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import difflib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from gemini_google_maps_tool.core.maps import GroundingChunk, MapsQueryResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_LIMIT = 10
+DEFAULT_FUZZY_CUTOFF = 0.75
+PLACES_DB_ENV_VAR = "GEMINI_MAPS_PLACES_DB"
+
+# Number of distinct recent queries kept searchable and reported per place
+MAX_QUERIES_PER_PLACE = 20
+MAX_REPORTED_QUERIES = 5
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def default_index_path() -> Path:
+    """Return the place index path ($GEMINI_MAPS_PLACES_DB, else the user data dir)."""
+    configured = os.environ.get(PLACES_DB_ENV_VAR)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(Path.home(), ".local", "share")
+    return Path(base) / "gemini-google-maps-tool" / "places.sqlite3"
+
+
+def _fuzzy_score(needle: str, title: str) -> float:
+    """Similarity between a search string and a title, from 0 to 1.
+
+    Takes the better of the whole-string ratio and the mean best per-word
+    ratio, so "bakry jansen" still matches "Bakkerij Jansen".
+    """
+    title = title.lower()
+    whole = difflib.SequenceMatcher(None, needle, title).ratio()
+    needle_words = _TOKEN_PATTERN.findall(needle)
+    title_words = _TOKEN_PATTERN.findall(title)
+    if not needle_words or not title_words:
+        return whole
+    per_word = sum(
+        max(difflib.SequenceMatcher(None, word, candidate).ratio() for candidate in title_words)
+        for word in needle_words
+    ) / len(needle_words)
+    return max(whole, per_word)
+
+
+@dataclass(frozen=True, slots=True)
+class PlaceRecord:
+    """A place in the local index.
+
+    Attributes:
+        place_id: Google Maps place id (None if the source had none).
+        title: Place name.
+        uri: Google Maps URI.
+        seen_count: Number of indexed results that cited the place.
+        first_seen: Unix time the place was first indexed.
+        last_seen: Unix time the place was last indexed.
+        queries: Distinct query texts that surfaced the place, most recent first.
+        last_lat_lon: Location context of the most recent such query, if any.
+    """
+
+    place_id: str | None
+    title: str | None
+    uri: str | None
+    seen_count: int
+    first_seen: float
+    last_seen: float
+    queries: tuple[str, ...]
+    last_lat_lon: tuple[float, float] | None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the place."""
+        return {
+            "place_id": self.place_id,
+            "title": self.title,
+            "uri": self.uri,
+            "seen_count": self.seen_count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "queries": list(self.queries),
+            "last_lat_lon": list(self.last_lat_lon) if self.last_lat_lon else None,
+        }
+
+
+class PlaceIndex:
+    """Persistent SQLite index of places from grounded query results.
+
+    Safe to share between threads; multiple processes may use the same
+    database file concurrently (SQLite handles file locking).
+
+    Example:
+        >>> index = PlaceIndex()
+        >>> result = query_maps(client, "Bakeries in Utrecht", include_grounding=True)
+        >>> index.add_result(result, "Bakeries in Utrecht")
+        >>> index.search("bakkerij")[0].uri
+        'https://maps.google.com/?cid=...'
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Open (and create if needed) the index database.
+
+        Args:
+            path: Database file path (default: default_index_path()).
+        """
+        self.path = Path(path) if path is not None else default_index_path()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        logger.debug(f"Opening place index at {self.path}")
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS places ("
+                " id INTEGER PRIMARY KEY,"
+                " place_key TEXT NOT NULL UNIQUE,"
+                " place_id TEXT,"
+                " title TEXT,"
+                " uri TEXT,"
+                " seen_count INTEGER NOT NULL,"
+                " first_seen REAL NOT NULL,"
+                " last_seen REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sightings ("
+                " place INTEGER NOT NULL REFERENCES places(id),"
+                " query TEXT NOT NULL,"
+                " lat REAL,"
+                " lon REAL,"
+                " model TEXT,"
+                " seen_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sightings_place ON sightings(place, seen_at)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_places_id ON places(place_id)")
+            try:
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5("
+                    "title, queries, tokenize='unicode61 remove_diacritics 2')"
+                )
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                # SQLite builds without FTS5 fall back to substring matching
+                logger.debug(f"FTS5 unavailable, using LIKE search: {e}")
+                self.fts = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM places").fetchone()
+        return int(count)
+
+    def add(
+        self,
+        chunks: Iterable[GroundingChunk],
+        query: str,
+        lat_lon: tuple[float, float] | None = None,
+        model: str | None = None,
+    ) -> int:
+        """Index grounding chunks surfaced by one query.
+
+        Args:
+            chunks: Grounding chunks from the query result.
+            query: The query text that produced them.
+            lat_lon: Optional location context of the query.
+            model: Optional model name that answered the query.
+
+        Returns:
+            Number of distinct places indexed.
+        """
+        now = time.time()
+        lat, lon = lat_lon if lat_lon is not None else (None, None)
+        unique: dict[str, GroundingChunk] = {}
+        for chunk in chunks:
+            key = chunk.place_key
+            if key is not None:
+                unique.setdefault(key, chunk)
+
+        with self._lock, self._conn:
+            for key, chunk in unique.items():
+                row = self._conn.execute(
+                    "SELECT id FROM places WHERE place_key = ?", (key,)
+                ).fetchone()
+                place: int
+                if row is None:
+                    cursor = self._conn.execute(
+                        "INSERT INTO places"
+                        " (place_key, place_id, title, uri, seen_count, first_seen, last_seen)"
+                        " VALUES (?, ?, ?, ?, 1, ?, ?)",
+                        (key, chunk.place_id, chunk.title, chunk.uri, now, now),
+                    )
+                    assert cursor.lastrowid is not None
+                    place = cursor.lastrowid
+                else:
+                    (place,) = row
+                    # Keep the latest non-empty title and URI (names do change)
+                    self._conn.execute(
+                        "UPDATE places SET title = COALESCE(?, title), uri = COALESCE(?, uri),"
+                        " seen_count = seen_count + 1, last_seen = ? WHERE id = ?",
+                        (chunk.title, chunk.uri, now, place),
+                    )
+
+                updated = self._conn.execute(
+                    "UPDATE sightings SET seen_at = ?, model = ?"
+                    " WHERE place = ? AND query = ? AND lat IS ? AND lon IS ?",
+                    (now, model, place, query, lat, lon),
+                ).rowcount
+                if not updated:
+                    self._conn.execute(
+                        "INSERT INTO sightings (place, query, lat, lon, model, seen_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (place, query, lat, lon, model, now),
+                    )
+                if self.fts:
+                    self._refresh_fts(place)
+
+        logger.debug(f"Indexed {len(unique)} places for query {query!r}")
+        return len(unique)
+
+    def add_result(
+        self,
+        result: MapsQueryResult,
+        query: str,
+        lat_lon: tuple[float, float] | None = None,
+        model: str | None = None,
+    ) -> int:
+        """Index the grounding chunks of a query result (see add()).
+
+        Results without grounding metadata are ignored.
+
+        Returns:
+            Number of distinct places indexed.
+        """
+        if result.grounding_metadata is None:
+            return 0
+        return self.add(result.grounding_metadata.grounding_chunks, query, lat_lon, model)
+
+    def get(self, place_id: str) -> PlaceRecord | None:
+        """Look up a place by its Google Maps place id.
+
+        Args:
+            place_id: Place id, e.g. "ChIJ...".
+
+        Returns:
+            The indexed place, or None if it was never seen.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM places WHERE place_id = ? LIMIT 1", (place_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._records([row[0]])[0]
+
+    def search(
+        self, text: str, limit: int = DEFAULT_SEARCH_LIMIT, fuzzy: bool = True
+    ) -> list[PlaceRecord]:
+        """Search places by name or by the text of the queries that surfaced them.
+
+        Every word must match a word prefix in the title or a query text;
+        title matches rank first. When nothing matches and fuzzy is enabled,
+        titles similar to the search text are returned instead.
+
+        Args:
+            text: Search text, e.g. "bakkerij utrecht".
+            limit: Maximum number of places returned.
+            fuzzy: Fall back to fuzzy title matching when nothing matches.
+
+        Returns:
+            Matching places, best match first.
+        """
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            return []
+
+        with self._lock:
+            if self.fts:
+                expression = " ".join(f'"{token}"*' for token in tokens)
+                rows = self._conn.execute(
+                    "SELECT rowid FROM places_fts WHERE places_fts MATCH ?"
+                    " ORDER BY bm25(places_fts, 10.0, 1.0) LIMIT ?",
+                    (expression, limit),
+                ).fetchall()
+            else:
+                clauses = " AND ".join(
+                    "(p.title LIKE ? OR EXISTS (SELECT 1 FROM sightings s"
+                    " WHERE s.place = p.id AND s.query LIKE ?))"
+                    for _ in tokens
+                )
+                patterns = [f"%{token}%" for token in tokens for _ in range(2)]
+                rows = self._conn.execute(
+                    f"SELECT p.id FROM places p WHERE {clauses}"  # nosec B608
+                    " ORDER BY p.last_seen DESC LIMIT ?",
+                    (*patterns, limit),
+                ).fetchall()
+
+            if not rows and fuzzy:
+                logger.debug(f"No full-text match for {text!r}, trying fuzzy match")
+                needle = " ".join(tokens)
+                scored = [
+                    (_fuzzy_score(needle, title), place)
+                    for place, title in self._conn.execute(
+                        "SELECT id, title FROM places WHERE title IS NOT NULL"
+                    )
+                ]
+                scored = [item for item in scored if item[0] >= DEFAULT_FUZZY_CUTOFF]
+                scored.sort(key=lambda item: item[0], reverse=True)
+                rows = [(place,) for _, place in scored[:limit]]
+
+            return self._records([place for (place,) in rows])
+
+    def recent(self, limit: int = DEFAULT_SEARCH_LIMIT) -> list[PlaceRecord]:
+        """Return the most recently seen places.
+
+        Args:
+            limit: Maximum number of places returned.
+
+        Returns:
+            Places ordered by last_seen, newest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM places ORDER BY last_seen DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+            return self._records([place for (place,) in rows])
+
+    def clear(self) -> None:
+        """Remove all indexed places."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sightings")
+            self._conn.execute("DELETE FROM places")
+            if self.fts:
+                self._conn.execute("DELETE FROM places_fts")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _refresh_fts(self, place: int) -> None:
+        """Rewrite a place's full-text row from its title and recent queries."""
+        (title,) = self._conn.execute("SELECT title FROM places WHERE id = ?", (place,)).fetchone()
+        queries = [
+            query
+            for (query,) in self._conn.execute(
+                "SELECT query FROM sightings WHERE place = ?"
+                " GROUP BY query ORDER BY MAX(seen_at) DESC LIMIT ?",
+                (place, MAX_QUERIES_PER_PLACE),
+            )
+        ]
+        self._conn.execute("DELETE FROM places_fts WHERE rowid = ?", (place,))
+        self._conn.execute(
+            "INSERT INTO places_fts (rowid, title, queries) VALUES (?, ?, ?)",
+            (place, title or "", "\n".join(queries)),
+        )
+
+    def _records(self, places: list[int]) -> list[PlaceRecord]:
+        """Load PlaceRecords for place row ids, preserving order; lock must be held."""
+        records: list[PlaceRecord] = []
+        for place in places:
+            row = self._conn.execute(
+                "SELECT place_id, title, uri, seen_count, first_seen, last_seen"
+                " FROM places WHERE id = ?",
+                (place,),
+            ).fetchone()
+            if row is None:
+                continue
+            sightings = self._conn.execute(
+                "SELECT query, lat, lon FROM sightings WHERE place = ? ORDER BY seen_at DESC",
+                (place,),
+            ).fetchall()
+            queries = tuple(dict.fromkeys(query for query, _, _ in sightings))
+            last_lat_lon = None
+            if sightings and sightings[0][1] is not None and sightings[0][2] is not None:
+                last_lat_lon = (sightings[0][1], sightings[0][2])
+            place_id, title, uri, seen_count, first_seen, last_seen = row
+            records.append(
+                PlaceRecord(
+                    place_id=place_id,
+                    title=title,
+                    uri=uri,
+                    seen_count=seen_count,
+                    first_seen=first_seen,
+                    last_seen=last_seen,
+                    queries=queries[:MAX_REPORTED_QUERIES],
+                    last_lat_lon=last_lat_lon,
+                )
+            )
+        return records
@@ -0,0 +1,259 @@
+"""Client-side rate limiting for Gemini API requests.
+
+Provides a token-bucket limiter with requests-per-minute and
+tokens-per-minute budgets. It is thread-safe, can share its state between
+processes on one host through a locked state file, and adapts its rate
+downwards when the API signals throttling (HTTP 429).
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPECTED_OUTPUT_TOKENS = 1000
+DEFAULT_BURST_SECONDS = 5.0
+MIN_RATE_FACTOR = 0.05
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_STEP = 0.02
+
+
+def default_state_path() -> Path:
+    """Return the default shared limiter state file under the user cache directory."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "gemini-google-maps-tool" / "ratelimit.json"
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Return whether an exception means the API is throttling requests.
+
+    Args:
+        error: Exception raised by the Gemini SDK.
+
+    Returns:
+        True for HTTP 429 / RESOURCE_EXHAUSTED errors.
+    """
+    from google.genai import errors as genai_errors
+
+    if isinstance(error, genai_errors.APIError):
+        return error.code == 429 or error.status == "RESOURCE_EXHAUSTED"
+    return False
+
+
+def estimate_tokens(
+    query: str, expected_output_tokens: int = DEFAULT_EXPECTED_OUTPUT_TOKENS
+) -> int:
+    """Estimate the tokens a query will consume before it is sent.
+
+    Uses ~4 characters per prompt token plus a fixed allowance for the
+    response and grounding tool tokens; RateLimiter.settle() corrects the
+    estimate once the real usage is known.
+
+    Args:
+        query: The query text.
+        expected_output_tokens: Allowance for response and tool tokens.
+
+    Returns:
+        Estimated total token count.
+    """
+    return len(query) // 4 + 1 + expected_output_tokens
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests and tokens per minute.
+
+    Each call reserves one request and an estimated number of tokens; if a
+    bucket is short, the caller waits until it refills. Throttling signals
+    halve the effective rate and successful requests slowly restore it
+    (additive increase, multiplicative decrease).
+
+    With a state_path, bucket state lives in a JSON file guarded by an
+    exclusive file lock, so all processes using the same path share one
+    budget. Without it, the budget is shared by all threads of the process.
+
+    Example:
+        >>> limiter = RateLimiter(rpm=150, tpm=1_000_000)
+        >>> result = query_maps(client, "Coffee in Delft", rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        state_path: str | Path | None = None,
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+    ) -> None:
+        """Create a limiter.
+
+        Args:
+            rpm: Requests per minute (None for no request limit).
+            tpm: Tokens per minute (None for no token limit).
+            state_path: Optional file for sharing state between processes.
+            burst_seconds: Bucket capacity expressed in seconds of budget.
+
+        Raises:
+            ValueError: If a limit or burst_seconds is not positive.
+        """
+        for name, value in (("rpm", rpm), ("tpm", tpm), ("burst_seconds", burst_seconds)):
+            if value is not None and value <= 0:
+                raise ValueError(f"Invalid {name}: {value}. Must be greater than 0")
+        self.rpm = rpm
+        self.tpm = tpm
+        self.burst_seconds = burst_seconds
+        self.state_path = Path(state_path) if state_path is not None else None
+        self._lock = threading.Lock()
+        self._state: dict[str, Any] = {}
+        if self.state_path is not None:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:
+                logger.warning(
+                    "File locking unavailable; rate limit is not shared between processes"
+                )
+
+    @property
+    def rate_factor(self) -> float:
+        """Current adaptive multiplier applied to the configured rates (0-1]."""
+        with self._locked_state() as state:
+            return float(state.get("factor", 1.0))
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request and `tokens` tokens.
+
+        Reservations always succeed; buckets may go negative, and the
+        returned delay is how long the caller must wait before sending.
+
+        Args:
+            tokens: Estimated tokens the request will consume.
+
+        Returns:
+            Seconds to wait before issuing the request.
+        """
+        now = time.time()
+        with self._locked_state() as state:
+            factor = float(state.get("factor", 1.0))
+            delay = 0.0
+            for bucket, limit, cost in (("requests", self.rpm, 1), ("tokens", self.tpm, tokens)):
+                if limit is None:
+                    continue
+                rate = limit * factor / 60
+                capacity = max(float(cost), rate * self.burst_seconds)
+                level = self._refill(state, bucket, rate, capacity, now) - cost
+                state[bucket] = {"level": level, "updated": now}
+                if level < 0:
+                    delay = max(delay, -level / rate)
+        if delay > 0:
+            logger.debug(f"Rate limiter delaying request by {delay:.2f}s")
+        return delay
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until a request with `tokens` estimated tokens may be sent."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """Wait, without blocking the event loop, until a request may be sent.
+
+        With a state file the reservation takes a file lock and does file I/O,
+        so it runs in a worker thread.
+        """
+        if self.state_path is None:
+            delay = self.reserve(tokens)
+        else:
+            delay = await asyncio.to_thread(self.reserve, tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int | None) -> None:
+        """Record a successful request and correct its token estimate.
+
+        Args:
+            estimated_tokens: Tokens reserved before the request.
+            actual_tokens: Tokens reported by usage metadata, if available.
+        """
+        with self._locked_state() as state:
+            factor = float(state.get("factor", 1.0))
+            state["factor"] = min(1.0, factor + RATE_INCREASE_STEP)
+            tokens = state.get("tokens")
+            if tokens is not None and actual_tokens is not None:
+                tokens["level"] -= actual_tokens - estimated_tokens
+
+    async def settle_async(self, estimated_tokens: int, actual_tokens: int | None) -> None:
+        """Like settle(), but keeps state file I/O off the event loop."""
+        if self.state_path is None:
+            self.settle(estimated_tokens, actual_tokens)
+        else:
+            await asyncio.to_thread(self.settle, estimated_tokens, actual_tokens)
+
+    def on_throttle(self) -> None:
+        """Back off after the API signalled throttling.
+
+        Halves the effective rate and drains both buckets so that in-flight
+        callers (in every sharing process) pause before the next request.
+        """
+        with self._locked_state() as state:
+            factor = max(MIN_RATE_FACTOR, float(state.get("factor", 1.0)) * RATE_DECREASE_FACTOR)
+            state["factor"] = factor
+            for bucket in ("requests", "tokens"):
+                if bucket in state:
+                    state[bucket]["level"] = min(0.0, state[bucket]["level"])
+        logger.warning(f"API throttling detected; reducing request rate to {factor:.0%}")
+
+    async def on_throttle_async(self) -> None:
+        """Like on_throttle(), but keeps state file I/O off the event loop."""
+        if self.state_path is None:
+            self.on_throttle()
+        else:
+            await asyncio.to_thread(self.on_throttle)
+
+    def _refill(
+        self, state: dict[str, Any], bucket: str, rate: float, capacity: float, now: float
+    ) -> float:
+        """Return the bucket level after refilling at `rate` since its last update."""
+        entry = state.get(bucket)
+        if entry is None:
+            return capacity
+        elapsed = max(0.0, now - float(entry["updated"]))
+        return min(capacity, float(entry["level"]) + elapsed * rate)
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[dict[str, Any]]:
+        """Yield the mutable limiter state under thread (and file) locks."""
+        with self._lock:
+            if self.state_path is None or fcntl is None:
+                yield self._state
+                return
+
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), "r+") as handle:
+                    raw = handle.read()
+                    try:
+                        state = json.loads(raw) if raw else {}
+                    except json.JSONDecodeError:
+                        logger.debug("Ignoring corrupt rate limiter state file")
+                        state = {}
+                    yield state
+                    handle.seek(0)
+                    handle.truncate()
+                    handle.write(json.dumps(state))
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
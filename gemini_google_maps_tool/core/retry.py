@@ -0,0 +1,82 @@
+"""Retry policy for Google Maps grounded queries.
+
+Provides exponential backoff with full jitter, a cap on attempts and an
+overall time budget, applied only to failures that are likely to succeed
+when repeated (throttling, server errors, timeouts, empty candidates).
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import random
+from dataclasses import dataclass
+
+# Values of QueryError.reason that are worth retrying. Authentication and
+# invalid-argument failures are permanent; empty response text is usually a
+# deterministic content filter and is cached negatively instead.
+RETRYABLE_REASONS = frozenset(
+    {"rate_limited", "server_error", "timeout", "network", "no_candidates"}
+)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_RETRY_BUDGET = 60.0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How query_maps() retries failed attempts.
+
+    Delays follow "full jitter" backoff: a uniform random value between 0 and
+    min(max_delay, base_delay * 2 ** (attempt - 1)), which spreads retries
+    from many concurrent callers instead of synchronizing them.
+
+    Attributes:
+        max_attempts: Total attempts including the first one.
+        base_delay: Backoff ceiling in seconds after the first failure.
+        max_delay: Upper bound for a single backoff ceiling in seconds.
+        budget: Optional limit in seconds on total time spent, including
+            waiting; no retry is started that would exceed it.
+        retryable_reasons: QueryError reasons that may be retried.
+
+    Example:
+        >>> policy = RetryPolicy(max_attempts=5, base_delay=0.5, budget=30)
+        >>> result = query_maps(client, "Coffee in Delft", retry=policy)
+        >>> result.attempts
+        1
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+    budget: float | None = DEFAULT_RETRY_BUDGET
+    retryable_reasons: frozenset[str] = RETRYABLE_REASONS
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError(f"Invalid max_attempts: {self.max_attempts}. Must be at least 1")
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ValueError("Retry delays must not be negative")
+
+    def next_delay(self, reason: str, attempt: int, elapsed: float) -> float | None:
+        """Decide whether to retry after a failed attempt.
+
+        Args:
+            reason: The QueryError reason of the failed attempt.
+            attempt: Number of the attempt that just failed (1-based).
+            elapsed: Seconds spent since the first attempt started.
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up.
+        """
+        if reason not in self.retryable_reasons or attempt >= self.max_attempts:
+            return None
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)  # nosec B311 - jitter, not cryptography
+        if self.budget is not None and elapsed + delay > self.budget:
+            return None
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
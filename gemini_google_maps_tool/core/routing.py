@@ -0,0 +1,290 @@
+"""Latency-aware routing between a light and a heavy Gemini model.
+
+Provides ModelRouter, which backs the "auto" model: planning-style queries go
+straight to the heavy model, everything else to the light model unless the
+observed latencies show that the light model, plus the queries it has to hand
+over, is slower on average. A light answer with empty text, no candidates or
+no grounding sources is escalated to the heavy model.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from typing import Any
+
+from gemini_google_maps_tool.core.maps import MapsQueryResult, QueryError
+from gemini_google_maps_tool.core.retry import NO_RETRY, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+LIGHT_MODEL = "gemini-2.5-flash-lite"
+HEAVY_MODEL = "gemini-2.5-flash"
+DEFAULT_WINDOW = 200
+DEFAULT_MIN_SAMPLES = 20
+# Every Nth routed query goes to the light model even while the heavy one is
+# faster, so the light model's statistics keep up with changing conditions.
+EXPLORE_EVERY = 20
+LONG_QUERY_WORDS = 30
+
+# Failures of the light model that the heavy model is likely to answer
+ESCALATION_REASONS = frozenset({QueryError.REASON_EMPTY_TEXT, QueryError.REASON_NO_CANDIDATES})
+
+PLANNING_PATTERN = re.compile(
+    r"\b(plan|planning|itinerar(y|ies)|schedule|route|trip|tour|day[- ]by[- ]day|"
+    r"step[- ]by[- ]step|compare|comparison|versus|vs\.?|pros and cons|optimi[sz]e)\b",
+    re.IGNORECASE,
+)
+
+RunQuery = Callable[[str, RetryPolicy | None], MapsQueryResult]
+RunQueryAsync = Callable[[str, RetryPolicy | None], Awaitable[MapsQueryResult]]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+class ModelRouter:
+    """Chooses a model per query and escalates unusable light answers.
+
+    Latencies are the network time of successful, uncached queries, kept per
+    model in a sliding window. Once both models have min_samples of them, a
+    simple query is sent to the heavy model directly when
+
+        mean(light) + escalation rate * mean(heavy) > mean(heavy)
+
+    that is, when trying the light model first is slower on average than
+    skipping it. It is safe to use from multiple threads.
+
+    Attributes:
+        light: The fast, cheap model tried first.
+        heavy: The model used for planning-style queries and escalations.
+        escalations: Number of light answers handed over to the heavy model.
+
+    Example:
+        >>> router = ModelRouter()
+        >>> result = query_maps(client, "Coffee in Delft", model="auto", router=router)
+        >>> result.model
+        'gemini-2.5-flash-lite'
+        >>> router.stats()["gemini-2.5-flash-lite"]["p50_ms"]
+        812.4
+    """
+
+    def __init__(
+        self,
+        light: str = LIGHT_MODEL,
+        heavy: str = HEAVY_MODEL,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        escalate_without_sources: bool = True,
+    ) -> None:
+        """Create a router without any observations.
+
+        Args:
+            light: The fast, cheap model tried first.
+            heavy: The model used for planning-style queries and escalations.
+            window: Number of recent latencies and outcomes kept per model.
+            min_samples: Observations needed before latencies affect routing.
+            escalate_without_sources: Whether a light answer that cites no
+                places is escalated as well.
+
+        Raises:
+            ValueError: If window or min_samples is less than 1.
+        """
+        if window < 1 or min_samples < 1:
+            raise ValueError("Router window and min_samples must be at least 1")
+        self.light = light
+        self.heavy = heavy
+        self.min_samples = min_samples
+        self.escalate_without_sources = escalate_without_sources
+        self.escalations = 0
+        self._latencies: dict[str, deque[float]] = {
+            light: deque(maxlen=window),
+            heavy: deque(maxlen=window),
+        }
+        # Whether each recent light query had to be escalated
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._routed = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_complex(query: str) -> bool:
+        """Return whether a query needs the heavy model (planning or long queries)."""
+        return bool(PLANNING_PATTERN.search(query)) or len(query.split()) > LONG_QUERY_WORDS
+
+    def choose(self, query: str) -> str:
+        """Return the model to send a query to first.
+
+        Args:
+            query: The query text.
+
+        Returns:
+            The heavy model for complex queries or when the light model does
+            not pay off on latency, otherwise the light model.
+        """
+        if self.is_complex(query):
+            return self.heavy
+        with self._lock:
+            self._routed += 1
+            if self._routed % EXPLORE_EVERY == 0:
+                return self.light
+            light = self._latencies[self.light]
+            heavy = self._latencies[self.heavy]
+            if min(len(light), len(heavy), len(self._outcomes)) < self.min_samples:
+                return self.light
+            light_mean = sum(light) / len(light)
+            heavy_mean = sum(heavy) / len(heavy)
+            rate = sum(self._outcomes) / len(self._outcomes)
+        if light_mean + rate * heavy_mean > heavy_mean:
+            logger.debug(
+                f"Routing to {self.heavy}: light {light_mean:.0f} ms with {rate:.0%} "
+                f"escalated is slower than heavy {heavy_mean:.0f} ms"
+            )
+            return self.heavy
+        return self.light
+
+    def observe(self, model: str, latency_ms: float) -> None:
+        """Record the network latency of a query.
+
+        Args:
+            model: Model that answered.
+            latency_ms: Network time of the query in milliseconds.
+        """
+        with self._lock:
+            latencies = self._latencies.get(model)
+            if latencies is not None:
+                latencies.append(latency_ms)
+
+    def percentile(self, model: str, q: float) -> float | None:
+        """Return a latency percentile of a model in milliseconds.
+
+        Args:
+            model: Model name.
+            q: Percentile between 0 and 100.
+
+        Returns:
+            The nearest-rank percentile, or None without observations.
+        """
+        with self._lock:
+            values = sorted(self._latencies.get(model, ()))
+        return _percentile(values, q) if values else None
+
+    def stats(self) -> dict[str, Any]:
+        """Return latency percentiles per model and the escalation rate.
+
+        Returns:
+            Dictionary with count, p50_ms, p90_ms and p99_ms per model, and
+            "escalations" and "escalation_rate" of the light model.
+        """
+        with self._lock:
+            samples = {model: sorted(values) for model, values in self._latencies.items()}
+            outcomes = list(self._outcomes)
+            escalations = self.escalations
+        data: dict[str, Any] = {}
+        for model, values in samples.items():
+            data[model] = {"count": len(values)}
+            if values:
+                for q in (50, 90, 99):
+                    data[model][f"p{q}_ms"] = round(_percentile(values, q), 1)
+        data["escalations"] = escalations
+        data["escalation_rate"] = round(sum(outcomes) / len(outcomes), 3) if outcomes else 0.0
+        return data
+
+    def _light_retry(self, retry: RetryPolicy | None) -> RetryPolicy:
+        """Return the retry policy for the light model, which escalates instead of retrying."""
+        policy = retry or NO_RETRY
+        return replace(policy, retryable_reasons=policy.retryable_reasons - ESCALATION_REASONS)
+
+    def _needs_escalation(self, result: MapsQueryResult) -> bool:
+        """Return whether a light answer should be handed over to the heavy model."""
+        metadata = result.grounding_metadata
+        return self.escalate_without_sources and not (metadata and metadata.grounding_chunks)
+
+    def _record(self, model: str, result: MapsQueryResult) -> MapsQueryResult:
+        """Record the latency of a result and return a copy labelled with its model.
+
+        The result is copied because it may be an entry shared by a cache.
+        """
+        if not result.from_cache and result.timings is not None:
+            self.observe(model, result.timings.network_ms)
+        return replace(result, model=model)
+
+    def _record_failure(self, model: str, error: QueryError) -> None:
+        """Record the latency of a failed light attempt that is escalated."""
+        if error.timings is not None:
+            self.observe(model, error.timings.network_ms)
+
+    def _record_escalation(self, escalated: bool) -> None:
+        """Record whether a light query was escalated."""
+        with self._lock:
+            self._outcomes.append(escalated)
+            if escalated:
+                self.escalations += 1
+
+    def query(self, run: RunQuery, query: str, retry: RetryPolicy | None = None) -> MapsQueryResult:
+        """Run a query on the chosen model, escalating an unusable light answer.
+
+        Args:
+            run: Callable running the query with a model name and retry policy;
+                it must request grounding metadata so sources can be checked.
+            query: The query text, used to choose the model.
+            retry: The caller's retry policy. On the light model, empty text
+                and no candidates are escalated rather than retried.
+
+        Returns:
+            The result, with `model` set to the model that answered.
+
+        Raises:
+            QueryError: If the query fails on the model that answered last.
+        """
+        model = self.choose(query)
+        if model != self.light:
+            return self._record(model, run(model, retry))
+        try:
+            result = self._record(model, run(model, self._light_retry(retry)))
+            if not self._needs_escalation(result):
+                self._record_escalation(False)
+                return result
+            logger.info(f"{model} cited no sources; escalating to {self.heavy}")
+        except QueryError as e:
+            if e.reason not in ESCALATION_REASONS:
+                raise
+            self._record_failure(model, e)
+            logger.info(f"{model} failed ({e.reason}); escalating to {self.heavy}")
+        self._record_escalation(True)
+        return self._record(self.heavy, run(self.heavy, retry))
+
+    async def query_async(
+        self, run: RunQueryAsync, query: str, retry: RetryPolicy | None = None
+    ) -> MapsQueryResult:
+        """Async counterpart of query() (see there)."""
+        model = self.choose(query)
+        if model != self.light:
+            return self._record(model, await run(model, retry))
+        try:
+            result = self._record(model, await run(model, self._light_retry(retry)))
+            if not self._needs_escalation(result):
+                self._record_escalation(False)
+                return result
+            logger.info(f"{model} cited no sources; escalating to {self.heavy}")
+        except QueryError as e:
+            if e.reason not in ESCALATION_REASONS:
+                raise
+            self._record_failure(model, e)
+            logger.info(f"{model} failed ({e.reason}); escalating to {self.heavy}")
+        self._record_escalation(True)
+        return self._record(self.heavy, await run(self.heavy, retry))
+
+
+# Shared by every query with model "auto" that does not bring its own router
+DEFAULT_ROUTER = ModelRouter()
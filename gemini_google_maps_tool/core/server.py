@@ -0,0 +1,391 @@
+"""Local query daemon for Google Maps grounded queries.
+
+Provides a small HTTP server on a Unix domain socket that keeps one warm
+Gemini client (with its pooled keep-alive connections) and an in-memory
+result cache across requests, plus a lightweight client used by the CLI to
+forward queries to it. The client side only uses the standard library, so
+forwarding never pays the Gemini SDK import cost.
+
+Protocol (JSON over HTTP/1.1):
+    GET  /health  -> {"status": "ok", "pid": ..., "cache": {...}}
+    GET  /metrics -> QueryMetrics in Prometheus text format
+    POST /query   -> {"query", "lat_lon", "model", "include_grounding",
+                      "max_attempts", "retry_budget"}
+                     200: MapsQueryResult.to_dict() plus "from_cache", "attempts",
+                          "usage" (TokenUsage.to_dict(), when reported) and
+                          "model" (the model that answered)
+                     4xx/5xx: {"error": message, "reason": QueryError reason}
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import os
+import socket
+import socketserver
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gemini_google_maps_tool.core.cache import MemoryCache
+from gemini_google_maps_tool.core.maps import (
+    DEFAULT_MODEL,
+    MapsQueryResult,
+    QueryError,
+    TokenUsage,
+    query_maps,
+)
+from gemini_google_maps_tool.core.metrics import PROMETHEUS_CONTENT_TYPE, QueryMetrics
+from gemini_google_maps_tool.core.ratelimit import RateLimiter
+from gemini_google_maps_tool.core.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from google import genai
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAEMON_CACHE_ENTRIES = 10_000
+DEFAULT_DAEMON_CACHE_TTL = 3600
+DEFAULT_DAEMON_TIMEOUT = 120.0
+SOCKET_ENV_VAR = "GEMINI_MAPS_SOCKET"
+
+# HTTP status returned for each QueryError reason (anything else is a 502)
+_REASON_STATUS = {
+    QueryError.REASON_INVALID_ARGUMENT: 400,
+    QueryError.REASON_AUTH: 401,
+    QueryError.REASON_RATE_LIMITED: 429,
+}
+
+
+def default_socket_path() -> Path:
+    """Return the daemon socket path ($GEMINI_MAPS_SOCKET, else a per-user default)."""
+    configured = os.environ.get(SOCKET_ENV_VAR)
+    if configured:
+        return Path(configured)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "gemini-google-maps-tool.sock"
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "gemini-google-maps-tool" / "daemon.sock"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that talks to a Unix domain socket instead of TCP."""
+
+    def __init__(self, socket_path: Path, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def _request(
+    socket_path: Path, method: str, path: str, body: dict[str, Any] | None, timeout: float
+) -> tuple[int, dict[str, Any]]:
+    """Send one request to the daemon and return (status, decoded JSON body)."""
+    connection = _UnixHTTPConnection(socket_path, timeout)
+    try:
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+
+
+def _body_lat_lon(value: Any) -> tuple[float, float] | None:
+    """Validate the lat_lon of a /query body: null or [latitude, longitude] in range."""
+    if value is None:
+        return None
+    if (
+        not isinstance(value, list)
+        or len(value) != 2
+        or not all(isinstance(v, int | float) and not isinstance(v, bool) for v in value)
+    ):
+        raise ValueError("'lat_lon' must be a [latitude, longitude] list of numbers")
+    lat, lon = float(value[0]), float(value[1])
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"'lat_lon' out of range: {lat}, {lon}")
+    return lat, lon
+
+
+def daemon_is_running(socket_path: Path | None = None, timeout: float = 1.0) -> bool:
+    """Return whether a daemon answers health checks on the socket.
+
+    Args:
+        socket_path: Socket to probe (default: default_socket_path()).
+        timeout: Seconds to wait for the health check.
+
+    Returns:
+        True if a daemon responded, False otherwise.
+    """
+    path = socket_path or default_socket_path()
+    if not path.exists():
+        return False
+    try:
+        status, _ = _request(path, "GET", "/health", None, timeout)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Daemon health check on {path} failed: {e}")
+        return False
+    return status == 200
+
+
+def query_via_daemon(
+    query: str,
+    lat_lon: tuple[float, float] | None = None,
+    model: str = DEFAULT_MODEL,
+    include_grounding: bool = False,
+    *,
+    retry: RetryPolicy | None = None,
+    socket_path: Path | None = None,
+    timeout: float = DEFAULT_DAEMON_TIMEOUT,
+) -> MapsQueryResult | None:
+    """Forward a query to a running daemon.
+
+    Args:
+        query: The query text to send to the model.
+        lat_lon: Optional (latitude, longitude) tuple for location context.
+        model: Model name to use.
+        include_grounding: Whether to include grounding metadata in response.
+        retry: Optional retry policy the daemon applies to this query.
+        socket_path: Daemon socket (default: default_socket_path()).
+        timeout: Seconds to wait for the answer.
+
+    Returns:
+        The query result, or None if no daemon is reachable or its reply
+        cannot be read (the caller should then query directly).
+
+    Raises:
+        QueryError: If the daemon ran the query and it failed, or timed out.
+
+    Example:
+        >>> result = query_via_daemon("Coffee in Delft")
+        >>> if result is None:
+        ...     result = query_maps(get_client(), "Coffee in Delft")
+    """
+    path = socket_path or default_socket_path()
+    if not path.exists():
+        return None
+
+    body: dict[str, Any] = {
+        "query": query,
+        "lat_lon": list(lat_lon) if lat_lon is not None else None,
+        "model": model,
+        "include_grounding": include_grounding,
+    }
+    if retry is not None:
+        body["max_attempts"] = retry.max_attempts
+        body["retry_budget"] = retry.budget
+
+    try:
+        status, data = _request(path, "POST", "/query", body, timeout)
+    except TimeoutError as e:
+        raise QueryError(
+            f"Daemon at {path} did not answer within {timeout:.0f}s: {e}",
+            reason=QueryError.REASON_TIMEOUT,
+        ) from e
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        # Unreachable, not ours to use, or not speaking our protocol
+        logger.debug(f"Daemon not usable at {path}: {e}")
+        return None
+
+    if status != 200:
+        error = QueryError(
+            str(data.get("error", f"Daemon returned HTTP {status}")),
+            reason=str(data.get("reason", QueryError.REASON_UNEXPECTED)),
+        )
+        error.attempts = int(data.get("attempts", 1))
+        raise error
+
+    result = MapsQueryResult.from_dict(data)
+    result.from_cache = bool(data.get("from_cache"))
+    result.attempts = int(data.get("attempts", 1))
+    if data.get("usage") is not None:
+        result.usage = TokenUsage.from_dict(data["usage"])
+    result.model = data.get("model")
+    return result
+
+
+class QueryDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server on a Unix socket that runs queries with a warm client.
+
+    Each connection is handled on its own thread; all threads share the
+    client, whose HTTP connection pool keeps connections to the API alive,
+    and a MemoryCache, which also coalesces identical concurrent queries.
+
+    Example:
+        >>> daemon = QueryDaemon(default_socket_path(), get_client())
+        >>> daemon.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        client: genai.Client,
+        cache: MemoryCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        metrics: QueryMetrics | None = None,
+    ) -> None:
+        """Bind the daemon socket.
+
+        Args:
+            socket_path: Path of the Unix socket to create.
+            client: Gemini client shared by all requests.
+            cache: Result cache (default: a MemoryCache with 10,000 entries kept
+                for an hour).
+            rate_limiter: Optional limiter shared by all requests.
+            retry: Default retry policy when a request does not specify one.
+            metrics: Metrics of the queries served (default: new QueryMetrics).
+
+        Raises:
+            OSError: If another daemon is already listening on the socket.
+        """
+        self.socket_path = socket_path
+        self.client = client
+        self.cache = (
+            cache
+            if cache is not None
+            else MemoryCache(DEFAULT_DAEMON_CACHE_ENTRIES, ttl=DEFAULT_DAEMON_CACHE_TTL)
+        )
+        self.rate_limiter = rate_limiter
+        self.retry = retry or RetryPolicy()
+        self.metrics = metrics if metrics is not None else QueryMetrics()
+
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            if daemon_is_running(socket_path):
+                raise OSError(f"A daemon is already listening on {socket_path}")
+            logger.debug(f"Removing stale socket {socket_path}")
+            socket_path.unlink()
+
+        # Only the current user may connect: the daemon spends their API quota
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(socket_path), _QueryHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+    def handle_query(self, body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """Run one decoded /query request and return (status, response body)."""
+        try:
+            query = body["query"]
+            if not isinstance(query, str) or not query.strip():
+                raise ValueError("'query' must be a non-empty string")
+            lat_lon = _body_lat_lon(body.get("lat_lon"))
+            retry = self.retry
+            if "max_attempts" in body:
+                budget = body.get("retry_budget")
+                retry = RetryPolicy(
+                    max_attempts=int(body["max_attempts"]),
+                    budget=float(budget) if budget is not None else None,
+                )
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            return 400, {"error": f"Invalid request: {e}", "reason": "invalid_argument"}
+
+        try:
+            result = query_maps(
+                self.client,
+                query,
+                lat_lon,
+                str(body.get("model") or DEFAULT_MODEL),
+                bool(body.get("include_grounding")),
+                cache=self.cache,
+                rate_limiter=self.rate_limiter,
+                retry=retry,
+                metrics=self.metrics,
+            )
+        except QueryError as e:
+            status = _REASON_STATUS.get(e.reason, 502)
+            return status, {"error": str(e), "reason": e.reason, "attempts": e.attempts}
+
+        data = result.to_dict()
+        data["from_cache"] = result.from_cache
+        data["attempts"] = result.attempts
+        if result.usage is not None:
+            data["usage"] = result.usage.to_dict()
+        if result.model is not None:
+            data["model"] = result.model
+        return 200, data
+
+    def health(self) -> dict[str, Any]:
+        """Return the /health response body."""
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "cache": {
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+                "coalesced": self.cache.coalesced,
+            },
+        }
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 request handler for QueryDaemon."""
+
+    protocol_version = "HTTP/1.1"
+    server: QueryDaemon
+
+    def address_string(self) -> str:
+        # Unix socket peers have no host/port
+        return "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+    def do_GET(self) -> None:  # noqa: N802 - name required by BaseHTTPRequestHandler
+        if self.path == "/metrics":
+            self._send_bytes(
+                200, self.server.metrics.registry.render().encode(), PROMETHEUS_CONTENT_TYPE
+            )
+        elif self.path == "/health":
+            self._send(200, self.server.health())
+        else:
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:  # noqa: N802 - name required by BaseHTTPRequestHandler
+        if self.path != "/query":
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+            if not isinstance(body, dict):
+                raise ValueError("Request body must be a JSON object")
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid request: {e}", "reason": "invalid_argument"})
+            return
+        status, data = self.server.handle_query(body)
+        self._send(status, data)
+
+    def _send(self, status: int, data: dict[str, Any]) -> None:
+        self._send_bytes(status, json.dumps(data).encode(), "application/json")
+
+    def _send_bytes(self, status: int, payload: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
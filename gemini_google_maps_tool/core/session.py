@@ -0,0 +1,227 @@
+"""Reusable query sessions for Google Maps grounded queries.
+
+Provides MapsSession, which owns a Gemini client with tunable HTTP
+transport settings and reuses prebuilt request configs, so that repeated
+queries only pay for the network round trip.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+from gemini_google_maps_tool.core.client import TransportOptions, create_client
+from gemini_google_maps_tool.core.maps import (
+    DEFAULT_MODEL,
+    MapsQueryResult,
+    MapsQueryStream,
+    ResultCache,
+    build_config,
+    query_maps,
+    query_maps_async,
+    query_maps_stream,
+)
+from gemini_google_maps_tool.core.ratelimit import RateLimiter
+from gemini_google_maps_tool.core.retry import RetryPolicy
+from gemini_google_maps_tool.core.tracing import Tracer
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+
+    from gemini_google_maps_tool.core.costs import Budget
+    from gemini_google_maps_tool.core.metrics import QueryMetrics
+    from gemini_google_maps_tool.core.routing import ModelRouter
+
+DEFAULT_MAX_CONFIGS = 1024
+
+
+class MapsSession:
+    """A long-lived query session with a dedicated client and prebuilt configs.
+
+    The session creates its own client from the transport options (or uses
+    the one given), keeps request configs per (model, location) in a bounded
+    LRU map, and applies its cache, rate limiter, retry policy, tracer,
+    metrics, budget and router to every query. It is safe to use from
+    multiple threads.
+
+    Example:
+        >>> with MapsSession(TransportOptions(timeout=30, http2=True)) as session:
+        ...     result = session.query("Coffee near Dam Square", lat_lon=(52.373, 4.893))
+        ...     print(result.response_text)
+    """
+
+    def __init__(
+        self,
+        transport: TransportOptions | None = None,
+        *,
+        client: genai.Client | None = None,
+        cache: ResultCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        tracer: Tracer | None = None,
+        metrics: QueryMetrics | None = None,
+        budget: Budget | None = None,
+        router: ModelRouter | None = None,
+        max_configs: int = DEFAULT_MAX_CONFIGS,
+    ) -> None:
+        """Create a session.
+
+        Args:
+            transport: HTTP transport settings for the session's own client.
+            client: Existing client to use instead (transport is then ignored,
+                and close() leaves the client open).
+            cache: Optional result cache consulted before calling the API.
+            rate_limiter: Optional limiter applied to every query.
+            retry: Optional retry policy applied to every query.
+            tracer: Optional tracer receiving spans for every query.
+            metrics: Optional metrics recording every query.
+            budget: Optional budget charged with every query (see core.costs).
+            router: Optional router for queries with model "auto" (see core.routing).
+            max_configs: Maximum number of prebuilt request configs kept.
+
+        Raises:
+            ClientError: If a client cannot be created (e.g. GEMINI_API_KEY unset).
+            ValueError: If max_configs is less than 1.
+        """
+        if max_configs < 1:
+            raise ValueError(f"Invalid max_configs: {max_configs}. Must be at least 1")
+        self._owns_client = client is None
+        self.client = client if client is not None else create_client(transport)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.tracer = tracer
+        self.metrics = metrics
+        self.budget = budget
+        self.router = router
+        self.max_configs = max_configs
+        self._configs: OrderedDict[
+            tuple[str, tuple[float, float] | None], types.GenerateContentConfig
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def config_for(
+        self, model: str, lat_lon: tuple[float, float] | None
+    ) -> types.GenerateContentConfig:
+        """Return the prebuilt request config for a model and location.
+
+        Args:
+            model: Model name.
+            lat_lon: Optional (latitude, longitude) location context.
+
+        Returns:
+            The shared GenerateContentConfig (built on first use).
+        """
+        key = (model, lat_lon)
+        with self._lock:
+            config = self._configs.get(key)
+            if config is not None:
+                self._configs.move_to_end(key)
+                return config
+        config = build_config(lat_lon)
+        with self._lock:
+            self._configs[key] = config
+            if len(self._configs) > self.max_configs:
+                self._configs.popitem(last=False)
+        return config
+
+    def query(
+        self,
+        query: str,
+        lat_lon: tuple[float, float] | None = None,
+        model: str = DEFAULT_MODEL,
+        include_grounding: bool = False,
+    ) -> MapsQueryResult:
+        """Run a grounded query; same semantics as query_maps().
+
+        Raises:
+            QueryError: If the API query fails (after any retries).
+        """
+        return query_maps(
+            self.client,
+            query,
+            lat_lon,
+            model,
+            include_grounding,
+            cache=self.cache,
+            rate_limiter=self.rate_limiter,
+            retry=self.retry,
+            config=self.config_for(model, lat_lon),
+            tracer=self.tracer,
+            metrics=self.metrics,
+            budget=self.budget,
+            router=self.router,
+        )
+
+    async def query_async(
+        self,
+        query: str,
+        lat_lon: tuple[float, float] | None = None,
+        model: str = DEFAULT_MODEL,
+        include_grounding: bool = False,
+    ) -> MapsQueryResult:
+        """Run a grounded query on the event loop; same semantics as query_maps_async().
+
+        Raises:
+            QueryError: If the API query fails (after any retries).
+        """
+        return await query_maps_async(
+            self.client.aio,
+            query,
+            lat_lon,
+            model,
+            include_grounding,
+            cache=self.cache,
+            rate_limiter=self.rate_limiter,
+            retry=self.retry,
+            config=self.config_for(model, lat_lon),
+            tracer=self.tracer,
+            metrics=self.metrics,
+            budget=self.budget,
+            router=self.router,
+        )
+
+    def query_stream(
+        self,
+        query: str,
+        lat_lon: tuple[float, float] | None = None,
+        model: str = DEFAULT_MODEL,
+        include_grounding: bool = False,
+    ) -> MapsQueryStream:
+        """Stream a grounded query; same semantics as query_maps_stream()."""
+        return query_maps_stream(
+            self.client,
+            query,
+            lat_lon,
+            model,
+            include_grounding,
+            rate_limiter=self.rate_limiter,
+            retry=self.retry,
+            config=self.config_for(model, lat_lon),
+            tracer=self.tracer,
+            metrics=self.metrics,
+            budget=self.budget,
+            router=self.router,
+        )
+
+    def close(self) -> None:
+        """Close the session's own client and its connection pool."""
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self) -> MapsSession:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
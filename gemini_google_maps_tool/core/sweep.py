@@ -0,0 +1,314 @@
+"""Area sweeps: grounded queries fanned out over a bounding box.
+
+Provides BoundingBox and sweep_async(), which runs one query at the center
+of every cell of a uniform grid over an area, optionally refines cells that
+returned many places into quadrants (an adaptive quadtree), and merges the
+places of all cells, de-duplicated by place id.
+
+Refinement spends requests where places are dense instead of on empty
+cells: a 3x3 grid with max_depth=2 costs 9 requests for a rural area but
+up to 9 + 36 + 144 for a dense city center.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from gemini_google_maps_tool.core.maps import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MODEL,
+    GroundingChunk,
+    MapsQueryRequest,
+    QueryError,
+    ResultCache,
+    query_many_async,
+)
+from gemini_google_maps_tool.core.ratelimit import RateLimiter
+from gemini_google_maps_tool.core.retry import RetryPolicy
+from gemini_google_maps_tool.core.tracing import Tracer
+
+if TYPE_CHECKING:
+    from google.genai.client import AsyncClient
+
+    from gemini_google_maps_tool.core.costs import Budget
+    from gemini_google_maps_tool.core.metrics import QueryMetrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRID_SIZE = 3
+DEFAULT_SPLIT_THRESHOLD = 5
+MAX_SWEEP_DEPTH = 6
+
+
+@dataclass(frozen=True, slots=True)
+class BoundingBox:
+    """A latitude/longitude rectangle (boxes crossing the antimeridian are not supported).
+
+    Attributes:
+        min_lat: Southern edge in degrees.
+        min_lon: Western edge in degrees.
+        max_lat: Northern edge in degrees.
+        max_lon: Eastern edge in degrees.
+    """
+
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+    def __post_init__(self) -> None:
+        if not -90 <= self.min_lat < self.max_lat <= 90:
+            raise ValueError(
+                f"Invalid bounding box latitudes: {self.min_lat}, {self.max_lat}. "
+                "Need -90 <= min_lat < max_lat <= 90"
+            )
+        if not -180 <= self.min_lon < self.max_lon <= 180:
+            raise ValueError(
+                f"Invalid bounding box longitudes: {self.min_lon}, {self.max_lon}. "
+                "Need -180 <= min_lon < max_lon <= 180"
+            )
+
+    @classmethod
+    def parse(cls, text: str) -> BoundingBox:
+        """Parse a "min_lat,min_lon,max_lat,max_lon" string.
+
+        Raises:
+            ValueError: If the format is invalid or the box is empty or out of range.
+
+        Example:
+            >>> BoundingBox.parse("52.35,4.85,52.39,4.93").center
+            (52.37, 4.89)
+        """
+        parts = text.split(",")
+        if len(parts) != 4:
+            raise ValueError(
+                "Invalid bounding box format: Expected 'min_lat,min_lon,max_lat,max_lon' "
+                f"(e.g., 52.35,4.85,52.39,4.93). Got: {text}"
+            )
+        try:
+            min_lat, min_lon, max_lat, max_lon = (float(part.strip()) for part in parts)
+        except ValueError as e:
+            raise ValueError(
+                f"Invalid bounding box format: Could not parse coordinates as numbers. Got: {text}"
+            ) from e
+        return cls(min_lat, min_lon, max_lat, max_lon)
+
+    @property
+    def center(self) -> tuple[float, float]:
+        """The (latitude, longitude) center of the box."""
+        return ((self.min_lat + self.max_lat) / 2, (self.min_lon + self.max_lon) / 2)
+
+    def contains(self, lat_lon: tuple[float, float]) -> bool:
+        """Whether a (latitude, longitude) point lies in the box, edges included."""
+        lat, lon = lat_lon
+        return self.min_lat <= lat <= self.max_lat and self.min_lon <= lon <= self.max_lon
+
+    def grid(self, rows: int, cols: int) -> list[BoundingBox]:
+        """Split the box into rows x cols equal cells, row by row from the south-west."""
+        lat_step = (self.max_lat - self.min_lat) / rows
+        lon_step = (self.max_lon - self.min_lon) / cols
+        return [
+            BoundingBox(
+                self.min_lat + row * lat_step,
+                self.min_lon + col * lon_step,
+                self.max_lat if row == rows - 1 else self.min_lat + (row + 1) * lat_step,
+                self.max_lon if col == cols - 1 else self.min_lon + (col + 1) * lon_step,
+            )
+            for row in range(rows)
+            for col in range(cols)
+        ]
+
+    def quadrants(self) -> list[BoundingBox]:
+        """Split the box into its four quadrants."""
+        return self.grid(2, 2)
+
+    def to_list(self) -> list[float]:
+        """Return [min_lat, min_lon, max_lat, max_lon]."""
+        return [self.min_lat, self.min_lon, self.max_lat, self.max_lon]
+
+
+@dataclass(frozen=True, slots=True)
+class SweepCell:
+    """One queried cell of a sweep.
+
+    Attributes:
+        bbox: Area of the cell; the query used its center as location.
+        depth: Refinement level (0 for the initial grid).
+        place_count: Distinct places the cell's answer cited.
+        error: Failure reason if the query failed.
+    """
+
+    bbox: BoundingBox
+    depth: int
+    place_count: int = 0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the cell."""
+        data: dict[str, Any] = {
+            "lat_lon": list(self.bbox.center),
+            "bbox": self.bbox.to_list(),
+            "depth": self.depth,
+            "place_count": self.place_count,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+@dataclass(slots=True)
+class SweepPlace:
+    """A de-duplicated place found by a sweep.
+
+    Attributes:
+        chunk: The place as first cited.
+        lat_lon: Center of the first cell that found it.
+        hits: Number of cells whose answers cited it.
+    """
+
+    chunk: GroundingChunk
+    lat_lon: tuple[float, float]
+    hits: int = 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-serializable form of the place."""
+        return {**self.chunk.to_dict(), "lat_lon": list(self.lat_lon), "hits": self.hits}
+
+
+@dataclass(slots=True)
+class SweepResult:
+    """Merged outcome of a sweep.
+
+    Attributes:
+        places: Distinct places in the order they were first found.
+        cells: Every queried cell, level by level.
+    """
+
+    places: list[SweepPlace] = field(default_factory=list)
+    cells: list[SweepCell] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        """Number of cells whose query failed."""
+        return sum(1 for cell in self.cells if cell.error is not None)
+
+
+async def sweep_async(
+    client: AsyncClient,
+    query: str,
+    bbox: BoundingBox,
+    grid_size: int = DEFAULT_GRID_SIZE,
+    max_depth: int = 0,
+    split_threshold: int = DEFAULT_SPLIT_THRESHOLD,
+    model: str = DEFAULT_MODEL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    *,
+    cache: ResultCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    tracer: Tracer | None = None,
+    metrics: QueryMetrics | None = None,
+    budget: Budget | None = None,
+) -> SweepResult:
+    """Run a query over a bounding box and merge the places found.
+
+    The box is split into a grid_size x grid_size grid and the query is run
+    concurrently at the center of every cell. A cell whose answer cites at
+    least split_threshold distinct places is split into quadrants that are
+    queried in turn, down to max_depth levels. Failed cells are recorded and
+    never refined, so one failure never aborts the sweep.
+
+    Args:
+        client: Async Gemini API client (see get_async_client()).
+        query: The query text, sent unchanged for every cell.
+        bbox: Area to cover.
+        grid_size: Number of rows and columns of the initial grid.
+        max_depth: Maximum refinement levels (0 disables refinement).
+        split_threshold: Places a cell must return to be refined.
+        model: Model name to use.
+        concurrency: Maximum number of queries in flight at once.
+        cache: Optional result cache shared by all cells.
+        rate_limiter: Optional limiter shared by all cells.
+        retry: Optional retry policy applied to each cell.
+        tracer: Optional tracer receiving spans for every query.
+        metrics: Optional metrics shared by all queries.
+        budget: Optional budget shared by all queries (see core.costs).
+
+    Returns:
+        SweepResult with the de-duplicated places and every queried cell.
+
+    Raises:
+        ValueError: If grid_size, split_threshold or max_depth is out of range.
+
+    Example:
+        >>> bbox = BoundingBox.parse("52.35,4.85,52.39,4.93")
+        >>> result = asyncio.run(sweep_async(client, "Bakeries", bbox, max_depth=2))
+        >>> len(result.places), len(result.cells)
+        (41, 21)
+    """
+    if grid_size < 1:
+        raise ValueError(f"Invalid grid size: {grid_size}. Must be at least 1")
+    if split_threshold < 1:
+        raise ValueError(f"Invalid split threshold: {split_threshold}. Must be at least 1")
+    if not 0 <= max_depth <= MAX_SWEEP_DEPTH:
+        raise ValueError(f"Invalid max depth: {max_depth}. Must be between 0 and {MAX_SWEEP_DEPTH}")
+
+    result = SweepResult()
+    places: dict[str, SweepPlace] = {}
+    level = bbox.grid(grid_size, grid_size)
+    depth = 0
+    while level:
+        logger.info(f"Sweeping {len(level)} cells at depth {depth}")
+        requests = [
+            MapsQueryRequest(query=query, lat_lon=cell.center, model=model, include_grounding=True)
+            for cell in level
+        ]
+        outcomes = await query_many_async(
+            client,
+            requests,
+            concurrency,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry=retry,
+            tracer=tracer,
+            metrics=metrics,
+            budget=budget,
+        )
+
+        refine: list[BoundingBox] = []
+        for cell, outcome in zip(level, outcomes, strict=True):
+            if isinstance(outcome, QueryError):
+                logger.debug(f"Cell {cell.center} failed ({outcome.reason})")
+                result.cells.append(SweepCell(cell, depth, error=outcome.reason))
+                continue
+            chunks = (
+                outcome.grounding_metadata.grounding_chunks if outcome.grounding_metadata else []
+            )
+            seen: set[str] = set()
+            for chunk in chunks:
+                key = chunk.place_key
+                if key is None or key in seen:
+                    continue
+                seen.add(key)
+                place = places.get(key)
+                if place is None:
+                    places[key] = SweepPlace(chunk, cell.center)
+                else:
+                    place.hits += 1
+            result.cells.append(SweepCell(cell, depth, place_count=len(seen)))
+            if len(seen) >= split_threshold and depth < max_depth:
+                refine.extend(cell.quadrants())
+        level = refine
+        depth += 1
+
+    result.places = list(places.values())
+    logger.info(
+        f"Sweep queried {len(result.cells)} cells ({result.failed} failed) "
+        f"and found {len(result.places)} places"
+    )
+    return result
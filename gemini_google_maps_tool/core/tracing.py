@@ -0,0 +1,161 @@
+"""Per-phase timing and tracing hooks for grounded queries.
+
+Provides QueryTimings, the wall-clock breakdown of a query into its phases
+(config construction, rate limiting, network call, text extraction and
+grounding extraction), and the Tracer protocol through which callers can
+receive the same phases as spans.
+
+Tracer matches OpenTelemetry's Tracer.start_as_current_span, so an
+OpenTelemetry tracer can be passed directly without this package depending
+on OpenTelemetry:
+
+    >>> from opentelemetry import trace
+    >>> result = query_maps(client, "Coffee in Delft", tracer=trace.get_tracer("maps"))
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+# Phase names, used as QueryTimings fields (with a _ms suffix) and span names
+PHASE_CONFIG = "config"
+PHASE_RATE_LIMIT = "rate_limit"
+PHASE_NETWORK = "network"
+PHASE_EXTRACT = "extract"
+PHASE_GROUNDING = "grounding"
+
+# Span name of a whole query (all attempts, including retry backoff)
+SPAN_QUERY = "query"
+SPAN_PREFIX = "gemini_maps."
+
+AttributeValue = str | bool | int | float
+
+
+class Tracer(Protocol):
+    """Span factory compatible with OpenTelemetry's Tracer."""
+
+    def start_as_current_span(
+        self, name: str, *, attributes: Mapping[str, AttributeValue] | None = None
+    ) -> AbstractContextManager[Any]:
+        """Return a context manager that opens a span for its duration."""
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class QueryTimings:
+    """Milliseconds spent in each phase of a query.
+
+    Phase times add up over all attempts of a retried query; total_ms also
+    covers the backoff between attempts.
+
+    Attributes:
+        config_ms: Building the request config (near zero when prebuilt).
+        rate_limit_ms: Waiting for the client-side rate limiter.
+        network_ms: The API call, from request to complete response (for
+            streams, to the last chunk, including time the consumer spent
+            between chunks).
+        extract_ms: Validating candidates and extracting the response text.
+        grounding_ms: Converting grounding metadata into library types.
+        total_ms: The whole query, from start to result.
+        first_chunk_ms: Time to the first text chunk (streaming only).
+    """
+
+    config_ms: float = 0.0
+    rate_limit_ms: float = 0.0
+    network_ms: float = 0.0
+    extract_ms: float = 0.0
+    grounding_ms: float = 0.0
+    total_ms: float = 0.0
+    first_chunk_ms: float | None = None
+
+    def to_dict(self) -> dict[str, float]:
+        """Return the timings rounded to microseconds, omitting unset fields."""
+        data = {
+            "config_ms": self.config_ms,
+            "rate_limit_ms": self.rate_limit_ms,
+            "network_ms": self.network_ms,
+            "extract_ms": self.extract_ms,
+            "grounding_ms": self.grounding_ms,
+            "total_ms": self.total_ms,
+        }
+        if self.first_chunk_ms is not None:
+            data["first_chunk_ms"] = self.first_chunk_ms
+        return {name: round(value, 3) for name, value in data.items()}
+
+
+class PhaseTimer:
+    """Accumulates phase durations for one query and opens tracer spans.
+
+    Example:
+        >>> timer = PhaseTimer()
+        >>> with timer.phase(PHASE_CONFIG):
+        ...     config = build_config(None)
+        >>> timer.finish().config_ms
+        0.042
+    """
+
+    def __init__(self, tracer: Tracer | None = None) -> None:
+        """Start timing a query.
+
+        Args:
+            tracer: Optional tracer receiving a span per phase.
+        """
+        self.tracer = tracer
+        self._started = time.perf_counter()
+        self._phases: dict[str, float] = {}
+        self._first_chunk: float | None = None
+
+    def span(
+        self, name: str, attributes: Mapping[str, AttributeValue] | None = None
+    ) -> AbstractContextManager[Any]:
+        """Open a tracer span without recording a phase (no-op without a tracer)."""
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.start_as_current_span(
+            f"{SPAN_PREFIX}{name}", attributes=dict(attributes or {})
+        )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase and trace it as a span; repeated phases add up."""
+        start = time.perf_counter()
+        try:
+            with self.span(name):
+                yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record time spent in a phase that was measured by the caller."""
+        self._phases[name] = self._phases.get(name, 0.0) + seconds
+
+    def mark_first_chunk(self) -> None:
+        """Record the arrival of the first streamed text (only the first call counts)."""
+        if self._first_chunk is None:
+            self._first_chunk = time.perf_counter() - self._started
+
+    def finish(self) -> QueryTimings:
+        """Return the timings recorded so far, with the total up to now."""
+        phases = {name: seconds * 1000 for name, seconds in self._phases.items()}
+        return QueryTimings(
+            config_ms=phases.get(PHASE_CONFIG, 0.0),
+            rate_limit_ms=phases.get(PHASE_RATE_LIMIT, 0.0),
+            network_ms=phases.get(PHASE_NETWORK, 0.0),
+            extract_ms=phases.get(PHASE_EXTRACT, 0.0),
+            grounding_ms=phases.get(PHASE_GROUNDING, 0.0),
+            total_ms=(time.perf_counter() - self._started) * 1000,
+            first_chunk_ms=self._first_chunk * 1000 if self._first_chunk is not None else None,
+        )
+
+
+def set_span_attributes(span: Any, attributes: Mapping[str, AttributeValue]) -> None:
+    """Set attributes on a span if it supports them (OpenTelemetry spans do)."""
+    set_attribute = getattr(span, "set_attribute", None)
+    if set_attribute is not None:
+        for name, value in attributes.items():
+            set_attribute(name, value)
@@ -8,20 +8,86 @@ and has been reviewed and tested by a human.
 
 import json
 import sys
+import textwrap
+from collections.abc import Iterable
 
 import click
 
+from gemini_google_maps_tool.core.costs import RunUsage
+from gemini_google_maps_tool.core.maps import GroundingMetadata, TokenUsage
+from gemini_google_maps_tool.core.metrics import MetricsRegistry
+from gemini_google_maps_tool.core.tracing import QueryTimings
 
-def output_json(data: dict[str, object] | list[object]) -> None:
-    """Output JSON to stdout.
+# Output formats: pretty JSON, single-line JSON, one JSON record per line, markdown
+OUTPUT_FORMATS = ("json", "compact", "ndjson", "text")
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def output_json(data: dict[str, object] | list[object], output_format: str = "json") -> None:
+    """Output one JSON document to stdout.
 
     Args:
         data: Dictionary or list to serialize as JSON.
+        output_format: "json" pretty-prints with two-space indentation;
+            "compact" and "ndjson" write a single line without whitespace
+            ("ndjson" also flushes it).
 
     Example:
         >>> output_json({"status": "success", "count": 42})
     """
-    click.echo(json.dumps(data, indent=2))
+    if output_format == "json":
+        payload = json.dumps(data, indent=2)
+    else:
+        payload = json.dumps(data, separators=_COMPACT_SEPARATORS)
+    sys.stdout.write(payload + "\n")
+    if output_format == "ndjson":
+        sys.stdout.flush()
+
+
+def output_jsonl(data: dict[str, object]) -> None:
+    """Output a single compact JSON line to stdout and flush it.
+
+    Args:
+        data: Dictionary to serialize as one JSONL record.
+
+    Example:
+        >>> output_jsonl({"id": "1", "response_text": "..."})
+    """
+    sys.stdout.write(json.dumps(data, separators=_COMPACT_SEPARATORS) + "\n")
+    sys.stdout.flush()
+
+
+def output_records(records: Iterable[dict[str, object]], output_format: str = "json") -> None:
+    """Write records to stdout one at a time as the iterable produces them.
+
+    "ndjson" writes and flushes one line per record. "json" and "compact"
+    write a JSON array element by element, so the array is never built or
+    serialized as a whole; the output is identical to output_json(list).
+
+    Args:
+        records: Records to write.
+        output_format: One of "json", "compact" or "ndjson".
+
+    Example:
+        >>> output_records((place.to_dict() for place in places), "ndjson")
+    """
+    if output_format == "ndjson":
+        for record in records:
+            output_jsonl(record)
+        return
+
+    pretty = output_format == "json"
+    separator = ",\n" if pretty else ","
+    empty = True
+    for record in records:
+        sys.stdout.write(("[\n" if pretty else "[") if empty else separator)
+        if pretty:
+            sys.stdout.write(textwrap.indent(json.dumps(record, indent=2), "  "))
+        else:
+            sys.stdout.write(json.dumps(record, separators=_COMPACT_SEPARATORS))
+        empty = False
+    sys.stdout.write("[]\n" if empty else ("\n]\n" if pretty else "]\n"))
 
 
 def log_verbose(message: str, verbose: bool | int = True) -> None:
@@ -53,6 +119,68 @@ def log_error(message: str) -> None:
     click.echo(f"Error: {message}", err=True)
 
 
+def log_timings(timings: QueryTimings | None, usage: TokenUsage | None = None) -> None:
+    """Print a one-line timing (and token usage) summary to stderr.
+
+    Args:
+        timings: Per-phase timings; a result served from a cache has none.
+        usage: Optional token usage reported by the API.
+
+    Example:
+        >>> log_timings(result.timings, result.usage)
+        Timings: config 0.1 ms, rate_limit 0.0 ms, network 812.4 ms, ...
+    """
+    if timings is None:
+        click.echo("Timings: not measured (cached result)", err=True)
+        return
+    parts = [
+        f"{name.removesuffix('_ms')} {value:.1f} ms" for name, value in timings.to_dict().items()
+    ]
+    if usage is not None:
+        parts.append(f"tokens {usage.total_tokens}")
+    click.echo(f"Timings: {', '.join(parts)}", err=True)
+
+
+def log_run_usage(usage: RunUsage) -> None:
+    """Print a one-line summary of a run's API usage and estimated cost to stderr.
+
+    Args:
+        usage: Usage accumulated over the run.
+
+    Example:
+        >>> log_run_usage(budget.usage)
+        Usage: 120 requests, 43200 tokens, ~$3.0036 estimated
+    """
+    click.echo(
+        f"Usage: {usage.requests} requests, {usage.total_tokens} tokens, "
+        f"~${usage.cost:.4f} estimated",
+        err=True,
+    )
+
+
+def write_metrics(registry: MetricsRegistry, destination: str) -> None:
+    """Write metrics in Prometheus text format to a file, or to stdout for "-".
+
+    Failures are reported on stderr but never raised, so a metrics problem
+    cannot change the outcome of the command that produced them.
+
+    Args:
+        registry: Metrics to write.
+        destination: File path (replaced atomically) or "-" for stdout.
+
+    Example:
+        >>> write_metrics(metrics.registry, "/var/lib/node_exporter/gemini_maps.prom")
+    """
+    try:
+        if destination == "-":
+            sys.stdout.write(registry.render())
+            sys.stdout.flush()
+        else:
+            registry.write(destination)
+    except OSError as e:
+        log_error(f"Could not write metrics to {destination}: {e}")
+
+
 def read_stdin() -> str:
     """Read input from stdin.
 
@@ -78,7 +206,7 @@ def read_stdin() -> str:
 
 
 def output_markdown(
-    response_text: str, grounding_metadata: dict[str, object] | None = None
+    response_text: str, grounding_metadata: GroundingMetadata | None = None
 ) -> None:
     """Output markdown-formatted text to stdout.
 
@@ -87,22 +215,30 @@ def output_markdown(
         grounding_metadata: Optional grounding metadata with sources.
 
     Example:
-        >>> output_markdown("Best coffee shops...", {"grounding_chunks": [...]})
+        >>> output_markdown("Best coffee shops...", result.grounding_metadata)
     """
     # Output main response
     click.echo(response_text)
 
     # Output sources if available
-    if grounding_metadata and "grounding_chunks" in grounding_metadata:
-        chunks = grounding_metadata["grounding_chunks"]
-        if chunks and isinstance(chunks, list):
-            click.echo("\n---\n")
-            click.echo("## Sources\n")
-            for i, chunk in enumerate(chunks, 1):
-                if isinstance(chunk, dict):
-                    title = chunk.get("title", "Unknown")
-                    uri = chunk.get("uri", "")
-                    if uri:
-                        click.echo(f"{i}. [{title}]({uri})")
-                    else:
-                        click.echo(f"{i}. {title}")
+    output_sources(grounding_metadata)
+
+
+def output_sources(grounding_metadata: GroundingMetadata | None) -> None:
+    """Output the markdown Sources section for grounding chunks, if any.
+
+    Args:
+        grounding_metadata: Optional grounding metadata with sources.
+
+    Example:
+        >>> output_sources(result.grounding_metadata)
+    """
+    if grounding_metadata and grounding_metadata.grounding_chunks:
+        click.echo("\n---\n")
+        click.echo("## Sources\n")
+        for i, chunk in enumerate(grounding_metadata.grounding_chunks, 1):
+            title = chunk.title or "Unknown"
+            if chunk.uri:
+                click.echo(f"{i}. [{title}]({chunk.uri})")
+            else:
+                click.echo(f"{i}. {title}")
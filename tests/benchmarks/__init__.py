@@ -0,0 +1,5 @@
+"""Microbenchmarks for gemini-google-maps-tool hot paths.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
@@ -0,0 +1,54 @@
+"""Shared fixtures for the microbenchmarks.
+
+Provides realistic Gemini responses with large grounding metadata and a
+fake endpoint that serves them from pre-encoded bytes, so measurements
+cover the SDK and library code rather than building fixtures.
+
+The benchmarks use pytest-benchmark's `benchmark` fixture and are skipped
+when the plugin is not installed.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any, Protocol, TypeVar
+
+import httpx
+import pytest
+
+from tests.conftest import FakeGemini, make_response_body
+
+T = TypeVar("T")
+
+# A long answer citing many places, like a "plan a day in ..." response
+LARGE_TEXT = " ".join(f"Stop {i}: a well-reviewed place worth a visit." for i in range(60))
+LARGE_CHUNK_COUNT = 60
+LARGE_BODY = make_response_body(LARGE_TEXT, LARGE_CHUNK_COUNT)
+LARGE_PAYLOAD = json.dumps(LARGE_BODY).encode()
+
+
+class Benchmark(Protocol):
+    """The subset of pytest-benchmark's fixture used by the benchmarks."""
+
+    def __call__(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T: ...
+
+    def pedantic(
+        self,
+        target: Callable[..., T],
+        args: tuple[Any, ...] = (),
+        kwargs: dict[str, Any] | None = None,
+        rounds: int = 1,
+        iterations: int = 1,
+        warmup_rounds: int = 0,
+    ) -> T: ...
+
+
+@pytest.fixture
+def large_gemini(fake_gemini: FakeGemini) -> FakeGemini:
+    """Fake Gemini endpoint answering every request with LARGE_BODY."""
+    fake_gemini.responder = lambda _: httpx.Response(
+        200, content=LARGE_PAYLOAD, headers={"content-type": "application/json"}
+    )
+    return fake_gemini
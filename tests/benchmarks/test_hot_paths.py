@@ -0,0 +1,80 @@
+"""Microbenchmarks for query execution, parsing, serialization and CLI startup.
+
+Run with `make benchmark` to save a baseline and `make benchmark-compare`
+to fail on regressions against it.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import subprocess  # nosec B404 - runs the test interpreter only
+import sys
+
+import pytest
+from google.genai import types
+
+from gemini_google_maps_tool.core.maps import (
+    MapsQueryResult,
+    extract_grounding_metadata,
+    parse_lat_lon,
+    query_maps,
+)
+from tests.benchmarks.conftest import LARGE_BODY, LARGE_CHUNK_COUNT, Benchmark
+from tests.conftest import FakeGemini
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_parse_lat_lon(benchmark: Benchmark) -> None:
+    """Benchmark parsing and validating a coordinate string."""
+    assert benchmark(parse_lat_lon, "37.78193,-122.40476") == (37.78193, -122.40476)
+
+
+def test_extract_grounding_metadata(benchmark: Benchmark) -> None:
+    """Benchmark converting SDK grounding metadata into library dataclasses."""
+    response = types.GenerateContentResponse.model_validate(LARGE_BODY)
+    metadata = benchmark(extract_grounding_metadata, response)
+    assert metadata is not None
+    assert len(metadata.grounding_chunks) == LARGE_CHUNK_COUNT
+
+
+def test_query_maps_large_grounding(benchmark: Benchmark, large_gemini: FakeGemini) -> None:
+    """Benchmark a full query: request building, SDK round trip and parsing."""
+    client = large_gemini.client()
+    result = benchmark(
+        query_maps, client, "Plan a day in Rome", (41.9, 12.5), "gemini-2.5-flash", True
+    )
+    assert result.grounding_metadata is not None
+    assert len(result.grounding_metadata.grounding_chunks) == LARGE_CHUNK_COUNT
+
+
+def test_result_to_json(benchmark: Benchmark, large_gemini: FakeGemini) -> None:
+    """Benchmark serializing a large result to compact JSON."""
+    result = query_maps(large_gemini.client(), "Plan a day in Rome", include_grounding=True)
+
+    def serialize() -> str:
+        return json.dumps(result.to_dict(), separators=(",", ":"))
+
+    assert json.loads(benchmark(serialize))["response_text"] == result.response_text
+
+
+def test_result_from_json(benchmark: Benchmark, large_gemini: FakeGemini) -> None:
+    """Benchmark restoring a large result from its JSON form."""
+    result = query_maps(large_gemini.client(), "Plan a day in Rome", include_grounding=True)
+    payload = json.dumps(result.to_dict())
+
+    def deserialize() -> MapsQueryResult:
+        return MapsQueryResult.from_dict(json.loads(payload))
+
+    assert benchmark(deserialize) == result
+
+
+def test_cli_startup(benchmark: Benchmark) -> None:
+    """Benchmark a cold CLI start rendering --help in a fresh interpreter."""
+    command = [sys.executable, "-m", "gemini_google_maps_tool.cli", "--help"]
+
+    def run_cli() -> int:
+        return subprocess.run(command, capture_output=True, check=True).returncode  # nosec B603
+
+    assert benchmark.pedantic(run_cli, rounds=5, warmup_rounds=1) == 0
@@ -0,0 +1,180 @@
+"""Shared fixtures for gemini-google-maps-tool tests.
+
+Provides an in-process fake of the Gemini generateContent endpoint, wired
+into a real genai.Client through httpx's MockTransport, so the full SDK
+request/response path is exercised without network access.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from google import genai
+from google.genai import types
+
+from gemini_google_maps_tool.core.server import QueryDaemon
+
+
+def make_response_body(
+    text: str = "Here are some great places.",
+    chunk_count: int = 3,
+    with_candidates: bool = True,
+) -> dict[str, Any]:
+    """Build a realistic generateContent JSON body with Maps grounding."""
+    if not with_candidates:
+        return {"candidates": []}
+    chunks = [
+        {
+            "maps": {
+                "title": f"Place {i}",
+                "uri": f"https://maps.google.com/?cid={i}",
+                "placeId": f"places/ChIJ{i:08d}",
+            }
+        }
+        for i in range(chunk_count)
+    ]
+    supports = [
+        {
+            "segment": {"startIndex": 0, "endIndex": len(text), "text": text},
+            "groundingChunkIndices": [i],
+        }
+        for i in range(chunk_count)
+    ]
+    return {
+        "candidates": [
+            {
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "groundingMetadata": {
+                    "groundingChunks": chunks,
+                    "groundingSupports": supports,
+                    "googleMapsWidgetContextToken": "widgetcontent/token",
+                },
+            }
+        ],
+        "usageMetadata": {
+            "promptTokenCount": 12,
+            "candidatesTokenCount": 48,
+            "toolUsePromptTokenCount": 300,
+            "totalTokenCount": 360,
+        },
+    }
+
+
+def make_stream_response(texts: list[str], chunk_count: int = 3) -> httpx.Response:
+    """Build a streamGenerateContent SSE response; grounding arrives with the last chunk."""
+    events: list[dict[str, Any]] = []
+    for i, text in enumerate(texts):
+        body = make_response_body(text, chunk_count)
+        if i < len(texts) - 1:
+            del body["candidates"][0]["groundingMetadata"]
+            del body["usageMetadata"]
+        events.append(body)
+    payload = "".join(f"data: {json.dumps(event)}\r\n\r\n" for event in events)
+    return httpx.Response(
+        200, content=payload.encode(), headers={"content-type": "text/event-stream"}
+    )
+
+
+class FakeGemini:
+    """In-process fake Gemini endpoint that records requests and their models.
+
+    Also fakes the Batch API: a job stays running for batch_polls polls, then
+    ends in batch_state, answering each of its requests through responder.
+    Polls are answered with batch_poll_status when it is not 200.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self.models: list[str] = []
+        self.responder: Callable[[dict[str, Any]], httpx.Response] = lambda _: httpx.Response(
+            200, json=make_response_body()
+        )
+        self.batch_jobs: dict[str, dict[str, Any]] = {}
+        self.batch_polls = 1
+        self.batch_state = "BATCH_STATE_SUCCEEDED"
+        self.batch_poll_status = 200
+
+    def handle_batch(self, request: httpx.Request) -> httpx.Response:
+        # Create: POST /v1beta/models/{model}:batchGenerateContent, poll: GET /v1beta/batches/{id}
+        if request.method == "POST":
+            name = f"batches/{len(self.batch_jobs) + 1}"
+            self.batch_jobs[name] = {
+                "model": request.url.path.rsplit("/", 1)[-1].split(":")[0],
+                "requests": json.loads(request.content)["batch"]["inputConfig"]["requests"][
+                    "requests"
+                ],
+                "polls": 0,
+            }
+            return httpx.Response(200, json=self._batch_operation(name, "BATCH_STATE_PENDING"))
+        if self.batch_poll_status != 200:
+            error = {"code": self.batch_poll_status, "message": "Poll failed"}
+            return httpx.Response(self.batch_poll_status, json={"error": error})
+        name = request.url.path.split("/v1beta/", 1)[-1]
+        job = self.batch_jobs[name]
+        job["polls"] += 1
+        if job["polls"] <= self.batch_polls:
+            return httpx.Response(200, json=self._batch_operation(name, "BATCH_STATE_RUNNING"))
+        if self.batch_state != "BATCH_STATE_SUCCEEDED":
+            return httpx.Response(200, json=self._batch_operation(name, self.batch_state))
+        responses = []
+        for item in job["requests"]:
+            self.requests.append(item["request"])
+            self.models.append(job["model"])
+            response = self.responder(item["request"])
+            entry = {"response": response.json()} if response.is_success else response.json()
+            responses.append({**entry, "metadata": item.get("metadata", {})})
+        output = {"inlinedResponses": {"inlinedResponses": responses}}
+        return httpx.Response(200, json=self._batch_operation(name, self.batch_state, output))
+
+    def _batch_operation(
+        self, name: str, state: str, output: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        model = self.batch_jobs[name]["model"]
+        metadata: dict[str, Any] = {"name": name, "model": f"models/{model}", "state": state}
+        if output is not None:
+            metadata["output"] = output
+        return {"name": name, "metadata": metadata, "done": output is not None}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith(":batchGenerateContent") or "/batches/" in request.url.path:
+            return self.handle_batch(request)
+        body = json.loads(request.content) if request.content else {}
+        self.requests.append(body)
+        # Paths look like /v1beta/models/gemini-2.5-flash:generateContent
+        self.models.append(request.url.path.rsplit("/", 1)[-1].split(":")[0])
+        return self.responder(body)
+
+    def client(self) -> genai.Client:
+        transport = httpx.MockTransport(self.handle)
+        return genai.Client(
+            api_key="test-key",
+            http_options=types.HttpOptions(
+                httpx_client=httpx.Client(transport=transport),
+                httpx_async_client=httpx.AsyncClient(transport=transport),
+            ),
+        )
+
+
+@pytest.fixture
+def fake_gemini() -> FakeGemini:
+    """Fake Gemini endpoint; call .client() for a genai.Client bound to it."""
+    return FakeGemini()
+
+
+@pytest.fixture
+def daemon(fake_gemini: FakeGemini, tmp_path: Path) -> Iterator[QueryDaemon]:
+    """Run a QueryDaemon backed by the fake Gemini endpoint on a temporary socket."""
+    server = QueryDaemon(tmp_path / "daemon.sock", fake_gemini.client())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
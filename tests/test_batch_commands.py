@@ -0,0 +1,53 @@
+"""Tests for gemini_google_maps_tool.commands.batch_commands module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import batch_commands
+from tests.conftest import FakeGemini, make_response_body
+
+
+@pytest.fixture
+def batch_client(fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch) -> FakeGemini:
+    """Route the batch command to the fake Gemini endpoint."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(batch_commands, "get_async_client", lambda transport=None: client.aio)
+    return fake_gemini
+
+
+def test_batch_ordered_output(batch_client: FakeGemini) -> None:
+    """Test that --ordered emits one line per record in input order."""
+
+    def responder(body: dict[str, object]) -> httpx.Response:
+        text = body["contents"][0]["parts"][0]["text"]  # type: ignore[index]
+        return httpx.Response(200, json=make_response_body(f"answer {text}"))
+
+    batch_client.responder = responder
+    lines = [
+        json.dumps({"id": "a", "query": "one", "lat_lon": "52.37,4.89"}),
+        "not json",
+        json.dumps({"id": "c", "query": "three", "lat_lon": [1, 2], "model": "flash"}),
+    ]
+    result = CliRunner().invoke(main, ["batch", "--ordered", "-w", "2"], input="\n".join(lines))
+    assert result.exit_code == 0
+    output = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [line["id"] for line in output] == ["a", "2", "c"]
+    assert output[0]["response_text"] == "answer one"
+    assert "error" in output[1]
+    assert len(batch_client.requests) == 2
+
+
+def test_batch_grounding_flag(batch_client: FakeGemini) -> None:
+    """Test that --grounding includes grounding metadata per line."""
+    result = CliRunner().invoke(main, ["batch", "-g"], input='{"query": "coffee"}\n')
+    line = json.loads(result.stdout)
+    assert line["id"] == "1"
+    assert len(line["grounding_metadata"]["grounding_chunks"]) == 3
@@ -0,0 +1,130 @@
+"""Tests for gemini_google_maps_tool.core.batchjob module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import batch_commands
+from gemini_google_maps_tool.core.batchjob import run_batch_job
+from gemini_google_maps_tool.core.maps import MapsQueryRequest, MapsQueryResult, QueryError
+from tests.conftest import FakeGemini, make_response_body
+
+
+def test_run_batch_job_groups_models_and_polls_with_backoff(fake_gemini: FakeGemini) -> None:
+    """Test one job per model, grounded configs, backoff and results in request order."""
+    fake_gemini.batch_polls = 2
+    delays: list[float] = []
+    requests = [
+        MapsQueryRequest("Coffee", (52.37, 4.89), "gemini-2.5-flash-lite", True),
+        MapsQueryRequest("Museums", None, "gemini-2.5-flash"),
+        MapsQueryRequest("Plan a day", None, "auto"),
+        MapsQueryRequest("Tea", None, "gemini-2.5-flash-lite"),
+    ]
+
+    outcomes = run_batch_job(fake_gemini.client(), requests, sleep=delays.append)
+
+    assert sorted(job["model"] for job in fake_gemini.batch_jobs.values()) == [
+        "gemini-2.5-flash",
+        "gemini-2.5-flash-lite",
+    ]
+    assert delays == [10.0, 15.0, 22.5] * 2
+    coffee = fake_gemini.requests[0]
+    assert coffee["tools"] == [{"googleMaps": {}}]
+    assert "toolConfig" in coffee
+    assert isinstance(outcomes[0], MapsQueryResult)
+    assert outcomes[0].grounding_metadata is not None
+    assert outcomes[0].usage is not None and outcomes[0].usage.total_tokens == 360
+    assert isinstance(outcomes[1], MapsQueryResult)
+    assert outcomes[1].model == "gemini-2.5-flash"
+    assert outcomes[1].grounding_metadata is None
+    assert isinstance(outcomes[2], QueryError)
+    assert outcomes[2].reason == QueryError.REASON_INVALID_ARGUMENT
+    assert isinstance(outcomes[3], MapsQueryResult)
+
+
+def test_run_batch_job_reports_failed_requests_and_jobs(fake_gemini: FakeGemini) -> None:
+    """Test per-request errors, unusable responses and failed jobs."""
+
+    def responder(body: dict[str, object]) -> httpx.Response:
+        text = body["contents"][0]["parts"][0]["text"]  # type: ignore[index]
+        if text == "quota":
+            return httpx.Response(429, json={"error": {"code": 8, "message": "Quota"}})
+        return httpx.Response(200, json=make_response_body(with_candidates=text != "empty"))
+
+    fake_gemini.responder = responder
+    client = fake_gemini.client()
+    requests = [MapsQueryRequest(text) for text in ("quota", "empty", "coffee")]
+    outcomes = run_batch_job(client, requests, sleep=lambda _: None)
+    assert [getattr(outcome, "reason", None) for outcome in outcomes] == [
+        QueryError.REASON_RATE_LIMITED,
+        QueryError.REASON_NO_CANDIDATES,
+        None,
+    ]
+
+    fake_gemini.batch_state = "BATCH_STATE_EXPIRED"
+    outcomes = run_batch_job(client, requests, sleep=lambda _: None)
+    assert {getattr(outcome, "reason", None) for outcome in outcomes} == {QueryError.REASON_TIMEOUT}
+
+    fake_gemini.batch_polls = 100
+    outcomes = run_batch_job(client, requests[:1], timeout=30, sleep=lambda _: None)
+    assert isinstance(outcomes[0], QueryError)
+    assert "did not finish within 30s" in str(outcomes[0])
+
+
+def test_batch_command_batch_api(fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --batch-api submits a job and writes results in input order."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(batch_commands, "get_client", lambda transport=None: client)
+
+    lines = [
+        json.dumps({"id": "a", "query": "one", "model": "flash"}),
+        "not json",
+        json.dumps({"id": "c", "query": "three"}),
+    ]
+    result = CliRunner().invoke(
+        main, ["batch", "--batch-api", "--poll-interval", "0.001"], input="\n".join(lines)
+    )
+    assert result.exit_code == 0
+    output = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [line["id"] for line in output] == ["a", "2", "c"]
+    assert output[0]["response_text"] == "Here are some great places."
+    assert "error" in output[1]
+    assert len(fake_gemini.batch_jobs) == 2
+
+
+def test_batch_api_resumes_submitted_jobs_from_journal(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that a rerun waits for a journaled job instead of submitting it again."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(batch_commands, "get_client", lambda transport=None: client)
+    journal = tmp_path / "run.journal"
+    args = ["batch", "--batch-api", "--poll-interval", "0.001", "--journal", str(journal)]
+    records = '{"id": "a", "query": "one"}\n{"id": "b", "query": "two"}\n'
+
+    fake_gemini.batch_poll_status = 403
+    first = CliRunner().invoke(main, args, input=records)
+    assert first.exit_code == 0
+    assert all("error" in json.loads(line) for line in first.stdout.splitlines())
+    assert list(fake_gemini.batch_jobs) == ["batches/1"]
+
+    fake_gemini.batch_poll_status = 200
+    second = CliRunner().invoke(main, args, input=records)
+    assert second.exit_code == 0
+    output = [json.loads(line) for line in second.stdout.splitlines()]
+    assert [line["id"] for line in output] == ["a", "b"]
+    assert all("response_text" in line for line in output)
+    assert list(fake_gemini.batch_jobs) == ["batches/1"]
+
+    third = CliRunner().invoke(main, args, input=records)
+    assert third.stdout == second.stdout
+    assert len(fake_gemini.requests) == 2
+    assert not any('"job"' in line for line in journal.read_text().splitlines())
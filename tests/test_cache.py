@@ -0,0 +1,187 @@
+"""Tests for gemini_google_maps_tool.core.cache module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from gemini_google_maps_tool.core.cache import MemoryCache, ResponseCache
+from gemini_google_maps_tool.core.maps import MapsQueryResult, QueryError, query_maps
+from tests.conftest import FakeGemini, make_response_body
+
+
+def test_cache_round_trip_preserves_grounding(fake_gemini: FakeGemini, tmp_path: Path) -> None:
+    """Test that equivalent queries are served from cache with grounding intact."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    client = fake_gemini.client()
+    first = query_maps(client, "Coffee near me", include_grounding=True, cache=cache)
+    second = query_maps(client, "  coffee   NEAR me ", include_grounding=True, cache=cache)
+    assert len(fake_gemini.requests) == 1
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.grounding_metadata == first.grounding_metadata
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_discards_entries_in_another_format(tmp_path: Path) -> None:
+    """Test that reopening a cache written in an older payload format empties it."""
+    path = tmp_path / "cache.sqlite3"
+    cache = ResponseCache(path)
+    key = cache.key_for("coffee", None, "model", False)
+    cache.put(key, MapsQueryResult(response_text="Coffee"))
+    cache.close()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+    cache = ResponseCache(path)
+    assert cache.get(key) is None
+    cache.put(key, MapsQueryResult(response_text="Coffee"))
+    cache.close()
+    assert ResponseCache(path).get(key) == MapsQueryResult(response_text="Coffee", from_cache=True)
+
+
+def test_cache_negative_caching_only_for_empty_text(
+    fake_gemini: FakeGemini, tmp_path: Path
+) -> None:
+    """Test that empty-text failures are cached but missing candidates are not."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    client = fake_gemini.client()
+
+    fake_gemini.responder = lambda _: httpx.Response(200, json=make_response_body(text=""))
+    for _ in range(2):
+        with pytest.raises(QueryError) as exc_info:
+            query_maps(client, "empty", cache=cache)
+        assert exc_info.value.reason == QueryError.REASON_EMPTY_TEXT
+    assert len(fake_gemini.requests) == 1
+
+    fake_gemini.responder = lambda _: httpx.Response(
+        200, json=make_response_body(with_candidates=False)
+    )
+    for _ in range(2):
+        with pytest.raises(QueryError):
+            query_maps(client, "throttled", cache=cache)
+    assert len(fake_gemini.requests) == 3
+
+
+def test_cache_ttl_and_lru_eviction(tmp_path: Path) -> None:
+    """Test that expired entries miss and the oldest entries are evicted first."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=200)
+    keys = [cache.key_for(f"query {i}", None, "model", False) for i in range(3)]
+    cache.put(keys[0], MapsQueryResult(response_text="x" * 60), ttl=-1)
+    assert cache.get(keys[0]) is None
+
+    cache.put(keys[1], MapsQueryResult(response_text="y" * 60))
+    cache.put(keys[2], MapsQueryResult(response_text="z" * 60))
+    cache.put(keys[0], MapsQueryResult(response_text="x" * 60))
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.get(keys[0]) is not None
+
+
+def test_memory_cache_single_flight(fake_gemini: FakeGemini) -> None:
+    """Test that concurrent identical queries share one upstream request."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def responder(_: dict[str, object]) -> httpx.Response:
+        started.set()
+        release.wait(timeout=5)
+        return httpx.Response(200, json=make_response_body())
+
+    fake_gemini.responder = responder
+    client = fake_gemini.client()
+    cache = MemoryCache(max_entries=2)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(query_maps, client, "coffee", cache=cache) for _ in range(8)]
+        started.wait(timeout=5)
+        while cache.coalesced < 7:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(fake_gemini.requests) == 1
+    assert sum(not result.from_cache for result in results) == 1
+    assert query_maps(client, "Coffee", cache=cache).from_cache
+
+
+@pytest.mark.parametrize("disk", [False, True])
+def test_async_single_flight(tmp_path: Path, disk: bool) -> None:
+    """Test that concurrent identical async lookups share one computation and its errors."""
+    cache: MemoryCache | ResponseCache = (
+        ResponseCache(tmp_path / "cache.sqlite3") if disk else MemoryCache()
+    )
+    calls: list[str] = []
+
+    async def compute(text: str) -> MapsQueryResult:
+        calls.append(text)
+        await asyncio.sleep(0.05)
+        if text == "bad":
+            raise QueryError("Bad request", QueryError.REASON_INVALID_ARGUMENT)
+        return MapsQueryResult(text)
+
+    async def run(text: str, count: int) -> list[MapsQueryResult | BaseException]:
+        key = cache.key_for(text, None, "model", False)
+        return await asyncio.gather(
+            *(cache.get_or_compute_async(key, lambda: compute(text)) for _ in range(count)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run("coffee", 6))
+    assert calls == ["coffee"]
+    assert [result.from_cache for result in results if isinstance(result, MapsQueryResult)] == [
+        False,
+        *[True] * 5,
+    ]
+    assert cache.coalesced == 5
+    assert asyncio.run(run("coffee", 1)) == [MapsQueryResult("coffee", from_cache=True)]
+
+    errors = asyncio.run(run("bad", 3))
+    assert calls == ["coffee", "bad"]
+    assert all(isinstance(error, QueryError) for error in errors)
+
+
+def test_async_lookups_keep_database_access_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that get_or_compute_async() reads and writes the database in worker threads."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    threads: set[int] = set()
+    store = cache._store
+
+    def spy(*args: Any) -> None:
+        threads.add(threading.get_ident())
+        store(*args)
+
+    monkeypatch.setattr(cache, "_store", spy)
+    key = cache.key_for("coffee", None, "model", False)
+
+    async def compute() -> MapsQueryResult:
+        return MapsQueryResult("Coffee")
+
+    assert not asyncio.run(cache.get_or_compute_async(key, compute)).from_cache
+    assert threads and threading.get_ident() not in threads
+    assert cache.get(key) is not None
+
+
+def test_memory_cache_lru_bound() -> None:
+    """Test that the least recently used entry is evicted at capacity."""
+    cache = MemoryCache(max_entries=2)
+    keys = [cache.key_for(f"q{i}", None, "model", False) for i in range(3)]
+    cache.put(keys[0], MapsQueryResult(response_text="0"))
+    cache.put(keys[1], MapsQueryResult(response_text="1"))
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], MapsQueryResult(response_text="2"))
+    assert cache.get(keys[1]) is None
+    assert len(cache) == 2
@@ -0,0 +1,102 @@
+"""Tests for gemini_google_maps_tool.core.cassette module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+from google import genai
+from google.genai import types
+
+from gemini_google_maps_tool.core.cassette import Cassette, CassetteEntry, RecordingTransport
+from gemini_google_maps_tool.core.client import TransportOptions, create_client
+from gemini_google_maps_tool.core.maps import (
+    QueryError,
+    query_maps,
+    query_maps_async,
+    query_maps_stream,
+)
+from tests.conftest import FakeGemini, make_stream_response
+
+
+def _recording_client(fake_gemini: FakeGemini, path: Path) -> genai.Client:
+    """Client that sends requests to the fake endpoint and records them."""
+    mock = httpx.MockTransport(fake_gemini.handle)
+    transport = RecordingTransport(Cassette(path), mock, mock)
+    return genai.Client(
+        api_key="test-key",
+        http_options=types.HttpOptions(
+            httpx_client=httpx.Client(transport=transport),
+            httpx_async_client=httpx.AsyncClient(transport=transport),
+        ),
+    )
+
+
+@pytest.fixture
+def replay_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Replay without an API key, proving no real request can be authenticated."""
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+
+def test_replay_serves_recorded_responses_offline(
+    fake_gemini: FakeGemini, tmp_path: Path, replay_env: None
+) -> None:
+    """Test that a recorded query replays identically without reaching the endpoint."""
+    recorded = query_maps(
+        _recording_client(fake_gemini, tmp_path), "coffee", (52.37, 4.89), include_grounding=True
+    )
+    assert len(Cassette(tmp_path)) == 1
+    assert "test-key" not in next(tmp_path.glob("*.json")).read_text()
+
+    replay = create_client(TransportOptions(cassette=tmp_path, replay_latency=0.01))
+    replayed = query_maps(replay, "coffee", (52.37, 4.89), include_grounding=True)
+    replayed_async = asyncio.run(
+        query_maps_async(replay.aio, "coffee", (52.37, 4.89), include_grounding=True)
+    )
+    assert replayed == recorded
+    assert replayed_async == recorded
+    assert len(fake_gemini.requests) == 1
+
+
+def test_async_recording_writes_the_cassette_off_the_event_loop(
+    fake_gemini: FakeGemini, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that async requests are recorded from a worker thread."""
+    threads: set[int] = set()
+    put = Cassette.put
+
+    def spy(self: Cassette, key: str, request: httpx.Request, entry: CassetteEntry) -> None:
+        threads.add(threading.get_ident())
+        put(self, key, request, entry)
+
+    monkeypatch.setattr(Cassette, "put", spy)
+    client = _recording_client(fake_gemini, tmp_path)
+    asyncio.run(query_maps_async(client.aio, "coffee"))
+    assert len(Cassette(tmp_path)) == 1
+    assert threads and threading.get_ident() not in threads
+
+
+def test_replay_streams_recorded_sse(
+    fake_gemini: FakeGemini, tmp_path: Path, replay_env: None
+) -> None:
+    """Test that streamed responses are recorded and replayed chunk by chunk."""
+    fake_gemini.responder = lambda _: make_stream_response(["Visit ", "Cafe Central."])
+    recorded = list(query_maps_stream(_recording_client(fake_gemini, tmp_path), "coffee"))
+
+    replay = create_client(TransportOptions(cassette=tmp_path))
+    assert list(query_maps_stream(replay, "coffee")) == recorded == ["Visit ", "Cafe Central."]
+
+
+def test_replay_miss_fails_without_retrying(tmp_path: Path, replay_env: None) -> None:
+    """Test that an unrecorded request fails fast with a descriptive error."""
+    replay = create_client(TransportOptions(cassette=tmp_path))
+    with pytest.raises(QueryError) as exc_info:
+        query_maps(replay, "never recorded")
+    assert exc_info.value.reason == QueryError.REASON_INVALID_ARGUMENT
+    assert exc_info.value.attempts == 1
+    assert "No cassette entry" in str(exc_info.value)
@@ -0,0 +1,50 @@
+"""Tests for gemini_google_maps_tool.cli startup cost.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import os
+import re
+import subprocess  # nosec B404 - runs the test interpreter only
+import sys
+
+# Cumulative import time of the CLI module, excluding interpreter startup.
+# Importing google.genai alone takes well over this budget.
+IMPORT_BUDGET_US = int(os.environ.get("GEMINI_MAPS_IMPORT_BUDGET_US", "300000"))
+
+HEAVY_MODULES = ("google.genai", "httpx", "pydantic")
+
+
+def _run_python(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    """Run code in a fresh interpreter so nothing is imported beforehand."""
+    return subprocess.run(  # nosec B603 - fixed argument list
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_help_does_not_import_the_sdk() -> None:
+    """Test that rendering --help and --version leaves the Gemini SDK unloaded."""
+    code = (
+        "import sys\n"
+        "from gemini_google_maps_tool.cli import main\n"
+        "for args in (['--help'], ['query', '--help'], ['batch', '--help'], ['--version']):\n"
+        "    try:\n"
+        "        main(args)\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = _run_python(code)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_cli_import_time_budget() -> None:
+    """Test that importing the CLI stays within the cold-start budget."""
+    result = _run_python("import gemini_google_maps_tool.cli", "-X", "importtime")
+    match = re.search(r"\|\s*(\d+) \| gemini_google_maps_tool\.cli$", result.stderr, re.M)
+    assert match is not None
+    assert int(match.group(1)) < IMPORT_BUDGET_US
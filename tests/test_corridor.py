@@ -0,0 +1,95 @@
+"""Tests for gemini_google_maps_tool.core.corridor module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import corridor_commands
+from gemini_google_maps_tool.core.corridor import corridor_async, parse_route
+from gemini_google_maps_tool.core.sweep import BoundingBox
+from tests.conftest import FakeGemini, make_response_body
+
+# About 11.1 km due east along the equator
+ROUTE = [(0.0, 0.0), (0.0, 0.1)]
+
+
+def test_parse_route_reads_geojson_and_polylines() -> None:
+    """Test GeoJSON features (longitude first) and encoded polylines."""
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[4.9, 52.4]]}},
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [0, 0]}},
+            {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[5.1, 52.1]]}},
+        ],
+    }
+    assert parse_route(json.dumps(collection)) == [(52.4, 4.9), (52.1, 5.1)]
+    assert parse_route("_p~iF~ps|U_ulLnnqC")[1] == (40.7, -120.95)
+    for invalid in ('{"type": "Point", "coordinates": [0, 0]}', "{not json", "_p~iF~ps|U"):
+        with pytest.raises(ValueError):
+            parse_route(invalid)
+
+
+def test_corridor_samples_densely_and_orders_by_distance(fake_gemini: FakeGemini) -> None:
+    """Test dense-area spacing, de-duplication and ordering along the route."""
+
+    def responder(body: dict[str, Any]) -> httpx.Response:
+        longitude = body["toolConfig"]["retrievalConfig"]["lat_lng"]["longitude"]
+        chunk_count = 3 if longitude > 0.05 else 1
+        return httpx.Response(200, json=make_response_body(chunk_count=chunk_count))
+
+    fake_gemini.responder = responder
+    result = asyncio.run(
+        corridor_async(
+            fake_gemini.client().aio,
+            "EV chargers",
+            ROUTE,
+            spacing_m=5000,
+            dense_areas=[BoundingBox(-1, 0.05, 1, 0.2)],
+            dense_spacing_m=500,
+        )
+    )
+
+    assert [round(sample.distance_m) for sample in result.samples] == [
+        0,
+        5000,
+        10000,
+        10500,
+        11000,
+        11120,
+    ]
+    assert len(fake_gemini.requests) == 6
+    assert [place.chunk.place_id for place in result.places] == [
+        f"places/ChIJ{i:08d}" for i in range(3)
+    ]
+    assert [place.distance_m for place in result.places] == [0, 10000, 10000]
+    assert [place.hits for place in result.places] == [6, 4, 4]
+    assert round(result.length_m) == 11120
+
+
+def test_corridor_command_outputs_places(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the corridor command reads a polyline and prints places in route order."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(corridor_commands, "get_async_client", lambda transport=None: client.aio)
+
+    result = CliRunner().invoke(
+        main,
+        ["corridor", "EV chargers", "--polyline", "???_af@", "--spacing", "10000", "--text"],
+    )
+    assert result.exit_code == 0
+    assert result.stdout.startswith("1. [Place 0](https://maps.google.com/?cid=0) (km 0.0)")
+    assert "Queried 4 points over 22.2 km (0 failed), found 3 places" in result.stderr
+
+    result = CliRunner().invoke(main, ["corridor", "EV chargers"])
+    assert result.exit_code == 2
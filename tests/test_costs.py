@@ -0,0 +1,90 @@
+"""Tests for gemini_google_maps_tool.core.costs module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import batch_commands
+from gemini_google_maps_tool.core.costs import PRICING, Budget, RunUsage
+from gemini_google_maps_tool.core.maps import (
+    MapsQueryRequest,
+    MapsQueryResult,
+    QueryError,
+    TokenUsage,
+    query_many_async,
+)
+from tests.conftest import FakeGemini
+
+USAGE = TokenUsage(prompt_tokens=1000, cached_tokens=400, output_tokens=200, total_tokens=1200)
+
+
+def test_run_usage_prices_tokens_and_grounded_requests() -> None:
+    """Test per-model totals, cached-token pricing and that cached results are free."""
+    usage = RunUsage()
+    usage.record("gemini-2.5-flash", MapsQueryResult("a", usage=USAGE))
+    usage.record("gemini-2.5-flash", MapsQueryResult("b", usage=USAGE))
+    usage.record("gemini-2.5-flash", MapsQueryResult("c", usage=USAGE, from_cache=True))
+    usage.record("gemini-2.5-flash-lite", MapsQueryResult("d"))
+
+    per_flash = (600 * 0.30 + 400 * 0.03 + 200 * 2.50) / 1_000_000 + 0.025
+    assert usage.requests == 3
+    assert usage.total_tokens == 2400
+    assert usage.cost == pytest.approx(2 * per_flash + 0.025)
+    data = usage.to_dict()
+    assert data["models"]["gemini-2.5-flash"]["requests"] == 2
+    assert data["models"]["gemini-2.5-flash"]["output_tokens"] == 400
+    assert data["models"]["gemini-2.5-flash-lite"]["total_tokens"] == 0
+
+    unknown = RunUsage()
+    unknown.record("gemini-9-ultra", MapsQueryResult("e", usage=USAGE))
+    assert unknown.cost == pytest.approx(PRICING["gemini-2.5-flash"].cost(USAGE))
+
+
+def test_budget_stops_new_requests(fake_gemini: FakeGemini) -> None:
+    """Test that an exhausted budget fails the remaining queries without sending them."""
+    budget = Budget(max_tokens=700)
+    requests = [MapsQueryRequest(query=f"q{i}") for i in range(4)]
+    outcomes = asyncio.run(
+        query_many_async(fake_gemini.client().aio, requests, concurrency=1, budget=budget)
+    )
+
+    assert [isinstance(outcome, MapsQueryResult) for outcome in outcomes] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert all(
+        outcome.reason == QueryError.REASON_BUDGET_EXCEEDED
+        for outcome in outcomes
+        if isinstance(outcome, QueryError)
+    )
+    assert len(fake_gemini.requests) == 2
+    assert budget.usage.total_tokens == 720
+    with pytest.raises(ValueError):
+        Budget(max_cost=0)
+
+
+def test_batch_max_tokens_flushes_results_and_reports_usage(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that batch --max-tokens skips records past the budget and prints usage."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(batch_commands, "get_async_client", lambda transport=None: client.aio)
+    lines = "\n".join(json.dumps({"query": f"q{i}"}) for i in range(3))
+
+    result = CliRunner().invoke(
+        main, ["batch", "--ordered", "-w", "1", "--max-tokens", "100"], input=lines
+    )
+    assert result.exit_code == 0
+    output = [json.loads(line) for line in result.stdout.splitlines()]
+    assert output[0]["usage"]["total_tokens"] == 360
+    assert [line.get("reason") for line in output[1:]] == ["budget_exceeded"] * 2
+    assert "Usage: 1 requests, 360 tokens" in result.stderr
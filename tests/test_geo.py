@@ -0,0 +1,76 @@
+"""Tests for gemini_google_maps_tool.core.geo module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gemini_google_maps_tool.core.cache import MemoryCache, ResponseCache
+from gemini_google_maps_tool.core.geo import (
+    GeoGrid,
+    decode_polyline,
+    geohash_center,
+    geohash_encode,
+    haversine_m,
+    sample_polyline,
+)
+from gemini_google_maps_tool.core.maps import MapsQueryResult
+
+
+def test_geohash_known_value_and_center() -> None:
+    """Test geohash encoding against the reference example and decoding."""
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    lat, lon = geohash_center("u4pruydqqvj")
+    assert haversine_m((lat, lon), (57.64911, 10.40744)) < 1
+
+
+def test_decode_polyline_and_sample_along_it() -> None:
+    """Test polyline decoding against the reference example and sampling by distance."""
+    assert decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@") == [
+        (38.5, -120.2),
+        (40.7, -120.95),
+        (43.252, -126.453),
+    ]
+    with pytest.raises(ValueError):
+        decode_polyline("_p~iF~ps|U_")
+
+    samples = list(sample_polyline([(0, 0), (0, 0), (0, 0.05), (0, 0.1)], lambda _: 4000))
+    assert [round(distance) for _, distance in samples] == [0, 4000, 8000, 11120]
+    assert samples[-1][0] == (0, 0.1)
+    assert haversine_m((0, 0), samples[1][0]) == pytest.approx(4000)
+
+
+def test_nearby_centers_respects_radius() -> None:
+    """Test that fallback cells are within the radius and nearest first."""
+    point = (37.78193, -122.40476)
+    grid = GeoGrid(precision=7, max_distance_m=300)
+    centers = grid.nearby_centers(point)
+    assert centers[0] == grid.quantize(point)
+    distances = [haversine_m(point, center) for center in centers[1:]]
+    assert distances == sorted(distances)
+    assert all(distance <= 300 for distance in distances)
+    assert GeoGrid(precision=7).nearby_centers(point) == [grid.quantize(point)]
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_cache_shares_results_between_nearby_points(backend: str, tmp_path: Path) -> None:
+    """Test that points in the same or a nearby cell hit the same cache entry."""
+    grid = GeoGrid(precision=7, max_distance_m=400)
+    cache = (
+        MemoryCache(geo=grid)
+        if backend == "memory"
+        else ResponseCache(tmp_path / "cache.sqlite3", geo=grid)
+    )
+    cache.put(
+        cache.key_for("coffee", (37.78193, -122.40476), "model", False),
+        MapsQueryResult(response_text="cached"),
+    )
+    # ~20 m away: same cell
+    assert cache.get(cache.key_for("coffee", (37.78210, -122.40470), "model", False))
+    # ~250 m away: neighboring cell within the radius
+    assert cache.get(cache.key_for("coffee", (37.78418, -122.40476), "model", False))
+    # ~5 km away: no fallback
+    assert cache.get(cache.key_for("coffee", (37.8269, -122.40476), "model", False)) is None
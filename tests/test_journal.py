@@ -0,0 +1,136 @@
+"""Tests for gemini_google_maps_tool.core.journal module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import batch_commands
+from gemini_google_maps_tool.core.journal import RunJournal, request_fingerprint
+from gemini_google_maps_tool.core.maps import MapsQueryRequest
+from tests.conftest import FakeGemini, make_response_body
+
+
+@pytest.fixture
+def batch_client(fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch) -> FakeGemini:
+    """Route the batch command to the fake Gemini endpoint."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(batch_commands, "get_async_client", lambda transport=None: client.aio)
+    return fake_gemini
+
+
+def test_journal_drops_torn_entry_and_compacts(tmp_path: Path) -> None:
+    """Test reopening after a torn write, fingerprint checks and compaction."""
+    path = tmp_path / "run.journal"
+    key_a = request_fingerprint(MapsQueryRequest("coffee"))
+    key_b = request_fingerprint(MapsQueryRequest("tea"))
+    assert key_a != request_fingerprint(MapsQueryRequest("coffee", model="gemini-2.5-pro"))
+
+    with RunJournal(path) as journal:
+        journal.append("a", key_a, {"id": "a", "response_text": "old"})
+        journal.append("a", key_a, {"id": "a", "response_text": "new"})
+        journal.append("b", key_b, {"id": "b", "response_text": "tea"})
+    with path.open("a") as f:
+        f.write('{"id": "c", "key": "')
+
+    with RunJournal(path) as journal:
+        assert len(journal) == 2
+        assert journal.get("a", key_a) == {"id": "a", "response_text": "new"}
+        assert journal.get("a", key_b) is None
+        assert journal.compact([("b", key_b), ("c", key_a)]) == 1
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": "b", "key": key_b, "result": {"id": "b", "response_text": "tea"}}
+    ]
+
+
+def test_batch_resumes_from_journal(batch_client: FakeGemini, tmp_path: Path) -> None:
+    """Test that a rerun only sends the records that failed or were never answered."""
+    failing = {"two"}
+
+    def responder(body: dict[str, object]) -> httpx.Response:
+        text = body["contents"][0]["parts"][0]["text"]  # type: ignore[index]
+        if text in failing:
+            return httpx.Response(400, json={"error": {"code": 400, "message": "Bad"}})
+        return httpx.Response(200, json=make_response_body(f"answer {text}"))
+
+    batch_client.responder = responder
+    journal = tmp_path / "run.journal"
+    records = "\n".join(
+        json.dumps({"id": str(i), "query": q}) for i, q in enumerate(["one", "two"])
+    )
+    args = ["batch", "--ordered", "--max-attempts", "1", "--journal", str(journal)]
+
+    first = CliRunner().invoke(main, args, input=records)
+    assert first.exit_code == 0
+    assert ["error" in json.loads(line) for line in first.stdout.splitlines()] == [False, True]
+
+    failing.clear()
+    batch_client.requests.clear()
+    second = CliRunner().invoke(main, args, input=records)
+    assert second.exit_code == 0
+    output = [json.loads(line) for line in second.stdout.splitlines()]
+    assert [line["response_text"] for line in output] == ["answer one", "answer two"]
+    assert len(batch_client.requests) == 1
+    assert len(journal.read_text().splitlines()) == 2
+
+
+def test_batch_reruns_edited_records(batch_client: FakeGemini, tmp_path: Path) -> None:
+    """Test that a record whose query changed is not answered from the journal."""
+    journal = tmp_path / "run.journal"
+    args = ["batch", "--journal", str(journal)]
+    CliRunner().invoke(main, args, input='{"id": "a", "query": "coffee"}\n')
+    CliRunner().invoke(main, args, input='{"id": "a", "query": "coffee"}\n')
+    assert len(batch_client.requests) == 1
+
+    result = CliRunner().invoke(main, args, input='{"id": "a", "query": "tea"}\n')
+    assert result.exit_code == 0
+    assert len(batch_client.requests) == 2
+    entry = json.loads(journal.read_text())
+    assert entry["key"] == request_fingerprint(MapsQueryRequest("tea"))
+
+
+def test_batch_reports_unusable_journal_and_index(
+    batch_client: FakeGemini, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that journal and place index failures are reported as such, unsent."""
+    blocker = tmp_path / "file"
+    blocker.touch()
+    journal = blocker / "run.journal"
+    result = CliRunner().invoke(main, ["batch", "--journal", str(journal)], input='{"query": "a"}')
+    assert result.exit_code == 1
+    assert f"Cannot use journal {journal}" in result.stderr
+
+    monkeypatch.setenv("GEMINI_MAPS_PLACES_DB", str(tmp_path))
+    result = CliRunner().invoke(main, ["batch", "--index-places"], input='{"query": "a"}')
+    assert result.exit_code == 1
+    assert "Cannot open the place index" in result.stderr
+    assert batch_client.requests == []
+
+
+def test_batch_rejects_duplicate_ids(batch_client: FakeGemini, tmp_path: Path) -> None:
+    """Test that a reused id is reported instead of overwriting the journal entry."""
+    journal = tmp_path / "run.journal"
+    args = ["batch", "--ordered", "--journal", str(journal)]
+    records = "\n".join(
+        json.dumps({"id": record_id, "query": query})
+        for record_id, query in [("a", "one"), ("a", "two"), ("b", "three")]
+    )
+
+    first = CliRunner().invoke(main, args, input=records)
+    assert first.exit_code == 0
+    output = [json.loads(line) for line in first.stdout.splitlines()]
+    assert [line["id"] for line in output] == ["a", "a", "b"]
+    assert "duplicate id 'a' (first used on line 1)" in str(output[1]["error"])
+    assert len(batch_client.requests) == 2
+
+    second = CliRunner().invoke(main, args, input=records)
+    assert second.stdout == first.stdout
+    assert len(batch_client.requests) == 2
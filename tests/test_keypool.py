@@ -0,0 +1,100 @@
+"""Tests for gemini_google_maps_tool.core.keypool module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+from google import genai
+from google.genai import types
+
+from gemini_google_maps_tool.core.client import load_api_keys
+from gemini_google_maps_tool.core.keypool import API_KEY_HEADER, KeyPool, KeyPoolTransport
+from gemini_google_maps_tool.core.maps import query_maps, query_maps_async
+from tests.conftest import make_response_body
+
+
+def test_key_pool_prefers_least_loaded_usable_key() -> None:
+    """Test least-loaded selection and that throttled keys sit out their cooldown."""
+    now = [0.0]
+    pool = KeyPool(["key-a", "key-b", "key-a"], clock=lambda: now[0])
+    assert len(pool) == 2
+    assert [pool.acquire(), pool.acquire()] == ["key-a", "key-b"]
+    pool.release("key-a", "rate_limited", retry_after=10)
+    pool.release("key-b")
+
+    assert pool.acquire() == "key-b"
+    assert pool.acquire(exclude=["key-b"]) is None
+    pool.release("key-b")
+    now[0] = 11.0
+    assert pool.acquire(exclude=["key-b"]) == "key-a"
+    pool.release("key-a", "auth")
+    assert pool.stats()[0] == {
+        "key": "...ey-a",
+        "in_flight": 0,
+        "requests": 2,
+        "throttled": 1,
+        "auth_failures": 1,
+        "cooldown_s": 600.0,
+    }
+
+    with pytest.raises(ValueError):
+        KeyPool([])
+
+
+def test_transport_fails_over_to_other_keys() -> None:
+    """Test that a throttled and a rejected key shift the request to a working key."""
+    keys_seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = request.headers[API_KEY_HEADER]
+        keys_seen.append(key)
+        if key == "key-a":
+            error = {"code": 429, "status": "RESOURCE_EXHAUSTED", "message": "Quota"}
+            retry = {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "42s"}
+            return httpx.Response(429, json={"error": {**error, "details": [retry]}})
+        if key == "key-b":
+            details = [{"reason": "API_KEY_INVALID"}]
+            error = {"code": 400, "status": "INVALID_ARGUMENT", "details": details}
+            return httpx.Response(400, json={"error": {**error, "message": "Bad key"}})
+        return httpx.Response(200, json=make_response_body())
+
+    pool = KeyPool(["key-a", "key-b", "key-c"])
+    transport = KeyPoolTransport(pool, httpx.MockTransport(handler), httpx.MockTransport(handler))
+    client = genai.Client(
+        api_key="unused",
+        http_options=types.HttpOptions(
+            httpx_client=httpx.Client(transport=transport),
+            httpx_async_client=httpx.AsyncClient(transport=transport),
+        ),
+    )
+
+    assert query_maps(client, "Coffee in Delft").response_text == "Here are some great places."
+    assert keys_seen == ["key-a", "key-b", "key-c"]
+    stats = {entry["key"]: entry for entry in pool.stats()}
+    assert stats["...ey-a"]["cooldown_s"] == pytest.approx(42, abs=1)
+    assert stats["...ey-b"]["auth_failures"] == 1
+
+    keys_seen.clear()
+    asyncio.run(query_maps_async(client.aio, "Tea in Delft"))
+    assert keys_seen == ["key-c"]
+
+
+def test_load_api_keys_combines_env_and_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test reading keys from GEMINI_API_KEYS and GEMINI_API_KEYS_FILE."""
+    keys_file = tmp_path / "keys.txt"
+    keys_file.write_text("# project c\nkey-c\n\nkey-a\n")
+    monkeypatch.setenv("GEMINI_API_KEY", "single")
+    monkeypatch.setenv("GEMINI_API_KEYS", "key-a, key-b")
+    monkeypatch.setenv("GEMINI_API_KEYS_FILE", str(keys_file))
+    assert load_api_keys() == ["key-a", "key-b", "key-c"]
+
+    monkeypatch.delenv("GEMINI_API_KEYS")
+    monkeypatch.delenv("GEMINI_API_KEYS_FILE")
+    assert load_api_keys() == ["single"]
@@ -0,0 +1,146 @@
+"""Tests for gemini_google_maps_tool.core.maps module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+
+import httpx
+import pytest
+from google import genai
+from google.genai import types
+
+from gemini_google_maps_tool.core.cache import MemoryCache, ResponseCache
+from gemini_google_maps_tool.core.maps import (
+    MapsQueryRequest,
+    MapsQueryResult,
+    QueryError,
+    RequestKey,
+    query_many_async,
+    query_maps,
+    query_maps_async,
+    query_maps_stream,
+)
+from tests.conftest import FakeGemini, make_response_body, make_stream_response
+
+
+def test_query_maps_with_grounding(fake_gemini: FakeGemini) -> None:
+    """Test that query_maps sends location context and parses grounding."""
+    result = query_maps(
+        fake_gemini.client(), "coffee", lat_lon=(37.7, -122.4), include_grounding=True
+    )
+    assert result.response_text == "Here are some great places."
+    assert result.grounding_metadata is not None
+    assert len(result.grounding_metadata.grounding_chunks) == 3
+    sent = fake_gemini.requests[0]
+    assert sent["toolConfig"]["retrievalConfig"]["lat_lng"] == {
+        "latitude": 37.7,
+        "longitude": -122.4,
+    }
+
+
+def test_result_to_dict_round_trips_through_json(fake_gemini: FakeGemini) -> None:
+    """Test that to_dict() output survives JSON and from_dict() rebuilds the result."""
+    result = query_maps(fake_gemini.client(), "coffee", include_grounding=True)
+    data = json.loads(json.dumps(result.to_dict()))
+    assert data["grounding_metadata"]["grounding_chunks"][0] == {
+        "title": "Place 0",
+        "uri": "https://maps.google.com/?cid=0",
+        "place_id": "places/ChIJ00000000",
+    }
+    assert MapsQueryResult.from_dict(data) == result
+    assert result.to_dict(include_grounding=False) == {"response_text": result.response_text}
+
+
+def test_query_maps_async_matches_sync(fake_gemini: FakeGemini) -> None:
+    """Test that the async path shares parsing with the sync path."""
+    client = fake_gemini.client()
+    sync_result = query_maps(client, "coffee", include_grounding=True)
+    async_result = asyncio.run(query_maps_async(client.aio, "coffee", include_grounding=True))
+    assert async_result == sync_result
+
+
+def test_query_many_async_keeps_order_and_errors(fake_gemini: FakeGemini) -> None:
+    """Test that fan-out preserves input order and returns QueryErrors."""
+
+    def responder(body: dict[str, object]) -> httpx.Response:
+        text = body["contents"][0]["parts"][0]["text"]  # type: ignore[index]
+        return httpx.Response(200, json=make_response_body(text, with_candidates=text != "bad"))
+
+    fake_gemini.responder = responder
+    requests = [MapsQueryRequest(query=q) for q in ["a", "bad", "c", "d"]]
+    outcomes = asyncio.run(query_many_async(fake_gemini.client().aio, requests, concurrency=2))
+    assert [o.response_text for o in outcomes if isinstance(o, MapsQueryResult)] == ["a", "c", "d"]
+    assert isinstance(outcomes[1], QueryError)
+
+
+def test_query_many_async_wraps_unexpected_errors(fake_gemini: FakeGemini) -> None:
+    """Test that an exception other than QueryError still yields one outcome per request."""
+
+    class BrokenCache(MemoryCache):
+        def key_for(
+            self,
+            query: str,
+            lat_lon: tuple[float, float] | None,
+            model: str,
+            include_grounding: bool,
+        ) -> RequestKey:
+            if query == "broken":
+                raise sqlite3.OperationalError("database is locked")
+            return super().key_for(query, lat_lon, model, include_grounding)
+
+    requests = [MapsQueryRequest(query=q) for q in ["a", "broken", "c"]]
+    outcomes = asyncio.run(
+        query_many_async(fake_gemini.client().aio, requests, concurrency=1, cache=BrokenCache())
+    )
+    assert len(outcomes) == 3
+    assert isinstance(outcomes[1], QueryError)
+    assert outcomes[1].reason == QueryError.REASON_UNEXPECTED
+    assert isinstance(outcomes[2], MapsQueryResult)
+
+
+@pytest.mark.parametrize("disk", [False, True])
+def test_query_many_async_sends_duplicate_queries_once(
+    fake_gemini: FakeGemini, tmp_path: Path, disk: bool
+) -> None:
+    """Test that identical queries in one run share a single upstream request."""
+
+    async def slow_handle(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return fake_gemini.handle(request)
+
+    client = genai.Client(
+        api_key="test-key",
+        http_options=types.HttpOptions(
+            httpx_async_client=httpx.AsyncClient(transport=httpx.MockTransport(slow_handle))
+        ),
+    )
+    cache: MemoryCache | ResponseCache = (
+        ResponseCache(tmp_path / "cache.sqlite3") if disk else MemoryCache()
+    )
+    requests = [MapsQueryRequest("coffee") for _ in range(5)] + [MapsQueryRequest("tea")]
+    outcomes = asyncio.run(query_many_async(client.aio, requests, concurrency=6, cache=cache))
+    assert len(fake_gemini.requests) == 2
+    assert [getattr(outcome, "from_cache", None) for outcome in outcomes].count(False) == 2
+
+
+def test_query_many_async_rejects_zero_concurrency(fake_gemini: FakeGemini) -> None:
+    """Test that a concurrency below one is rejected."""
+    with pytest.raises(ValueError):
+        asyncio.run(query_many_async(fake_gemini.client().aio, [], concurrency=0))
+
+
+def test_query_maps_stream_yields_chunks_then_result(fake_gemini: FakeGemini) -> None:
+    """Test that streaming yields text chunks and assembles grounding at the end."""
+    fake_gemini.responder = lambda _: make_stream_response(["Try ", "Cafe ", "Central."])
+    stream = query_maps_stream(fake_gemini.client(), "coffee", include_grounding=True)
+    with pytest.raises(RuntimeError):
+        _ = stream.result
+    assert list(stream) == ["Try ", "Cafe ", "Central."]
+    assert stream.result.response_text == "Try Cafe Central."
+    assert stream.result.grounding_metadata is not None
+    assert len(stream.result.grounding_metadata.grounding_chunks) == 3
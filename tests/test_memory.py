@@ -0,0 +1,74 @@
+"""Memory benchmark for grounding result objects.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import gc
+import tracemalloc
+
+from gemini_google_maps_tool.core.maps import (
+    GroundingChunk,
+    GroundingChunkPool,
+    GroundingMetadata,
+    MapsQueryResult,
+)
+
+RESULT_COUNT = 2_000
+CHUNKS_PER_RESULT = 10
+DISTINCT_PLACES = 200
+
+
+def _make_results(pool: GroundingChunkPool | None) -> list[MapsQueryResult]:
+    """Build results the way parsing does: fresh strings for every chunk."""
+    results = []
+    for i in range(RESULT_COUNT):
+        chunks = []
+        for j in range(CHUNKS_PER_RESULT):
+            place = (i * 7 + j) % DISTINCT_PLACES
+            chunks.append(
+                GroundingChunk(
+                    title=f"Place number {place}",
+                    uri=f"https://maps.google.com/?cid={place:020d}",
+                    place_id=f"places/ChIJ{place:024d}",
+                )
+            )
+        result = MapsQueryResult("text", GroundingMetadata(chunks, [], None))
+        results.append(pool.intern_result(result) if pool is not None else result)
+    return results
+
+
+def _retained_bytes(pool: GroundingChunkPool | None) -> tuple[int, list[MapsQueryResult]]:
+    """Return the memory retained by a batch of results (and the results)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        results = _make_results(pool)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return retained, results
+
+
+def test_grounding_objects_have_no_instance_dict() -> None:
+    """Test that grounding dataclasses are slotted."""
+    chunk = GroundingChunk("Cafe", "https://maps.google.com/?cid=1", "places/1")
+    assert not hasattr(chunk, "__dict__")
+    assert not hasattr(GroundingMetadata([chunk], [], None), "__dict__")
+
+
+def test_interning_reduces_memory() -> None:
+    """Test that a chunk pool shares repeated places and cuts retained memory."""
+    plain, plain_results = _retained_bytes(None)
+    del plain_results
+    pool = GroundingChunkPool()
+    pooled, pooled_results = _retained_bytes(pool)
+
+    assert len(pool) == DISTINCT_PLACES
+    first = pooled_results[0].grounding_metadata
+    again = pooled_results[DISTINCT_PLACES].grounding_metadata  # same first place
+    assert first is not None and again is not None
+    assert again.grounding_chunks[0] is first.grounding_chunks[0]
+    print(f"retained: plain={plain / 1e6:.1f} MB, interned={pooled / 1e6:.1f} MB")
+    assert pooled < plain * 0.5
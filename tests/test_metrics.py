@@ -0,0 +1,105 @@
+"""Tests for gemini_google_maps_tool.core.metrics module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import batch_commands
+from gemini_google_maps_tool.core.cache import MemoryCache
+from gemini_google_maps_tool.core.maps import QueryError, query_maps
+from gemini_google_maps_tool.core.metrics import MetricsRegistry, QueryMetrics
+from gemini_google_maps_tool.core.server import QueryDaemon, query_via_daemon
+from tests.conftest import FakeGemini
+
+MODEL = "gemini-2.5-flash-lite"
+
+
+def test_registry_renders_prometheus_text() -> None:
+    """Test counter, gauge and cumulative histogram output with escaped labels."""
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs run.", ["name"]).inc(2, name='say "hi"\n')
+    registry.gauge("workers", "Busy workers.").set(3)
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=[0.5, 1])
+    for value in (0.2, 0.7, 3):
+        latency.observe(value)
+
+    assert registry.render() == (
+        "# HELP jobs_total Jobs run.\n"
+        "# TYPE jobs_total counter\n"
+        'jobs_total{name="say \\"hi\\"\\n"} 2\n'
+        "# HELP workers Busy workers.\n"
+        "# TYPE workers gauge\n"
+        "workers 3\n"
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{le="0.5"} 1\n'
+        'latency_seconds_bucket{le="1"} 2\n'
+        'latency_seconds_bucket{le="+Inf"} 3\n'
+        "latency_seconds_sum 3.9\n"
+        "latency_seconds_count 3\n"
+    )
+    assert registry.counter("jobs_total", "Jobs run.", ["name"]).value(name='say "hi"\n') == 2
+    with pytest.raises(ValueError):
+        registry.gauge("jobs_total", "Jobs run.", ["name"])
+    with pytest.raises(ValueError):
+        registry.counter("jobs_total", "Jobs run.", ["name"]).inc(status="ok")
+
+
+def test_query_metrics_count_outcomes_cache_and_tokens(fake_gemini: FakeGemini) -> None:
+    """Test that queries record successes, cache hits, errors by reason and tokens."""
+    client = fake_gemini.client()
+    metrics = QueryMetrics()
+    cache = MemoryCache()
+    query_maps(client, "coffee", cache=cache, metrics=metrics)
+    query_maps(client, "coffee", cache=cache, metrics=metrics)
+    fake_gemini.responder = lambda _: httpx.Response(
+        429, json={"error": {"code": 429, "message": "quota", "status": "RESOURCE_EXHAUSTED"}}
+    )
+    with pytest.raises(QueryError):
+        query_maps(client, "tea", metrics=metrics)
+
+    assert metrics.requests.value(model=MODEL, outcome="success") == 2
+    assert metrics.requests.value(model=MODEL, outcome="error") == 1
+    assert metrics.errors.value(model=MODEL, reason="rate_limited") == 1
+    assert metrics.cache_requests.value(model=MODEL, result="hit") == 1
+    assert metrics.cache_requests.value(model=MODEL, result="miss") == 1
+    assert metrics.tokens.value(model=MODEL, kind="total") == 360
+    assert metrics.latency.count(model=MODEL) == 2
+    assert metrics.phases.count(phase="network") == 1
+    assert metrics.in_flight.value() == 0
+
+
+def test_batch_writes_metrics_file(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that batch --metrics-file writes the run's metrics when it ends."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(batch_commands, "get_async_client", lambda transport=None: client.aio)
+    lines = "\n".join(json.dumps({"query": f"q{i}"}) for i in range(3))
+    path = tmp_path / "metrics" / "gemini_maps.prom"
+
+    result = CliRunner().invoke(main, ["batch", "--metrics-file", str(path)], input=lines)
+    assert result.exit_code == 0
+    text = path.read_text()
+    assert f'gemini_maps_requests_total{{model="{MODEL}",outcome="success"}} 3' in text
+    assert f'gemini_maps_request_duration_seconds_count{{model="{MODEL}"}} 3' in text
+    assert "gemini_maps_in_flight_requests 0" in text
+
+
+def test_daemon_serves_metrics(daemon: QueryDaemon) -> None:
+    """Test that the daemon exposes the metrics of the queries it served."""
+    assert query_via_daemon("coffee", socket_path=daemon.socket_path) is not None
+    transport = httpx.HTTPTransport(uds=str(daemon.socket_path))
+    with httpx.Client(transport=transport) as http:
+        response = http.get("http://daemon/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert f'gemini_maps_requests_total{{model="{MODEL}",outcome="success"}} 1' in response.text
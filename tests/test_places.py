@@ -0,0 +1,81 @@
+"""Tests for gemini_google_maps_tool.core.places module and the places command.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import query_commands
+from gemini_google_maps_tool.core.maps import GroundingChunk
+from gemini_google_maps_tool.core.places import PlaceIndex
+from tests.conftest import FakeGemini
+
+BAKERY = GroundingChunk(
+    title="Bakkerij Jansen", uri="https://maps.google.com/?cid=1", place_id="places/ChIJ1"
+)
+CAFE = GroundingChunk(
+    title="Café de Jaren", uri="https://maps.google.com/?cid=2", place_id="places/ChIJ2"
+)
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> PlaceIndex:
+    """A place index with two places from two queries."""
+    index = PlaceIndex(tmp_path / "places.sqlite3")
+    index.add([BAKERY, CAFE], "Breakfast in Utrecht", lat_lon=(52.09, 5.12))
+    index.add([BAKERY, BAKERY], "Best bread near the Dom")
+    return index
+
+
+def test_index_merges_repeat_sightings(index: PlaceIndex) -> None:
+    """Test that a place cited by several queries is stored once with its queries."""
+    assert len(index) == 2
+    record = index.get("places/ChIJ1")
+    assert record is not None
+    assert record.uri == BAKERY.uri
+    assert record.seen_count == 2
+    assert record.queries == ("Best bread near the Dom", "Breakfast in Utrecht")
+    assert record.last_lat_lon is None
+    assert index.get("places/unknown") is None
+
+
+def test_search_matches_titles_queries_and_typos(index: PlaceIndex) -> None:
+    """Test prefix, diacritic-insensitive, query-text and fuzzy matching."""
+    assert [r.title for r in index.search("bakk")] == ["Bakkerij Jansen"]
+    assert [r.title for r in index.search("cafe jaren")] == ["Café de Jaren"]
+    assert {r.title for r in index.search("utrecht")} == {"Bakkerij Jansen", "Café de Jaren"}
+    assert [r.title for r in index.search("bakerij jansn")] == ["Bakkerij Jansen"]
+    assert index.search("bakerij jansn", fuzzy=False) == []
+    assert index.search("museum") == []
+
+
+def test_query_index_places_then_search_offline(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that query --index-places feeds the index the places command reads."""
+    monkeypatch.setenv("GEMINI_MAPS_SOCKET", str(tmp_path / "absent.sock"))
+    monkeypatch.setenv("GEMINI_MAPS_PLACES_DB", str(tmp_path / "places.sqlite3"))
+    client = fake_gemini.client()
+    monkeypatch.setattr(query_commands, "get_client", lambda transport=None: client)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["query", "Coffee in Delft", "--index-places"])
+    assert result.exit_code == 0
+    assert "grounding_metadata" not in json.loads(result.output)
+
+    result = runner.invoke(main, ["places", "place", "--limit", "2"])
+    assert result.exit_code == 0
+    places = json.loads(result.output)
+    assert len(places) == 2
+    assert places[0]["queries"] == ["Coffee in Delft"]
+
+    result = runner.invoke(main, ["places", "--place-id", "places/ChIJ00000001", "--text"])
+    assert result.exit_code == 0
+    assert "[Place 1](https://maps.google.com/?cid=1)" in result.output
+    assert len(fake_gemini.requests) == 1
@@ -0,0 +1,65 @@
+"""Tests for gemini_google_maps_tool.commands.query_commands module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import query_commands
+from tests.conftest import FakeGemini, make_stream_response
+
+
+@pytest.fixture
+def query_client(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> FakeGemini:
+    """Route the query command to the fake Gemini endpoint (with no daemon running)."""
+    monkeypatch.setenv("GEMINI_MAPS_SOCKET", str(tmp_path / "absent.sock"))
+    client = fake_gemini.client()
+    monkeypatch.setattr(query_commands, "get_client", lambda transport=None: client)
+    return fake_gemini
+
+
+def test_query_stream_prints_text_then_sources(query_client: FakeGemini) -> None:
+    """Test that --stream writes the streamed text followed by the Sources section."""
+    query_client.responder = lambda _: make_stream_response(["Visit ", "Cafe Central."])
+    result = CliRunner().invoke(main, ["query", "coffee", "--stream"])
+    assert result.exit_code == 0
+    text, sources = result.output.split("## Sources")
+    assert text.startswith("Visit Cafe Central.\n")
+    assert "1. [Place 0](https://maps.google.com/?cid=0)" in sources
+
+
+def test_query_format_compact_is_single_line(query_client: FakeGemini) -> None:
+    """Test that --format compact writes the same document as json on one line."""
+    result = CliRunner().invoke(main, ["query", "coffee", "-v", "--format", "compact"])
+    assert result.exit_code == 0
+    assert result.stdout.count("\n") == 1
+    data = json.loads(result.stdout)
+    assert data["response_text"] == "Here are some great places."
+    assert len(data["grounding_metadata"]["grounding_chunks"]) == 3
+
+    result = CliRunner().invoke(main, ["query", "coffee", "--text", "--format", "ndjson"])
+    assert result.exit_code == 2
+
+
+def test_query_timings_reports_phases_and_usage(query_client: FakeGemini) -> None:
+    """Test that --timings adds timings and usage to JSON and a summary to text output."""
+    result = CliRunner().invoke(main, ["query", "coffee", "--timings"])
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    assert "grounding_metadata" not in data
+    assert data["usage"]["total_tokens"] == 360
+    assert data["timings"]["total_ms"] >= data["timings"]["network_ms"] > 0
+
+    result = CliRunner().invoke(main, ["query", "coffee", "--text", "--timings"])
+    assert result.exit_code == 0
+    assert "Timings: config" in result.stderr
+    assert "tokens 360" in result.stderr
+    assert "Timings" not in result.stdout
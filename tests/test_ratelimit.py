@@ -0,0 +1,75 @@
+"""Tests for gemini_google_maps_tool.core.ratelimit module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from gemini_google_maps_tool.core.maps import QueryError, query_maps
+from gemini_google_maps_tool.core.ratelimit import RateLimiter
+from tests.conftest import FakeGemini
+
+
+def test_reservations_are_paced_at_the_configured_rate() -> None:
+    """Test that requests beyond the burst capacity are delayed evenly."""
+    limiter = RateLimiter(rpm=600, burst_seconds=0.1)
+    delays = [limiter.reserve() for _ in range(4)]
+    assert delays[0] == 0
+    assert delays[1:] == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+
+
+def test_token_budget_is_corrected_by_actual_usage() -> None:
+    """Test that settle() charges the difference between actual and estimated tokens."""
+    limiter = RateLimiter(tpm=60_000, burst_seconds=1)
+    assert limiter.reserve(1000) == 0
+    limiter.settle(estimated_tokens=1000, actual_tokens=2000)
+    assert limiter.reserve(0) == pytest.approx(1.0, abs=0.01)
+
+
+def test_state_file_is_shared_between_limiters(tmp_path: Path) -> None:
+    """Test that limiters sharing a state file share one budget."""
+    state_path = tmp_path / "ratelimit.json"
+    first = RateLimiter(rpm=60, burst_seconds=1, state_path=state_path)
+    second = RateLimiter(rpm=60, burst_seconds=1, state_path=state_path)
+    assert first.reserve() == 0
+    assert second.reserve() == pytest.approx(1.0, abs=0.01)
+
+
+def test_async_calls_keep_state_file_io_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that acquire_async() and settle_async() lock the state file in a worker thread."""
+    limiter = RateLimiter(rpm=60, tpm=60_000, state_path=tmp_path / "ratelimit.json")
+    threads: set[int] = set()
+    locked_state = limiter._locked_state
+
+    def spy() -> object:
+        threads.add(threading.get_ident())
+        return locked_state()
+
+    monkeypatch.setattr(limiter, "_locked_state", spy)
+
+    async def run() -> None:
+        await limiter.acquire_async(1000)
+        await limiter.settle_async(1000, 1500)
+
+    asyncio.run(run())
+    assert threads
+    assert threading.get_ident() not in threads
+
+
+def test_throttling_reduces_the_rate(fake_gemini: FakeGemini) -> None:
+    """Test that a 429 from the API halves the limiter's rate."""
+    fake_gemini.responder = lambda _: httpx.Response(
+        429, json={"error": {"code": 429, "message": "Quota", "status": "RESOURCE_EXHAUSTED"}}
+    )
+    limiter = RateLimiter(rpm=6000)
+    with pytest.raises(QueryError):
+        query_maps(fake_gemini.client(), "coffee", rate_limiter=limiter)
+    assert limiter.rate_factor == 0.5
@@ -0,0 +1,69 @@
+"""Tests for gemini_google_maps_tool.core.retry module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from gemini_google_maps_tool.core.maps import QueryError, query_maps, query_maps_async
+from gemini_google_maps_tool.core.retry import RetryPolicy
+from tests.conftest import FakeGemini, make_response_body
+
+FAST = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+def _failing_then_ok(failures: int, status: int) -> Any:
+    """Responder that fails `failures` times with `status`, then succeeds."""
+    calls = {"count": 0}
+
+    def respond(_: dict[str, Any]) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            return httpx.Response(status, json={"error": {"code": status, "message": "boom"}})
+        return httpx.Response(200, json=make_response_body())
+
+    return respond
+
+
+def test_next_delay_uses_capped_full_jitter() -> None:
+    """Test that delays stay within the exponential ceiling and respect limits."""
+    policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=3, budget=None)
+    for attempt, ceiling in ((1, 1), (2, 2), (3, 3), (4, 3)):
+        delay = policy.next_delay("server_error", attempt, elapsed=0)
+        assert delay is not None and 0 <= delay <= ceiling
+    assert policy.next_delay("server_error", 5, elapsed=0) is None
+    assert policy.next_delay("auth", 1, elapsed=0) is None
+    assert RetryPolicy(budget=10).next_delay("timeout", 1, elapsed=10) is None
+
+
+def test_transient_errors_are_retried(fake_gemini: FakeGemini) -> None:
+    """Test that 503 responses are retried and the attempt count is recorded."""
+    fake_gemini.responder = _failing_then_ok(2, 503)
+    result = query_maps(fake_gemini.client(), "coffee", retry=FAST)
+    assert result.attempts == 3
+    assert len(fake_gemini.requests) == 3
+
+
+def test_permanent_errors_are_not_retried(fake_gemini: FakeGemini) -> None:
+    """Test that authentication failures fail fast with a classified reason."""
+    fake_gemini.responder = _failing_then_ok(5, 401)
+    with pytest.raises(QueryError) as exc_info:
+        query_maps(fake_gemini.client(), "coffee", retry=FAST)
+    assert exc_info.value.reason == QueryError.REASON_AUTH
+    assert exc_info.value.attempts == 1
+    assert len(fake_gemini.requests) == 1
+
+
+def test_async_retries_give_up_after_max_attempts(fake_gemini: FakeGemini) -> None:
+    """Test that the async path retries 429s up to max_attempts."""
+    fake_gemini.responder = _failing_then_ok(5, 429)
+    with pytest.raises(QueryError) as exc_info:
+        asyncio.run(query_maps_async(fake_gemini.client().aio, "coffee", retry=FAST))
+    assert exc_info.value.reason == QueryError.REASON_RATE_LIMITED
+    assert exc_info.value.attempts == 3
+    assert len(fake_gemini.requests) == 3
@@ -0,0 +1,115 @@
+"""Tests for gemini_google_maps_tool.core.routing module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import query_commands
+from gemini_google_maps_tool.core.maps import (
+    GroundingChunk,
+    GroundingMetadata,
+    MapsQueryResult,
+    QueryError,
+    query_maps,
+)
+from gemini_google_maps_tool.core.retry import RetryPolicy
+from gemini_google_maps_tool.core.routing import HEAVY_MODEL, LIGHT_MODEL, ModelRouter
+from gemini_google_maps_tool.core.tracing import QueryTimings
+from tests.conftest import FakeGemini, make_response_body
+
+
+def test_auto_model_escalates_unusable_light_answers(fake_gemini: FakeGemini) -> None:
+    """Test that only planning queries and unusable flash-lite answers reach flash."""
+    client = fake_gemini.client()
+    router = ModelRouter()
+
+    fake_gemini.responder = lambda _: httpx.Response(
+        200, json=make_response_body(chunk_count=0 if len(fake_gemini.requests) == 1 else 3)
+    )
+    result = query_maps(client, "Coffee in Delft", model="auto", router=router)
+    assert fake_gemini.models == [LIGHT_MODEL, HEAVY_MODEL]
+    assert result.model == HEAVY_MODEL
+    assert result.grounding_metadata is None
+
+    fake_gemini.models.clear()
+    result = query_maps(client, "Bakeries in Delft", model="auto", router=router)
+    assert fake_gemini.models == [LIGHT_MODEL]
+    assert result.model == LIGHT_MODEL
+
+    fake_gemini.models.clear()
+    query_maps(client, "Plan a day trip to Delft", model="auto", router=router)
+    assert fake_gemini.models == [HEAVY_MODEL]
+
+    # Empty candidates are escalated at once instead of retried on flash-lite
+    fake_gemini.models.clear()
+    fake_gemini.responder = lambda _: httpx.Response(
+        200, json=make_response_body(with_candidates=len(fake_gemini.models) > 1)
+    )
+    retry = RetryPolicy(max_attempts=3, base_delay=0)
+    result = query_maps(client, "Bars in Delft", model="auto", retry=retry, router=router)
+    assert fake_gemini.models == [LIGHT_MODEL, HEAVY_MODEL]
+    assert router.escalations == 2
+
+
+def test_router_skips_light_model_when_it_does_not_pay_off() -> None:
+    """Test that observed latencies and escalations route simple queries to flash."""
+    router = ModelRouter(min_samples=4)
+    sources = GroundingMetadata([GroundingChunk("Cafe", None, None)], [], None)
+
+    def run(model: str, retry: RetryPolicy | None) -> MapsQueryResult:
+        light = model == LIGHT_MODEL
+        return MapsQueryResult(
+            "Answer",
+            None if light else sources,
+            timings=QueryTimings(network_ms=900.0 if light else 1000.0),
+        )
+
+    for _ in range(4):
+        assert router.query(run, "Coffee in Delft").model == HEAVY_MODEL
+    stats = router.stats()
+    assert stats[LIGHT_MODEL] == {"count": 4, "p50_ms": 900.0, "p90_ms": 900.0, "p99_ms": 900.0}
+    assert stats["escalation_rate"] == 1.0
+    # 900 ms plus 1000 ms for every escalation is slower than flash on its own
+    assert router.choose("Coffee in Delft") == HEAVY_MODEL
+    assert router.percentile(HEAVY_MODEL, 50) == 1000.0
+
+
+def test_router_records_escalated_failures_without_mutating_results() -> None:
+    """Test that failed light attempts count towards its latency and results are copied."""
+    router = ModelRouter()
+    shared = MapsQueryResult("Answer", timings=QueryTimings(network_ms=1000.0))
+
+    def run(model: str, retry: RetryPolicy | None) -> MapsQueryResult:
+        if model == LIGHT_MODEL:
+            error = QueryError("Empty", QueryError.REASON_EMPTY_TEXT)
+            error.timings = QueryTimings(network_ms=700.0)
+            raise error
+        return shared
+
+    result = router.query(run, "Coffee in Delft")
+    assert result.model == HEAVY_MODEL
+    assert shared.model is None
+    assert router.percentile(LIGHT_MODEL, 50) == 700.0
+    assert router.percentile(HEAVY_MODEL, 50) == 1000.0
+
+
+def test_query_command_auto_reports_model(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that --model auto with -v reports the model that answered."""
+    monkeypatch.setenv("GEMINI_MAPS_SOCKET", str(tmp_path / "absent.sock"))
+    client = fake_gemini.client()
+    monkeypatch.setattr(query_commands, "get_client", lambda transport=None: client)
+
+    result = CliRunner().invoke(main, ["query", "coffee", "--model", "auto", "-v"])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["model"] == LIGHT_MODEL
+    assert fake_gemini.models == [LIGHT_MODEL]
@@ -0,0 +1,130 @@
+"""Tests for gemini_google_maps_tool.core.server module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import json
+import socket
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import query_commands
+from gemini_google_maps_tool.core.maps import QueryError
+from gemini_google_maps_tool.core.server import (
+    QueryDaemon,
+    _request,
+    daemon_is_running,
+    query_via_daemon,
+)
+from tests.conftest import FakeGemini
+
+
+def test_daemon_answers_and_caches(daemon: QueryDaemon, fake_gemini: FakeGemini) -> None:
+    """Test that repeated queries through the daemon reuse its warm cache."""
+    assert daemon_is_running(daemon.socket_path)
+    first = query_via_daemon("coffee", (52.37, 4.89), socket_path=daemon.socket_path)
+    second = query_via_daemon("coffee", (52.37, 4.89), socket_path=daemon.socket_path)
+    assert first is not None and second is not None
+    assert first.response_text == second.response_text == "Here are some great places."
+    assert (first.from_cache, second.from_cache) == (False, True)
+    assert len(fake_gemini.requests) == 1
+
+
+def test_daemon_reports_classified_errors(daemon: QueryDaemon, fake_gemini: FakeGemini) -> None:
+    """Test that API failures inside the daemon surface as QueryErrors with a reason."""
+    fake_gemini.responder = lambda _: httpx.Response(
+        401, json={"error": {"code": 401, "message": "bad key"}}
+    )
+    with pytest.raises(QueryError) as exc_info:
+        query_via_daemon("coffee", socket_path=daemon.socket_path)
+    assert exc_info.value.reason == QueryError.REASON_AUTH
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"max_attempts": 2, "retry_budget": "soon"},
+        {"lat_lon": "52,4"},
+        {"lat_lon": [52.37]},
+        {"lat_lon": [True, 4.89]},
+        {"lat_lon": [91.0, 4.89]},
+        {"lat_lon": [52.37, -181]},
+    ],
+)
+def test_daemon_rejects_invalid_bodies(
+    daemon: QueryDaemon, fake_gemini: FakeGemini, fields: dict[str, object]
+) -> None:
+    """Test that malformed retry budgets and coordinates get a 400 without a query."""
+    status, data = _request(
+        daemon.socket_path, "POST", "/query", {"query": "coffee", **fields}, 5.0
+    )
+    assert status == 400
+    assert data["reason"] == "invalid_argument"
+    assert fake_gemini.requests == []
+
+
+def test_query_command_forwards_to_daemon(
+    daemon: QueryDaemon, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the query command uses a running daemon instead of a local client."""
+
+    def no_local_client(transport: object = None) -> None:
+        raise AssertionError("query should have been forwarded to the daemon")
+
+    monkeypatch.setenv("GEMINI_MAPS_SOCKET", str(daemon.socket_path))
+    monkeypatch.setattr(query_commands, "get_client", no_local_client)
+    result = CliRunner().invoke(main, ["query", "coffee", "-v"])
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.stdout)
+    assert output["response_text"] == "Here are some great places."
+    assert len(output["grounding_metadata"]["grounding_chunks"]) == 3
+
+
+def test_no_daemon_falls_back(tmp_path: Path) -> None:
+    """Test that query_via_daemon returns None when no daemon is listening."""
+    assert query_via_daemon("coffee", socket_path=tmp_path / "missing.sock") is None
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    assert not daemon_is_running(stale)
+    assert query_via_daemon("coffee", socket_path=stale) is None
+
+
+def test_daemon_with_unreadable_reply_falls_back(tmp_path: Path) -> None:
+    """Test that a socket answering with something other than JSON is skipped."""
+    path = tmp_path / "other.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def answer() -> None:
+        connection, _ = server.accept()
+        connection.recv(65536)
+        connection.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 9\r\n\r\nnot json!")
+        connection.close()
+
+    thread = threading.Thread(target=answer)
+    thread.start()
+    try:
+        assert query_via_daemon("coffee", socket_path=path) is None
+    finally:
+        thread.join()
+        server.close()
+
+
+def test_query_command_with_rate_limits_skips_daemon(
+    daemon: QueryDaemon, fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that --rpm and --timeout queries run locally even when a daemon is running."""
+    client = fake_gemini.client()
+    monkeypatch.setenv("GEMINI_MAPS_SOCKET", str(daemon.socket_path))
+    monkeypatch.setattr(query_commands, "get_client", lambda transport=None: client)
+    for option in (["--rpm", "600"], ["--timeout", "30"]):
+        result = CliRunner().invoke(main, ["query", "coffee", *option])
+        assert result.exit_code == 0, result.output
+    assert len(daemon.cache) == 0
@@ -0,0 +1,70 @@
+"""Tests for gemini_google_maps_tool.core.session and client modules.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import threading
+import time
+
+import pytest
+
+from gemini_google_maps_tool.core import client as client_module
+from gemini_google_maps_tool.core.client import TransportOptions, get_client
+from gemini_google_maps_tool.core.session import MapsSession
+from tests.conftest import FakeGemini
+
+
+def test_session_reuses_prebuilt_configs(fake_gemini: FakeGemini) -> None:
+    """Test that configs are built once per (model, location) and not mutated by queries."""
+    session = MapsSession(client=fake_gemini.client(), max_configs=2)
+    config = session.config_for("gemini-2.5-flash-lite", (52.37, 4.89))
+    before = config.model_dump()
+    for _ in range(3):
+        result = session.query("coffee", lat_lon=(52.37, 4.89))
+        assert result.response_text == "Here are some great places."
+    assert session.config_for("gemini-2.5-flash-lite", (52.37, 4.89)) is config
+    assert config.model_dump() == before
+    assert fake_gemini.requests[-1]["toolConfig"]["retrievalConfig"]["lat_lng"] == {
+        "latitude": 52.37,
+        "longitude": 4.89,
+    }
+
+    session.config_for("gemini-2.5-flash", None)
+    session.config_for("gemini-2.5-flash", (1.0, 2.0))
+    assert session.config_for("gemini-2.5-flash-lite", (52.37, 4.89)) is not config
+
+
+def test_get_client_creates_one_client_under_concurrency(
+    monkeypatch: pytest.MonkeyPatch, fake_gemini: FakeGemini
+) -> None:
+    """Test that concurrent first calls to get_client() share a single client."""
+    created: list[object] = []
+
+    def slow_create(transport: TransportOptions | None = None) -> object:
+        time.sleep(0.05)
+        created.append(fake_gemini.client())
+        return created[-1]
+
+    monkeypatch.setattr(client_module, "_clients", {})
+    monkeypatch.setattr(client_module, "create_client", slow_create)
+    results: list[object] = []
+    threads = [threading.Thread(target=lambda: results.append(get_client())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert all(result is created[0] for result in results)
+    assert get_client(TransportOptions(timeout=5)) is not created[0]
+
+
+def test_transport_options_map_to_http_options() -> None:
+    """Test that transport settings become SDK timeout (ms) and httpx client arguments."""
+    options = TransportOptions(timeout=2.5, max_connections=8, max_keepalive_connections=4)
+    http_options = options.to_http_options()
+    assert http_options.timeout == 2500
+    assert http_options.client_args is not None
+    limits = http_options.client_args["limits"]
+    assert (limits.max_connections, limits.max_keepalive_connections) == (8, 4)
+    assert http_options.async_client_args == http_options.client_args
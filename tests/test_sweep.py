@@ -0,0 +1,81 @@
+"""Tests for gemini_google_maps_tool.core.sweep module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from gemini_google_maps_tool.cli import main
+from gemini_google_maps_tool.commands import sweep_commands
+from gemini_google_maps_tool.core.sweep import BoundingBox, sweep_async
+from tests.conftest import FakeGemini, make_response_body
+
+
+def test_bounding_box_parse_and_split() -> None:
+    """Test parsing, validation, grid cells and quadrants of a bounding box."""
+    bbox = BoundingBox.parse("0, 0, 2, 4")
+    assert bbox.center == (1.0, 2.0)
+    cells = bbox.grid(2, 2)
+    assert [cell.center for cell in cells] == [(0.5, 1.0), (0.5, 3.0), (1.5, 1.0), (1.5, 3.0)]
+    assert cells[3].quadrants()[0] == BoundingBox(1.0, 2.0, 1.5, 3.0)
+    for invalid in ("1,2,3", "a,b,c,d", "2,0,1,1", "0,170,1,190"):
+        with pytest.raises(ValueError):
+            BoundingBox.parse(invalid)
+
+
+def test_sweep_refines_dense_cells_and_deduplicates(fake_gemini: FakeGemini) -> None:
+    """Test that only dense cells are split and places are merged by place id."""
+
+    def responder(body: dict[str, Any]) -> httpx.Response:
+        lat_lng = body["toolConfig"]["retrievalConfig"]["lat_lng"]
+        dense = lat_lng["latitude"] > 1 and lat_lng["longitude"] > 1
+        return httpx.Response(200, json=make_response_body(chunk_count=6 if dense else 1))
+
+    fake_gemini.responder = responder
+    result = asyncio.run(
+        sweep_async(
+            fake_gemini.client().aio,
+            "Bakeries",
+            BoundingBox(0, 0, 2, 2),
+            grid_size=2,
+            max_depth=1,
+            split_threshold=5,
+        )
+    )
+
+    assert len(fake_gemini.requests) == 8
+    assert [cell.depth for cell in result.cells] == [0] * 4 + [1] * 4
+    assert [cell.place_count for cell in result.cells[:4]] == [1, 1, 1, 6]
+    assert result.failed == 0
+    assert [place.chunk.place_id for place in result.places] == [
+        f"places/ChIJ{i:08d}" for i in range(6)
+    ]
+    assert result.places[0].hits == 8
+    assert result.places[5].hits == 5
+    assert result.places[5].lat_lon == (1.5, 1.5)
+
+
+def test_sweep_command_outputs_places(
+    fake_gemini: FakeGemini, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the sweep command prints de-duplicated places and a cell summary."""
+    client = fake_gemini.client()
+    monkeypatch.setattr(sweep_commands, "get_async_client", lambda transport=None: client.aio)
+
+    result = CliRunner().invoke(
+        main, ["sweep", "Bakeries", "--bbox", "52.35,4.85,52.39,4.93", "--format", "ndjson"]
+    )
+    assert result.exit_code == 0
+    places = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [place["hits"] for place in places] == [9, 9, 9]
+    assert "Swept 9 cells (0 failed, depth 0-0), found 3 places" in result.stderr
+
+    result = CliRunner().invoke(main, ["sweep", "Bakeries", "--bbox", "52,4,51,5"])
+    assert result.exit_code == 2
@@ -0,0 +1,90 @@
+"""Tests for gemini_google_maps_tool.core.tracing module.
+
+Note: This code was generated with assistance from AI coding tools
+and has been reviewed and tested by a human.
+"""
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+from gemini_google_maps_tool.core.maps import TokenUsage, query_maps, query_maps_stream
+from gemini_google_maps_tool.core.ratelimit import RateLimiter
+from gemini_google_maps_tool.core.tracing import AttributeValue
+from tests.conftest import FakeGemini, make_stream_response
+
+
+class RecordingSpan:
+    """Span stand-in that keeps the attributes set on it."""
+
+    def __init__(self, name: str, attributes: Mapping[str, AttributeValue] | None) -> None:
+        self.name = name
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, name: str, value: AttributeValue) -> None:
+        self.attributes[name] = value
+
+
+class RecordingTracer:
+    """Tracer that records spans in the order they are closed."""
+
+    def __init__(self) -> None:
+        self.spans: list[RecordingSpan] = []
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, *, attributes: Mapping[str, AttributeValue] | None = None
+    ) -> Iterator[Any]:
+        span = RecordingSpan(name, attributes)
+        try:
+            yield span
+        finally:
+            self.spans.append(span)
+
+
+def test_query_maps_reports_usage_timings_and_spans(fake_gemini: FakeGemini) -> None:
+    """Test that a query records token usage, phase timings and one span per phase."""
+    tracer = RecordingTracer()
+    result = query_maps(
+        fake_gemini.client(),
+        "coffee",
+        include_grounding=True,
+        rate_limiter=RateLimiter(rpm=600),
+        tracer=tracer,
+    )
+    assert result.usage == TokenUsage(
+        prompt_tokens=12, tool_use_prompt_tokens=300, output_tokens=48, total_tokens=360
+    )
+    timings = result.timings
+    assert timings is not None
+    assert timings.network_ms > 0
+    assert timings.first_chunk_ms is None
+    phases = timings.config_ms + timings.rate_limit_ms + timings.network_ms
+    assert timings.total_ms >= phases + timings.extract_ms + timings.grounding_ms
+    assert [span.name for span in tracer.spans] == [
+        "gemini_maps.config",
+        "gemini_maps.rate_limit",
+        "gemini_maps.network",
+        "gemini_maps.extract",
+        "gemini_maps.grounding",
+        "gemini_maps.query",
+    ]
+    assert tracer.spans[-1].attributes["gemini_maps.total_tokens"] == 360
+    assert tracer.spans[-1].attributes["gemini_maps.attempts"] == 1
+
+
+def test_stream_times_first_chunk(fake_gemini: FakeGemini) -> None:
+    """Test that streams report time to first chunk and never span a yield."""
+    fake_gemini.responder = lambda _: make_stream_response(["Visit ", "Cafe Central."])
+    tracer = RecordingTracer()
+    stream = query_maps_stream(fake_gemini.client(), "coffee", tracer=tracer)
+    assert list(stream) == ["Visit ", "Cafe Central."]
+
+    timings = stream.result.timings
+    assert timings is not None
+    assert timings.first_chunk_ms is not None
+    assert 0 < timings.first_chunk_ms <= timings.total_ms
+    assert "first_chunk_ms" in timings.to_dict()
+    assert stream.result.usage is not None
+    assert stream.result.usage.total_tokens == 360
+    assert "gemini_maps.network" not in [span.name for span in tracer.spans]
@@ -6,7 +6,9 @@ and has been reviewed and tested by a human.
 
 import json
 
-from gemini_google_maps_tool.utils import output_json
+import pytest
+
+from gemini_google_maps_tool.utils import output_json, output_records
 
 
 def test_output_json_dict(capsys: object) -> None:
@@ -26,3 +28,23 @@ def test_output_json_list(capsys: object) -> None:
     captured = capsys.readouterr()  # type: ignore
     parsed = json.loads(captured.out)
     assert parsed == data
+
+
+@pytest.mark.parametrize("output_format", ["json", "compact"])
+def test_output_records_matches_output_json(
+    capsys: pytest.CaptureFixture[str], output_format: str
+) -> None:
+    """Test that streamed arrays are byte-identical to serializing the whole list."""
+    records: list[dict[str, object]] = [{"a": 1, "b": [1, 2]}, {"a": 2}]
+    for data in (records, []):
+        output_records(iter(data), output_format)
+        streamed = capsys.readouterr().out
+        output_json(list(data), output_format)
+        assert streamed == capsys.readouterr().out
+
+
+def test_output_records_ndjson(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that ndjson writes one compact record per line."""
+    records: list[dict[str, object]] = [{"a": 1}, {"b": 2}]
+    output_records(iter(records), "ndjson")
+    assert capsys.readouterr().out == '{"a":1}\n{"b":2}\n'